@@ -2,17 +2,26 @@
 Unit tests for the asset upload endpoint.
 """
 
+import copy
 import json
 from datetime import datetime
 from io import BytesIO
 from pytz import UTC
 from unittest import TestCase, skip
+from uuid import uuid4
+from pymongo import MongoClient
 from .utils import CourseTestCase
+from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
 from contentstore.views import assets
 from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore, _CONTENTSTORE
 from xmodule.modulestore import Location
 
+TEST_DATA_CONTENTSTORE = copy.deepcopy(settings.CONTENTSTORE)
+TEST_DATA_CONTENTSTORE['OPTIONS']['db'] = 'test_xcontent_%s' % uuid4().hex
+
 
 class AssetsTestCase(CourseTestCase):
     def setUp(self):
@@ -35,7 +44,12 @@ class AssetsTestCase(CourseTestCase):
         )
         self.assertEquals(resp.status_code, 200)
         content = json.loads(resp.content)
-        self.assertIsInstance(content, list)
+        self.assertIsInstance(content['assets'], list)
+
+    def test_invalid_page_params(self):
+        for params in ({'page': 'x'}, {'page': 0}, {'page_size': 100000}, {'sort': 'length'}, {'direction': 'up'}):
+            resp = self.client.get(self.url, params, HTTP_ACCEPT="application/json")
+            self.assertEquals(resp.status_code, 400)
 
     def test_static_url_generation(self):
         location = Location(['i4x', 'foo', 'bar', 'asset', 'my_file_name.jpg'])
@@ -43,6 +57,69 @@ class AssetsTestCase(CourseTestCase):
         self.assertEquals(path, '/static/my_file_name.jpg')
 
 
+@override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
+class PagedAssetsTestCase(CourseTestCase):
+    """
+    Tests of the paging, sorting and filtering of the asset library.
+    """
+    def setUp(self):
+        super(PagedAssetsTestCase, self).setUp()
+        self.url = reverse("asset_index", kwargs={
+            'org': self.course.location.org,
+            'course': self.course.location.course,
+            'name': self.course.location.name,
+        })
+        for day, (name, content_type) in enumerate((('b.png', 'image/png'), ('c.pdf', 'application/pdf'),
+                                                    ('a.jpg', 'image/jpeg'), ('d.png', 'image/png'))):
+            location = StaticContent.compute_location(self.course.location.org, self.course.location.course, name)
+            content = contentstore().save(StaticContent(location, name, content_type, 'data'))
+            # uploads in the same millisecond would have no defined order
+            contentstore().fs_files.update(
+                {'_id': content.get_id()},
+                {'$set': {'uploadDate': datetime(2013, 6, day + 1, tzinfo=UTC)}}
+            )
+
+    def tearDown(self):
+        MongoClient().drop_database(TEST_DATA_CONTENTSTORE['OPTIONS']['db'])
+        _CONTENTSTORE.clear()
+
+    def get_page(self, **params):
+        """ Returns the decoded json listing of the assets with the query `params`. """
+        resp = self.client.get(self.url, params, HTTP_ACCEPT="application/json")
+        self.assertEquals(resp.status_code, 200)
+        return json.loads(resp.content)
+
+    def names(self, page):
+        """ Returns the names of the assets of a listing. """
+        return [asset['name'] for asset in page['assets']]
+
+    def test_pages(self):
+        first = self.get_page(page_size=3)
+        self.assertEquals(first['totalCount'], 4)
+        self.assertEquals((first['start'], first['end']), (0, 3))
+        # most recent first
+        self.assertEquals(self.names(first), ['d.png', 'a.jpg', 'c.pdf'])
+
+        second = self.get_page(page_size=3, page=2)
+        self.assertEquals(self.names(second), ['b.png'])
+
+    def test_sort_by_name(self):
+        self.assertEquals(self.names(self.get_page(sort='name')), ['a.jpg', 'b.png', 'c.pdf', 'd.png'])
+        self.assertEquals(self.names(self.get_page(sort='name', direction='desc', page_size=1)), ['d.png'])
+
+    def test_filters(self):
+        self.assertEquals(self.names(self.get_page(sort='name', type='image')), ['a.jpg', 'b.png', 'd.png'])
+        self.assertEquals(self.names(self.get_page(type='image/png', sort='name')), ['b.png', 'd.png'])
+        page = self.get_page(name='c')
+        self.assertEquals(self.names(page), ['c.pdf'])
+        self.assertEquals(page['totalCount'], 1)
+
+    def test_html_page(self):
+        resp = self.client.get(self.url, {'page_size': 3})
+        self.assertContains(resp, 'Page 1 of 2')
+        self.assertContains(resp, 'page=2')
+
+
 class UploadTestCase(CourseTestCase):
     """
     Unit tests for uploading a file
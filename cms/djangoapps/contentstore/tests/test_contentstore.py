@@ -53,6 +53,7 @@ import datetime
 from pytz import UTC
 from uuid import uuid4
 from pymongo import MongoClient
+from pymongo.errors import AutoReconnect
 from student.models import CourseEnrollment
 
 TEST_DATA_CONTENTSTORE = copy.deepcopy(settings.CONTENTSTORE)
@@ -271,6 +272,86 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         self.assertIn('graceperiod', own_metadata(html_module))
         self.assertEqual(html_module.graceperiod, new_graceperiod)
 
+    def test_publish_unpublish_subtree(self):
+        store = modulestore('direct')
+        draft_store = modulestore('draft')
+        import_from_xml(store, 'common/test/data/', ['toy'])
+
+        vertical_location = Location(['i4x', 'edX', 'toy', 'vertical', 'vertical_test', None])
+        vertical = draft_store.get_item(vertical_location, depth=1)
+        child_locations = [child.location for child in vertical.get_children()]
+        self.assertGreater(len(child_locations), 0)
+        draft_query = Location(['i4x', 'edX', 'toy', None, None, 'draft'])
+
+        # put the whole unit in draft
+        draft_store.convert_subtree_to_draft(vertical_location)
+        self.assertEqual(len(store.get_items(draft_query)), len(child_locations) + 1)
+        for location in [vertical_location] + child_locations:
+            self.assertTrue(getattr(draft_store.get_item(location), 'is_draft', False))
+
+        # publishing removes all the drafts, and stamps the published versions
+        # without rewriting the items which weren't edited
+        with mock.patch.object(draft_store.collection, 'save', wraps=draft_store.collection.save) as save:
+            draft_store.publish_subtree(vertical_location, 42)
+        self.assertEqual(save.call_count, 0)
+        self.assertEqual(len(store.get_items(draft_query)), 0)
+        for location in [vertical_location] + child_locations:
+            item = draft_store.get_item(location)
+            self.assertFalse(getattr(item, 'is_draft', False))
+            self.assertEqual(item.published_by, 42)
+            self.assertIsNotNone(item.published_date)
+
+        # unpublishing turns every published version back into a draft
+        draft_store.unpublish_subtree(vertical_location)
+        self.assertEqual(len(store.get_items(draft_query)), len(child_locations) + 1)
+        with self.assertRaises(ItemNotFoundError):
+            store.get_item(vertical_location)
+
+    def test_publish_subtree_failure_keeps_content(self):
+        store = modulestore('direct')
+        draft_store = modulestore('draft')
+        import_from_xml(store, 'common/test/data/', ['toy'])
+
+        vertical_location = Location(['i4x', 'edX', 'toy', 'vertical', 'vertical_test', None])
+        child_locations = [child.location for child in draft_store.get_item(vertical_location, depth=1).get_children()]
+        draft_query = Location(['i4x', 'edX', 'toy', None, None, 'draft'])
+        draft_store.convert_subtree_to_draft(vertical_location)
+        for location in child_locations:
+            draft_store.update_item(location, '<html>edited</html>')
+
+        # the connection fails after the first edited document is written
+        save = draft_store.collection.save
+        saved = []
+
+        def failing_save(document, **kwargs):
+            if saved:
+                raise AutoReconnect()
+            saved.append(document)
+            return save(document, **kwargs)
+
+        with mock.patch.object(draft_store.collection, 'save', side_effect=failing_save):
+            with self.assertRaises(AutoReconnect):
+                draft_store.publish_subtree(vertical_location, 42)
+
+        # every item is still published, and the drafts are kept for another try
+        for location in [vertical_location] + child_locations:
+            store.get_item(location)
+        self.assertEqual(len(store.get_items(draft_query)), len(child_locations) + 1)
+
+    def test_create_draft_view(self):
+        store = modulestore('direct')
+        draft_store = modulestore('draft')
+        import_from_xml(store, 'common/test/data/', ['toy'])
+
+        vertical_location = Location(['i4x', 'edX', 'toy', 'vertical', 'vertical_test', None])
+        child_locations = [child.location for child in draft_store.get_item(vertical_location, depth=1).get_children()]
+
+        # the whole unit is put in draft
+        resp = self.client.post(reverse('create_draft'), json.dumps({'id': vertical_location.url()}), "application/json")
+        self.assertEqual(resp.status_code, 200)
+        for location in [vertical_location] + child_locations:
+            self.assertTrue(getattr(draft_store.get_item(location), 'is_draft', False))
+
     def test_get_depth_with_drafts(self):
         import_from_xml(modulestore('direct'), 'common/test/data/', ['simple'])
 
@@ -755,6 +836,42 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
                     expected_children.append(child_loc.url())
                 self.assertEqual(expected_children, lookup_item.children)
 
+    def test_clone_course_assets(self):
+        module_store = modulestore('direct')
+        content_store = contentstore()
+        import_from_xml(module_store, 'common/test/data/', ['toy'], static_content_store=content_store)
+
+        source_location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+        dest_location = CourseDescriptor.id_to_location('MITx/999/2013_Spring')
+
+        resp = self.client.post(reverse('create_new_course'), {
+            'org': 'MITx',
+            'number': '999',
+            'display_name': 'Robot Super Course',
+            'run': '2013_Spring'
+        })
+        self.assertEqual(resp.status_code, 200)
+
+        clone_course(module_store, content_store, source_location, dest_location)
+
+        source_assets = content_store.get_all_content_for_course(source_location)
+        self.assertGreater(len(source_assets), 0)
+        self.assertEqual(len(source_assets), len(content_store.get_all_content_for_course(dest_location)))
+        self.assertEqual(
+            len(content_store.get_all_content_thumbnails_for_course(source_location)),
+            len(content_store.get_all_content_thumbnails_for_course(dest_location))
+        )
+
+        for asset in source_assets:
+            source_content = content_store.find(Location(asset['_id']))
+            dest_content = content_store.find(
+                Location(asset['_id'])._replace(org=dest_location.org, course=dest_location.course)
+            )
+            self.assertEqual(source_content.data, dest_content.data)
+            self.assertEqual(source_content.content_type, dest_content.content_type)
+            if source_content.thumbnail_location is not None:
+                self.assertEqual(dest_content.thumbnail_location.course, dest_location.course)
+
     def test_portable_link_rewrites_during_clone_course(self):
         course_data = {
             'org': 'MITx',
@@ -882,6 +999,34 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
         assets = content_store.get_all_content_for_course(location)
         self.assertEqual(len(assets), 0)
 
+    def test_export_only_draft_verticals(self):
+        module_store = modulestore('direct')
+        draft_store = modulestore('draft')
+        content_store = contentstore()
+
+        import_from_xml(module_store, 'common/test/data/', ['toy'])
+        location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+
+        # add a second, published, vertical to the sequential
+        vertical = module_store.get_item(Location(['i4x', 'edX', 'toy', 'vertical', 'vertical_test', None]))
+        published_loc = vertical.location.replace(name='a_published_vertical')
+        vertical.scope_ids = vertical.scope_ids._replace(def_id=published_loc, usage_id=published_loc)
+        module_store.save_xmodule(vertical)
+        sequential_loc = Location(['i4x', 'edX', 'toy', 'sequential', 'vertical_sequential', None])
+        module_store.update_children(sequential_loc, module_store.get_item(sequential_loc).children + [published_loc.url()])
+
+        # and put the original one in draft
+        draft_store.convert_to_draft(Location(['i4x', 'edX', 'toy', 'vertical', 'vertical_test', None]))
+        draft_verticals = draft_store.get_items(Location(['i4x', 'edX', 'toy', 'vertical', None, 'draft']))
+        self.assertEqual([item.location.name for item in draft_verticals], ['vertical_test'])
+
+        root_dir = path(mkdtemp_clean())
+        export_to_xml(module_store, content_store, location, root_dir, 'test_export', draft_modulestore=draft_store)
+
+        # only the draft vertical is exported as a draft
+        drafts_fs = OSFS(root_dir / 'test_export/drafts/vertical')
+        self.assertEqual(drafts_fs.listdir(), ['vertical_test.xml'])
+
     def verify_content_existence(self, store, root_dir, location, dirname, category_name, filename_suffix=''):
         filesystem = OSFS(root_dir / 'test_export')
         self.assertTrue(filesystem.exists(dirname))
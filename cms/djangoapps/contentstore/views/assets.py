@@ -6,8 +6,10 @@ import shutil
 import cgi
 import re
 from functools import partial
+from urllib import urlencode
 from tempfile import mkdtemp
 from path import path
+import pymongo
 
 from django.conf import settings
 from django.http import HttpResponse, HttpResponseBadRequest
@@ -72,6 +74,53 @@ def assets_to_json_dict(assets):
     return ret
 
 
+# the number of assets listed per page of the asset library
+ASSETS_PAGE_SIZE = 50
+MAX_ASSETS_PAGE_SIZE = 500
+
+# the orders assets can be listed in: request value -> contentstore sort field
+ASSET_SORTS = {
+    'date': 'uploadDate',
+    'name': 'displayname',
+}
+
+
+def _asset_page_params(request):
+    """
+    Reads the paging, sorting and filtering parameters of an asset listing from
+    the query string of `request`.
+
+    Returns a dict of page, page_size, sort, direction, name and type, or raises
+    ValueError if a parameter is invalid.
+    """
+    params = {
+        'page': int(request.GET.get('page', 1)),
+        'page_size': int(request.GET.get('page_size', ASSETS_PAGE_SIZE)),
+        'sort': request.GET.get('sort', 'date'),
+        'direction': request.GET.get('direction', 'desc' if request.GET.get('sort', 'date') == 'date' else 'asc'),
+        'name': request.GET.get('name', ''),
+        'type': request.GET.get('type', ''),
+    }
+    if params['page'] < 1:
+        raise ValueError("page must be positive")
+    if not 0 < params['page_size'] <= MAX_ASSETS_PAGE_SIZE:
+        raise ValueError("page_size must be between 1 and {0}".format(MAX_ASSETS_PAGE_SIZE))
+    if params['sort'] not in ASSET_SORTS:
+        raise ValueError("sort must be one of {0}".format(', '.join(sorted(ASSET_SORTS))))
+    if params['direction'] not in ('asc', 'desc'):
+        raise ValueError("direction must be asc or desc")
+    return params
+
+
+def _page_query(params, page):
+    """
+    Returns the query string of the listing of `page` with the parameters `params`.
+    """
+    return urlencode(dict(
+        (key, unicode(value).encode('utf-8')) for key, value in dict(params, page=page).iteritems()
+    ))
+
+
 @login_required
 @ensure_csrf_cookie
 def asset_index(request, org, course, name):
@@ -79,9 +128,42 @@ def asset_index(request, org, course, name):
     Display an editable asset library
 
     org, course, name: Attributes of the Location for the item to edit
+
+    The assets are listed a page at a time. The query string can give the page
+    (1-based), page_size, sort ('date' or 'name'), direction ('asc' or 'desc'),
+    and filter the assets by name prefix (name) or mime type (type, e.g.
+    'image' or 'application/pdf').
     """
     location = get_location_and_verify_access(request, org, course, name)
 
+    try:
+        params = _asset_page_params(request)
+    except ValueError as err:
+        return HttpResponseBadRequest(str(err))
+
+    course_reference = StaticContent.compute_location(org, course, name)
+    start = (params['page'] - 1) * params['page_size']
+    assets, total_count = contentstore().get_content_page_for_course(
+        course_reference,
+        start=start,
+        maxresults=params['page_size'],
+        sort=(ASSET_SORTS[params['sort']], pymongo.ASCENDING if params['direction'] == 'asc' else pymongo.DESCENDING),
+        name_prefix=params['name'],
+        content_type=params['type'],
+    )
+
+    if request.META.get('HTTP_ACCEPT', "").startswith("application/json"):
+        return JsonResponse({
+            'start': start,
+            'end': start + len(assets),
+            'page': params['page'],
+            'pageSize': params['page_size'],
+            'totalCount': total_count,
+            'sort': params['sort'],
+            'direction': params['direction'],
+            'assets': assets_to_json_dict(assets),
+        })
+
     upload_asset_callback_url = reverse('upload_asset', kwargs={
         'org': org,
         'course': course,
@@ -90,15 +172,6 @@ def asset_index(request, org, course, name):
 
     course_module = modulestore().get_item(location)
 
-    course_reference = StaticContent.compute_location(org, course, name)
-    assets = contentstore().get_all_content_for_course(course_reference)
-
-    # sort in reverse upload date order
-    assets = sorted(assets, key=lambda asset: asset['uploadDate'], reverse=True)
-
-    if request.META.get('HTTP_ACCEPT', "").startswith("application/json"):
-        return JsonResponse(assets_to_json_dict(assets))
-
     asset_display = []
     for asset in assets:
         asset_id = asset['_id']
@@ -117,9 +190,14 @@ def asset_index(request, org, course, name):
 
         asset_display.append(display_info)
 
+    page_count = max(1, (total_count + params['page_size'] - 1) // params['page_size'])
     return render_to_response('asset_index.html', {
         'context_course': course_module,
         'assets': asset_display,
+        'page': params['page'],
+        'page_count': page_count,
+        'previous_page_query': _page_query(params, params['page'] - 1) if params['page'] > 1 else None,
+        'next_page_query': _page_query(params, params['page'] + 1) if params['page'] < page_count else None,
         'upload_asset_callback_url': upload_asset_callback_url,
         'remove_asset_callback_url': reverse('remove_asset', kwargs={
             'org': org,
@@ -26,7 +26,6 @@ from contentstore.utils import (get_modulestore, get_lms_link_for_item,
 
 from models.settings.course_grading import CourseGradingModel
 
-from .requests import _xmodule_recurse
 from .access import has_access
 from xmodule.x_module import XModuleDescriptor
 from xblock.plugin import PluginMissingError
@@ -338,9 +337,9 @@ def create_draft(request):
     if not has_access(request.user, location):
         raise PermissionDenied()
 
-    # This clones the existing item location to a draft location (the draft is
-    # implicit, because modulestore is a Draft modulestore)
-    modulestore().convert_to_draft(location)
+    # This clones the existing item and its descendants to draft locations (the
+    # draft is implicit, because modulestore is a Draft modulestore)
+    modulestore().convert_subtree_to_draft(location)
 
     return HttpResponse()
 
@@ -357,11 +356,7 @@ def publish_draft(request):
     if not has_access(request.user, location):
         raise PermissionDenied()
 
-    item = modulestore().get_item(location)
-    _xmodule_recurse(
-            item,
-            lambda i: modulestore().publish(i.location, request.user.id)
-    )
+    modulestore().publish_subtree(location, request.user.id)
 
     return HttpResponse()
 
@@ -376,8 +371,7 @@ def unpublish_unit(request):
     if not has_access(request.user, location):
         raise PermissionDenied()
 
-    item = modulestore().get_item(location)
-    _xmodule_recurse(item, lambda i: modulestore().unpublish(i.location))
+    modulestore().unpublish_subtree(location)
 
     return HttpResponse()
 
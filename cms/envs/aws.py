@@ -93,6 +93,7 @@ CACHES = ENV_TOKENS['CACHES']
 
 SESSION_COOKIE_DOMAIN = ENV_TOKENS.get('SESSION_COOKIE_DOMAIN')
 SESSION_ENGINE = ENV_TOKENS.get('SESSION_ENGINE', SESSION_ENGINE)
+MAKO_MODULE_CACHE_ROOT = ENV_TOKENS.get('MAKO_MODULE_CACHE_ROOT', MAKO_MODULE_CACHE_ROOT)
 
 # allow for environments to specify what cookie name our login subsystem should use
 # this is to fix a bug regarding simultaneous logins between edx.org and edge.edx.org which can
@@ -60,6 +60,9 @@ MITX_FEATURES = {
     # If set to True, new Studio users won't be able to author courses unless
     # edX has explicitly added them to the course creator group.
     'ENABLE_CREATOR_GROUP': False,
+
+    # Update the full-text index of course content searched in the LMS on publish
+    'ENABLE_COURSE_SEARCH': False,
 }
 ENABLE_JASMINE = False
 
@@ -83,6 +86,9 @@ sys.path.append(COMMON_ROOT / 'lib')
 # This is where we stick our compiled template files.
 from tempdir import mkdtemp_clean
 MAKO_MODULE_DIR = mkdtemp_clean('mako')
+# If set, compiled templates are shared by all processes through a directory under
+# this one, named by a digest of the templates (see mitxmako.startup)
+MAKO_MODULE_CACHE_ROOT = None
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [
     PROJECT_ROOT / 'templates',
@@ -368,7 +374,10 @@ INSTALLED_APPS = (
     'django.contrib.admin',
 
     # for managing course modes
-    'course_modes'
+    'course_modes',
+
+    # for indexing course content searched in the LMS
+    'course_search',
 )
 
 
@@ -102,7 +102,7 @@ urlpatterns = ('',  # nopep8
     # noop to squelch ajax errors
     url(r'^event$', 'contentstore.views.event', name='event'),
 
-    url(r'^heartbeat$', include('heartbeat.urls')),
+    url(r'^heartbeat', include('heartbeat.urls')),
 )
 
 # User creation and updating views
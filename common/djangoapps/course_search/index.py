@@ -0,0 +1,276 @@
+"""
+Builds the full-text index of course content from the published course in the
+modulestore: the text of html and problems, the transcripts of videos, the
+display names of every item, and the overview of the course about pages.
+
+A course is indexed by walking it once, with index_course. After that,
+index_location reindexes the items a write to the modulestore changed.
+Neither commits: they write in the transaction of their caller.
+"""
+import json
+import logging
+import re
+from collections import Counter
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from django.conf import settings
+
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore import Location
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.modulestore.mongo.draft import DRAFT
+
+from course_search.models import CourseSearchDocument, CourseSearchTerm
+
+log = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# words too common to narrow a search, which aren't indexed
+STOP_WORDS = frozenset([
+    'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'if', 'in', 'into', 'is', 'it',
+    'no', 'not', 'of', 'on', 'or', 'such', 'that', 'the', 'their', 'then', 'there', 'these',
+    'they', 'this', 'to', 'was', 'will', 'with',
+])
+
+MAX_TERM_LENGTH = 64
+
+# the about pages which are indexed with the course
+ABOUT_SECTIONS = ('overview', 'short_description')
+
+# the elements of problems which don't show until after an answer
+HIDDEN_PROBLEM_TAGS = ('script', 'answer', 'solution', 'hintgroup', 'hint', 'hintpart')
+
+# containers whose writes only change their own indexed text. Writes to the
+# other items reindex their descendants too, as publishing a unit does.
+SHALLOW_CATEGORIES = ('course', 'chapter', 'sequential')
+
+
+def tokenize(text):
+    """
+    Return the terms of `text`: its lower cased words, without stop words and
+    single characters.
+    """
+    terms = []
+    for word in WORD_RE.findall(text):
+        term = word.lower()[:MAX_TERM_LENGTH]
+        if len(term) > 1 and term not in STOP_WORDS:
+            terms.append(term)
+    return terms
+
+
+def _visible_text(element, excluded):
+    """
+    Yield the text of `element` and its descendants, skipping comments and the
+    elements whose tag is in `excluded`.
+    """
+    if not isinstance(element.tag, basestring) or element.tag in excluded:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        for text in _visible_text(child, excluded):
+            yield text
+        if child.tail:
+            yield child.tail
+
+
+def html_text(source):
+    """
+    Return the text shown by the html `source`, without its scripts and styles.
+    """
+    if not source or not source.strip():
+        return u''
+    try:
+        tree = lxml_html.fromstring(source)
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        return u''
+    return u' '.join(_visible_text(tree, ('script', 'style')))
+
+
+def problem_text(source):
+    """
+    Return the text of the capa problem xml `source`, without its scripts,
+    answers, solutions and hints.
+    """
+    if not source or not source.strip():
+        return u''
+    try:
+        tree = etree.fromstring(source, etree.XMLParser(recover=True, remove_comments=True))
+    except (etree.XMLSyntaxError, ValueError):
+        return u''
+    if tree is None:
+        return u''
+    return u' '.join(_visible_text(tree, HIDDEN_PROBLEM_TAGS))
+
+
+def transcript_text(descriptor):
+    """
+    Return the text of the transcript of the video `descriptor`, or '' if it
+    has none.
+    """
+    sub = descriptor.sub or descriptor.youtube_id_1_0
+    if not sub:
+        return u''
+    location = StaticContent.compute_location(
+        descriptor.location.org, descriptor.location.course, 'subs_{0}.srt.sjson'.format(sub)
+    )
+    try:
+        transcript = json.loads(contentstore().find(location).data)
+    except Exception:  # pylint: disable=W0703
+        # there's no contentstore, or the transcript is missing or malformed
+        log.debug("No transcript indexed for %s", descriptor.location.url())
+        return u''
+    return u' '.join(transcript.get('text', []))
+
+
+def extract_text(descriptor):
+    """
+    Return the searchable text of `descriptor`.
+    """
+    category = descriptor.location.category
+    if category in ('html', 'about'):
+        text = html_text(descriptor.data)
+    elif category == 'problem':
+        text = problem_text(descriptor.data)
+    elif category == 'video':
+        text = transcript_text(descriptor)
+    else:
+        text = u''
+    return u' '.join(u' '.join([descriptor.display_name or u'', text]).split())
+
+
+def published_modulestore():
+    """
+    Return the modulestore of the published course content. Studio's default
+    modulestore reads drafts over the published items.
+    """
+    if 'direct' in settings.MODULESTORE:
+        return modulestore('direct')
+    return modulestore()
+
+
+def index_item(course_id, descriptor):
+    """
+    Index the text of `descriptor` for the course `course_id`, replacing what
+    was indexed for it before.
+    """
+    location = descriptor.location.url()
+    text = extract_text(descriptor)
+    terms = Counter(tokenize(text))
+    if not terms:
+        CourseSearchDocument.objects.filter(course_id=course_id, location=location).delete()
+        return
+
+    document, created = CourseSearchDocument.objects.get_or_create(course_id=course_id, location=location)
+    document.category = descriptor.location.category
+    document.display_name = descriptor.display_name_with_default[:255]
+    document.text = text
+    document.save()
+    if not created:
+        document.terms.all().delete()
+    CourseSearchTerm.objects.bulk_create([
+        CourseSearchTerm(document=document, term=term, count=count)
+        for term, count in terms.iteritems()
+    ])
+
+
+def _index_subtree(course_id, descriptor, indexed):
+    """
+    Index `descriptor` and its descendants, adding their locations to `indexed`.
+    """
+    to_process = [descriptor]
+    while to_process:
+        item = to_process.pop()
+        location = item.location.url()
+        if location in indexed:
+            continue
+        indexed.add(location)
+        index_item(course_id, item)
+        if item.has_children:
+            to_process.extend(item.get_children())
+
+
+def index_course(course_id):
+    """
+    Index all of the published content of the course `course_id`, and remove
+    from the index the items which aren't in it anymore.
+    """
+    store = published_modulestore()
+    course_location = CourseDescriptor.id_to_location(course_id)
+    course = store.get_instance(course_id, course_location, depth=None)
+
+    indexed = set()
+    _index_subtree(course_id, course, indexed)
+    for section in ABOUT_SECTIONS:
+        try:
+            about = store.get_instance(course_id, course_location.replace(category='about', name=section))
+        except ItemNotFoundError:
+            continue
+        indexed.add(about.location.url())
+        index_item(course_id, about)
+
+    CourseSearchDocument.objects.filter(course_id=course_id).exclude(location__in=indexed).delete()
+    log.info("Indexed %d items of %s", len(indexed), course_id)
+
+
+def _subtree_locations(course_id, location):
+    """
+    Return the urls of `location` and of its descendants, which are read from
+    the drafts when the item isn't published anymore. Only the url of
+    `location` is returned for an item which was deleted.
+    """
+    locations = set([location.url()])
+    try:
+        # Studio's default modulestore reads the drafts
+        descriptor = modulestore().get_instance(course_id, location, depth=None)
+    except ItemNotFoundError:
+        return locations
+
+    to_process = [descriptor]
+    while to_process:
+        item = to_process.pop()
+        locations.add(Location(item.location).replace(revision=None).url())
+        if item.has_children:
+            to_process.extend(item.get_children())
+    return locations
+
+
+def index_location(course_id, location):
+    """
+    Reindex the item at `location` of the course `course_id` after it was
+    written, with its descendants unless it's one of the SHALLOW_CATEGORIES.
+    Drafts aren't searchable, so writes to them are ignored. An item which
+    isn't published anymore is removed from the index with its descendants.
+    """
+    location = Location(location)
+    if location.revision == DRAFT:
+        return
+    if location.category == 'about' and location.name not in ABOUT_SECTIONS:
+        return
+
+    store = published_modulestore()
+    try:
+        descriptor = store.get_instance(course_id, location, depth=None)
+    except ItemNotFoundError:
+        CourseSearchDocument.objects.filter(
+            course_id=course_id, location__in=_subtree_locations(course_id, location)
+        ).delete()
+        return
+
+    if location.category in SHALLOW_CATEGORIES or location.category == 'about':
+        index_item(course_id, descriptor)
+    else:
+        _index_subtree(course_id, descriptor, set())
+
+
+def is_indexed(course_id):
+    """
+    Return whether the course `course_id` has been indexed.
+    """
+    return CourseSearchDocument.objects.filter(course_id=course_id).exists()
@@ -0,0 +1,31 @@
+"""
+Build the full-text index of the content of courses, searched in the LMS.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+from course_search.index import index_course, published_modulestore
+
+
+class Command(BaseCommand):
+    """
+    Index the published content of courses.
+    """
+    args = "[course_id ...]"
+    help = "Index the content of the given courses, or of all courses, for course search"
+
+    def handle(self, *args, **options):
+        if args:
+            course_ids = args
+        else:
+            course_ids = [course.id for course in published_modulestore().get_courses()]
+
+        for course_id in course_ids:
+            try:
+                with transaction.commit_on_success():
+                    index_course(course_id)
+            except ItemNotFoundError:
+                raise CommandError("No course {0}".format(course_id))
+            self.stdout.write("Indexed {0}\n".format(course_id))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'CourseSearchDocument'
+        db.create_table('course_search_coursesearchdocument', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('django.db.models.fields.CharField')(max_length=255, db_index=True)),
+            ('location', self.gf('django.db.models.fields.CharField')(max_length=255)),
+            ('category', self.gf('django.db.models.fields.CharField')(max_length=255)),
+            ('display_name', self.gf('django.db.models.fields.CharField')(max_length=255, blank=True)),
+            ('text', self.gf('django.db.models.fields.TextField')(blank=True)),
+            ('indexed', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
+        ))
+        db.send_create_signal('course_search', ['CourseSearchDocument'])
+
+        # Adding unique constraint on 'CourseSearchDocument', fields ['course_id', 'location']
+        db.create_unique('course_search_coursesearchdocument', ['course_id', 'location'])
+
+        # Adding model 'CourseSearchTerm'
+        db.create_table('course_search_coursesearchterm', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('document', self.gf('django.db.models.fields.related.ForeignKey')(related_name='terms', to=orm['course_search.CourseSearchDocument'])),
+            ('term', self.gf('django.db.models.fields.CharField')(max_length=64, db_index=True)),
+            ('count', self.gf('django.db.models.fields.IntegerField')(default=1)),
+        ))
+        db.send_create_signal('course_search', ['CourseSearchTerm'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'CourseSearchDocument', fields ['course_id', 'location']
+        db.delete_unique('course_search_coursesearchdocument', ['course_id', 'location'])
+
+        # Deleting model 'CourseSearchTerm'
+        db.delete_table('course_search_coursesearchterm')
+
+        # Deleting model 'CourseSearchDocument'
+        db.delete_table('course_search_coursesearchdocument')
+
+
+    models = {
+        'course_search.coursesearchdocument': {
+            'Meta': {'unique_together': "(('course_id', 'location'),)", 'object_name': 'CourseSearchDocument'},
+            'category': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'course_id': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'display_name': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'indexed': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'location': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'text': ('django.db.models.fields.TextField', [], {'blank': 'True'})
+        },
+        'course_search.coursesearchterm': {
+            'Meta': {'object_name': 'CourseSearchTerm'},
+            'count': ('django.db.models.fields.IntegerField', [], {'default': '1'}),
+            'document': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'terms'", 'to': "orm['course_search.CourseSearchDocument']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'term': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'})
+        }
+    }
+
+    complete_apps = ['course_search']
@@ -0,0 +1,79 @@
+"""
+The full-text index of course content, searched by the LMS.
+
+Each indexed item of a course has a CourseSearchDocument, with the counts of
+the terms of its text as CourseSearchTerms: an inverted index, which finds
+the items containing the terms of a query without reading any descriptors.
+"""
+import re
+
+from django.db import models
+from django.db.models import Count, Sum
+
+
+class CourseSearchDocument(models.Model):
+    """
+    The indexed text of an item of a course.
+    """
+    # the number of characters of text shown around a match
+    EXCERPT_LENGTH = 200
+
+    # the course the item was indexed for
+    course_id = models.CharField(max_length=255, db_index=True)
+
+    # the url of the location of the item
+    location = models.CharField(max_length=255)
+
+    category = models.CharField(max_length=255)
+    display_name = models.CharField(max_length=255, blank=True)
+
+    # the text extracted from the item, which results are excerpted from
+    text = models.TextField(blank=True)
+
+    indexed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """ meta attributes of this model """
+        unique_together = ('course_id', 'location')
+
+    @classmethod
+    def search(cls, course_id, terms, limit):
+        """
+        Return up to `limit` documents of the course `course_id` which contain
+        all of `terms`, the ones with the most occurrences of them first.
+        """
+        terms = set(terms)
+        if not terms:
+            return []
+        matches = CourseSearchTerm.objects.filter(
+            document__course_id=course_id, term__in=terms
+        ).values('document').annotate(
+            matched=Count('term', distinct=True), occurrences=Sum('count')
+        ).filter(matched=len(terms)).order_by('-occurrences', 'document')[:limit]
+
+        ranked_ids = [match['document'] for match in matches]
+        documents = cls.objects.in_bulk(ranked_ids)
+        return [documents[document_id] for document_id in ranked_ids if document_id in documents]
+
+    def excerpt(self, terms):
+        """
+        Return the part of the text around the first occurrence of one of `terms`.
+        """
+        pattern = u'|'.join(re.escape(term) for term in terms)
+        match = re.search(pattern, self.text, re.IGNORECASE | re.UNICODE) if pattern else None
+        start = max(0, match.start() - self.EXCERPT_LENGTH / 4) if match else 0
+        end = start + self.EXCERPT_LENGTH
+        return u''.join([
+            u'\u2026' if start > 0 else u'',
+            self.text[start:end],
+            u'\u2026' if end < len(self.text) else u'',
+        ])
+
+
+class CourseSearchTerm(models.Model):
+    """
+    The number of times a term occurs in the text of a document.
+    """
+    document = models.ForeignKey(CourseSearchDocument, related_name='terms')
+    term = models.CharField(max_length=64, db_index=True)
+    count = models.IntegerField(default=1)
@@ -0,0 +1,64 @@
+"""
+Keeps the course search index up to date with the writes to the modulestore.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from xmodule.modulestore import Location
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.mongo.draft import DRAFT
+
+from course_search import index
+
+log = logging.getLogger(__name__)
+
+# the modulestores whose writes are indexed: Studio writes drafts through its
+# default modulestore, and publishes some items through the direct one
+INDEXED_MODULESTORES = ('default', 'direct')
+
+
+def index_updated_item(sender, modulestore, course_id, location, **kwargs):  # pylint: disable=W0613,W0621
+    """
+    Reindex the item at `location` when it's written. `course_id` is the
+    org/course of the item, which can be shared by several runs of a course.
+
+    Drafts aren't searchable, so their writes return before any query. A
+    course which hasn't been indexed yet is left to the index_course_content
+    management command, as indexing it whole would hold up the write.
+    """
+    location = Location(location)
+    if location.revision == DRAFT:
+        return
+
+    course_filter = Location('i4x', location.org, location.course, 'course', None)
+    for course in modulestore.get_items(course_filter):
+        run_course_id = course.location.course_id
+        if not index.is_indexed(run_course_id):
+            continue
+        # the index is written in the transaction of the write
+        sid = transaction.savepoint()
+        try:
+            index.index_location(run_course_id, location)
+        except Exception:  # pylint: disable=W0703
+            # a failure to index must not fail the write
+            transaction.savepoint_rollback(sid)
+            log.exception("Failed to index %s for %s", location.url(), run_course_id)
+        else:
+            transaction.savepoint_commit(sid)
+
+
+def run():
+    """
+    Connect the indexing of course content to the modulestore update signals,
+    when course search is enabled.
+    """
+    if not settings.MITX_FEATURES.get('ENABLE_COURSE_SEARCH'):
+        return
+    for name in INDEXED_MODULESTORES:
+        if name not in settings.MODULESTORE:
+            continue
+        signal = getattr(modulestore(name), 'modulestore_update_signal', None)
+        if signal is not None:
+            signal.connect(index_updated_item)
@@ -0,0 +1,144 @@
+"""
+Tests of the indexing of course content
+"""
+from django.conf import settings
+from django.test.utils import override_settings
+from mock import Mock, patch
+
+from xmodule.modulestore.django import editable_modulestore
+from xmodule.modulestore.mongo.draft import as_draft
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, mongo_store_config
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from course_search import index
+from course_search.models import CourseSearchDocument
+from course_search.startup import index_updated_item
+
+TEST_DATA_MONGO_MODULESTORE = mongo_store_config(settings.COMMON_TEST_DATA_ROOT)
+
+PROBLEM_XML = """
+<problem>
+    <p>Which planet is closest to the sun?</p>
+    <multiplechoiceresponse>
+        <choicegroup type="MultipleChoice">
+            <choice correct="true">Mercury</choice>
+            <choice correct="false">Jupiter</choice>
+        </choicegroup>
+    </multiplechoiceresponse>
+    <solution><p>Only an orbit of eighty eight days</p></solution>
+</problem>
+"""
+
+
+def found(course_id, query):
+    """ The display names of the documents of the course found for `query` """
+    return [document.display_name for document in CourseSearchDocument.search(course_id, index.tokenize(query), 10)]
+
+
+@override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
+class IndexTest(ModuleStoreTestCase):
+    """
+    Tests of the building of the index of a course
+    """
+    def setUp(self):
+        self.course = CourseFactory.create(display_name='Astronomy')
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter',
+                                     display_name='The Solar System')
+        section = ItemFactory.create(parent_location=chapter.location, category='sequential',
+                                     display_name='Planets')
+        self.vertical = ItemFactory.create(parent_location=section.location, category='vertical',
+                                           display_name='Inner planets')
+        self.html = ItemFactory.create(
+            parent_location=self.vertical.location, category='html', display_name='Reading',
+            data='<p>Mercury has no moons.</p><script>var moons = "Phobos";</script>'
+        )
+        self.problem = ItemFactory.create(parent_location=self.vertical.location, category='problem',
+                                          display_name='Quiz', data=PROBLEM_XML)
+        ItemFactory.create(parent_location=self.course.location, category='about', display_name=None,
+                           location=self.course.location.replace(category='about', name='overview'),
+                           data='<p>An introduction to telescopes</p>')
+
+    def test_tokenize(self):
+        self.assertEqual(index.tokenize(u'The Moons of Mars, a planet'), [u'moons', u'mars', u'planet'])
+
+    def test_problem_text(self):
+        text = index.problem_text(PROBLEM_XML)
+        self.assertIn('closest', text)
+        self.assertIn('Jupiter', text)
+        self.assertNotIn('eighty', text)
+
+    def test_excerpt(self):
+        document = CourseSearchDocument(text=u' '.join(['word'] * 100 + ['Comet'] + ['word'] * 100))
+        excerpt = document.excerpt(['comet'])
+        self.assertTrue(excerpt.startswith(u'\u2026'))
+        self.assertTrue(excerpt.endswith(u'\u2026'))
+        self.assertIn('Comet', excerpt)
+
+    def test_index_course(self):
+        index.index_course(self.course.id)
+        self.assertEqual(found(self.course.id, 'mercury'), ['Reading', 'Quiz'])
+        self.assertEqual(found(self.course.id, 'moons mercury'), ['Reading'])
+        self.assertEqual(found(self.course.id, 'solar system'), ['The Solar System'])
+        self.assertEqual(len(found(self.course.id, 'telescopes')), 1)
+        # scripts and solutions aren't indexed
+        self.assertEqual(found(self.course.id, 'phobos'), [])
+        self.assertEqual(found(self.course.id, 'eighty'), [])
+        self.assertEqual(found(self.course.id, 'the'), [])
+
+    def test_index_course_removes_missing_items(self):
+        index.index_course(self.course.id)
+        editable_modulestore('direct').delete_item(self.html.location)
+        index.index_course(self.course.id)
+        self.assertEqual(found(self.course.id, 'mercury'), ['Quiz'])
+
+    def test_index_location(self):
+        index.index_course(self.course.id)
+        store = editable_modulestore('direct')
+        store.update_item(self.html.location, '<p>Venus is the hottest planet</p>')
+        index.index_location(self.course.id, self.vertical.location)
+        self.assertEqual(found(self.course.id, 'mercury'), ['Quiz'])
+        self.assertEqual(found(self.course.id, 'hottest'), ['Reading'])
+
+        store.delete_item(self.problem.location)
+        index.index_location(self.course.id, self.problem.location)
+        self.assertEqual(found(self.course.id, 'mercury'), [])
+
+    def test_index_location_ignores_drafts(self):
+        index.index_course(self.course.id)
+        editable_modulestore('direct').update_item(self.html.location, '<p>Venus</p>')
+        index.index_location(self.course.id, as_draft(self.html.location))
+        self.assertEqual(found(self.course.id, 'venus'), [])
+
+    def test_index_location_removes_unpublished_subtree(self):
+        index.index_course(self.course.id)
+        store = editable_modulestore('direct')
+        vertical = store.get_instance(self.course.id, self.vertical.location, depth=None)
+        store.delete_item(self.vertical.location)
+
+        # unpublishing leaves the unit and its children in the drafts only
+        drafts = Mock(get_instance=Mock(return_value=vertical))
+        with patch.object(index, 'modulestore', lambda name='default': drafts if name == 'default' else store):
+            index.index_location(self.course.id, self.vertical.location)
+        self.assertEqual(found(self.course.id, 'mercury'), [])
+        self.assertEqual(found(self.course.id, 'inner planets'), [])
+        self.assertEqual(found(self.course.id, 'solar system'), ['The Solar System'])
+
+    def test_index_updated_item(self):
+        store = editable_modulestore('direct')
+        course_id_no_run = '/'.join([self.course.location.org, self.course.location.course])
+
+        # courses which aren't indexed yet are left to the management command
+        with patch.object(index, 'index_course') as mock_index_course:
+            index_updated_item(store, store, course_id_no_run, self.html.location)
+        self.assertFalse(mock_index_course.called)
+        self.assertEqual(found(self.course.id, 'mercury'), [])
+
+        index.index_course(self.course.id)
+        store.update_item(self.html.location, '<p>Venus</p>')
+        index_updated_item(store, store, course_id_no_run, self.html.location)
+        self.assertEqual(found(self.course.id, 'venus'), ['Reading'])
+
+    def test_index_updated_draft(self):
+        store = Mock()
+        index_updated_item(store, store, 'org/course', as_draft(self.html.location))
+        self.assertFalse(store.get_items.called)
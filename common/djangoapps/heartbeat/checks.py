@@ -0,0 +1,202 @@
+"""
+Health checks of the services the app depends on, for the heartbeat views.
+
+Each check pings one dependency and raises if it is unusable. The checks
+run in threads so that a hung dependency is reported as down after
+CHECK_TIMEOUT seconds instead of hanging the probe. A check which is still
+running isn't started again, so a hung dependency doesn't pile up threads.
+Their report is kept in the process for REPORT_TIMEOUT seconds, so frequent
+load balancer probes reach the dependencies at most once per interval, and
+each server still reports its own connectivity.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from dogapi import dog_stats_api
+from pytz import UTC
+
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore
+
+log = logging.getLogger(__name__)
+
+# seconds a dependency has to answer before it is reported as down
+CHECK_TIMEOUT = 2.0
+
+# seconds a report is reused for
+REPORT_TIMEOUT = 5
+
+# the number of courses is kept in the shared cache, and counted again in the
+# background when it is older than COURSE_COUNT_REFRESH seconds, as counting
+# them loads every course
+COURSE_COUNT_CACHE_KEY = 'heartbeat.course_count'
+COURSE_COUNT_CACHE_TIMEOUT = 24 * 60 * 60
+COURSE_COUNT_REFRESH = 5 * 60
+
+
+def check_sql():
+    """ Run a trivial query on the SQL database. """
+    try:
+        cursor = connection.cursor()
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    finally:
+        # the connection belongs to the check's thread, which won't close it at the end of a request
+        connection.close()
+
+
+def _mongo_modulestores():
+    """ The modulestores of the default modulestore which are backed by Mongo. """
+    store = modulestore()
+    stores = getattr(store, 'modulestores', {}).values() or [store]
+    return [store for store in stores if hasattr(store, 'collection')]
+
+
+def check_mongo():
+    """ Ping the databases of the Mongo modulestores. """
+    for store in _mongo_modulestores():
+        store.collection.database.command('ping')
+
+
+def check_cache():
+    """ Write a value to the default cache and read it back. """
+    value = time.time()
+    cache.set('heartbeat.cache_check', value, 60)
+    if cache.get('heartbeat.cache_check') != value:
+        raise Exception("The cache didn't return the value just set")
+
+
+def check_contentstore():
+    """ Ping the database of the content store, if it is backed by Mongo. """
+    store = contentstore()
+    if hasattr(store, 'fs_files'):
+        store.fs_files.database.command('ping')
+
+
+# name -> check, of the dependencies checked for readiness
+CHECKS = {
+    'sql': check_sql,
+    'mongo': check_mongo,
+    'cache': check_cache,
+    'contentstore': check_contentstore,
+}
+
+
+class _CheckThread(threading.Thread):
+    """
+    Runs a check, recording its outcome.
+    """
+    def __init__(self, name, check):
+        super(_CheckThread, self).__init__(name='heartbeat-{0}'.format(name))
+        self.daemon = True
+        self.check = check
+        self.error = None
+        self.start_time = time.time()
+        self.latency = None
+
+    def run(self):
+        try:
+            self.check()
+        except Exception as err:  # pylint: disable=W0703
+            log.exception("Heartbeat check %s failed", self.name)
+            self.error = u'{0}: {1}'.format(type(err).__name__, err)
+        self.latency = time.time() - self.start_time
+
+
+_running_lock = threading.Lock()
+_running = {}  # (name, check) -> _CheckThread of the last run of the check
+
+
+def _start_check(name, check):
+    """
+    Returns the thread of the last run of `check` if it is still running, so
+    that a hung dependency keeps a single thread busy, and starts a new run
+    otherwise.
+    """
+    with _running_lock:
+        thread = _running.get((name, check))
+        if thread is None or not thread.is_alive():
+            thread = _CheckThread(name, check)
+            thread.start()
+            _running[(name, check)] = thread
+        return thread
+
+
+def run_checks(checks, timeout=CHECK_TIMEOUT):
+    """
+    Runs `checks`, a dict of name -> check, concurrently.
+
+    Returns a dict of name -> {'ok', 'latency', and 'error' if not ok}. Checks
+    which take more than `timeout` seconds are reported as failed, and aren't
+    run again until they finish: later calls wait for the same run.
+    """
+    threads = dict((name, _start_check(name, check)) for name, check in checks.iteritems())
+    start = time.time()
+
+    results = {}
+    for name, thread in threads.iteritems():
+        thread.join(max(0, start + timeout - time.time()))
+        if thread.is_alive():
+            latency = time.time() - thread.start_time
+            result = {'ok': False, 'latency': latency,
+                      'error': 'timed out, still running after {0:.1f}s'.format(latency)}
+        else:
+            result = {'ok': thread.error is None, 'latency': thread.latency}
+            if thread.error is not None:
+                result['error'] = thread.error
+        dog_stats_api.histogram('edxapp.heartbeat.check.latency', result['latency'], tags=['check:' + name])
+        results[name] = result
+    return results
+
+
+def _count_courses():
+    """ Count the courses of the default modulestore, and cache the count. """
+    count = len(modulestore().get_courses())
+    cache.set(COURSE_COUNT_CACHE_KEY, (count, time.time()), COURSE_COUNT_CACHE_TIMEOUT)
+
+
+def course_count():
+    """
+    Returns the last count of the courses of the default modulestore, or None
+    if they haven't been counted yet. The courses are counted again in a
+    background thread when the count is older than COURSE_COUNT_REFRESH, so
+    that the probe never waits for it.
+    """
+    cached = cache.get(COURSE_COUNT_CACHE_KEY)
+    if cached is None or cached[1] + COURSE_COUNT_REFRESH < time.time():
+        _start_check('course_count', _count_courses)
+    return cached[0] if cached is not None else None
+
+
+_report_lock = threading.Lock()
+_report = {'expires': 0, 'report': None}
+
+
+def readiness_report():
+    """
+    Returns the report of the checks of CHECKS: {'ok', 'date', 'checks'}, 'ok'
+    being True if all the dependencies are up. Reports are reused for
+    REPORT_TIMEOUT seconds.
+    """
+    with _report_lock:
+        if _report['expires'] > time.time():
+            return _report['report']
+
+        checks = run_checks(CHECKS)
+        report = {
+            'ok': all(result['ok'] for result in checks.itervalues()),
+            'date': datetime.now(UTC).isoformat(),
+            'checks': checks,
+        }
+        _report.update(expires=time.time() + REPORT_TIMEOUT, report=report)
+        return report
+
+
+def clear_report():
+    """ Forget the last report, so that the next one runs the checks. """
+    with _report_lock:
+        _report.update(expires=0, report=None)
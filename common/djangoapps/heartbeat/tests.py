@@ -0,0 +1,111 @@
+"""
+Tests of the heartbeat views and health checks.
+"""
+import json
+import time
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+from mock import patch, Mock
+
+from heartbeat import checks
+
+
+def failing_check():
+    """ A check of a dependency which is down """
+    raise Exception("down")
+
+
+class HeartbeatTest(TestCase):
+    """
+    Tests of the heartbeat views.
+    """
+    def setUp(self):
+        checks.clear_report()
+        self.addCleanup(checks.clear_report)
+
+    def get_heartbeat(self):
+        """ Returns the response and the decoded report of the heartbeat view. """
+        response = self.client.get(reverse('heartbeat'))
+        return response, json.loads(response.content)
+
+    def test_alive(self):
+        response = self.client.get(reverse('heartbeat_alive'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('date', json.loads(response.content))
+
+    def test_heartbeat(self):
+        response, report = self.get_heartbeat()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(report['ok'])
+        self.assertEqual(set(report['checks']), set(checks.CHECKS))
+        self.assertIn('latency', report['checks']['sql'])
+        self.assertIn('course_count', report)
+
+    def test_failing_dependency(self):
+        with patch.dict(checks.CHECKS, {'mongo': failing_check}):
+            response, report = self.get_heartbeat()
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(report['checks']['mongo']['ok'])
+        self.assertIn('down', report['checks']['mongo']['error'])
+        self.assertTrue(report['checks']['sql']['ok'])
+
+    def test_report_is_reused(self):
+        with patch.object(checks, 'run_checks', wraps=checks.run_checks) as mock_run_checks:
+            self.get_heartbeat()
+            self.get_heartbeat()
+        self.assertEqual(mock_run_checks.call_count, 1)
+
+
+class RunChecksTest(TestCase):
+    """
+    Tests of running the checks.
+    """
+    def test_timeout(self):
+        results = checks.run_checks({'slow': lambda: time.sleep(1), 'fast': lambda: None}, timeout=0.1)
+        self.assertFalse(results['slow']['ok'])
+        self.assertIn('timed out', results['slow']['error'])
+        self.assertTrue(results['fast']['ok'])
+
+    def test_hung_check_runs_once(self):
+        runs = []
+
+        def hung_check():
+            runs.append(1)
+            time.sleep(1)
+
+        checks.run_checks({'hung': hung_check}, timeout=0.1)
+        results = checks.run_checks({'hung': hung_check}, timeout=0.1)
+        self.assertFalse(results['hung']['ok'])
+        self.assertIn('still running', results['hung']['error'])
+        self.assertEqual(len(runs), 1)
+
+
+class CourseCountTest(TestCase):
+    """
+    Tests of counting the courses for the heartbeat.
+    """
+    def setUp(self):
+        cache.delete(checks.COURSE_COUNT_CACHE_KEY)
+        self.addCleanup(cache.delete, checks.COURSE_COUNT_CACHE_KEY)
+
+    def count_in_background(self, count):
+        """ Returns course_count(), and waits for the courses to be counted again if they are. """
+        store = Mock()
+        store.get_courses.return_value = [Mock()] * count
+        with patch.object(checks, 'modulestore', return_value=store):
+            result = checks.course_count()
+            thread = checks._running.get(('course_count', checks._count_courses))  # pylint: disable=W0212
+            if thread is not None:
+                thread.join()
+        return result
+
+    def test_count_in_background(self):
+        self.assertIsNone(self.count_in_background(3))
+        self.assertEqual(self.count_in_background(4), 3)
+
+    def test_outdated_count(self):
+        cache.set(checks.COURSE_COUNT_CACHE_KEY, (2, time.time() - checks.COURSE_COUNT_REFRESH - 1))
+        self.assertEqual(self.count_in_background(3), 2)
+        self.assertEqual(checks.course_count(), 3)
@@ -2,4 +2,5 @@ from django.conf.urls import url, patterns
 
 urlpatterns = patterns('',  # nopep8
     url(r'^$', 'heartbeat.views.heartbeat', name='heartbeat'),
+    url(r'^/alive$', 'heartbeat.views.alive', name='heartbeat_alive'),
 )
@@ -2,17 +2,33 @@ import json
 from datetime import datetime
 from pytz import UTC
 from django.http import HttpResponse
-from xmodule.modulestore.django import modulestore
 from dogapi import dog_stats_api
 
+from heartbeat import checks
+
 
 @dog_stats_api.timed('edxapp.heartbeat')
 def heartbeat(request):
     """
-    Simple view that a loadbalancer can check to verify that the app is up
+    View that a loadbalancer can check to verify that the app is up and can
+    reach the services it depends on.
+
+    Reports the state and latency of each dependency (see heartbeat.checks)
+    and the number of courses, with a 503 status if a dependency is down.
+    """
+    report = dict(checks.readiness_report())
+    if report['ok']:
+        # a down dependency can make counting courses hang or fail
+        report['course_count'] = checks.course_count()
+    return HttpResponse(
+        json.dumps(report, indent=4),
+        status=200 if report['ok'] else 503,
+        mimetype="application/json"
+    )
+
+
+def alive(request):
+    """
+    Simple view showing that the app is running, without checking its dependencies
     """
-    output = {
-        'date': datetime.now(UTC).isoformat(),
-        'courses': [course.location.url() for course in modulestore().get_courses()],
-    }
-    return HttpResponse(json.dumps(output, indent=4))
+    return HttpResponse(json.dumps({'date': datetime.now(UTC).isoformat()}), mimetype="application/json")
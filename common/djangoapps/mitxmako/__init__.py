@@ -13,3 +13,5 @@
 #   limitations under the License.
 
 lookup = None
+# directory of the compiled template modules, set by mitxmako.startup.run
+module_directory = None
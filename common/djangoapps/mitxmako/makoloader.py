@@ -1,3 +1,4 @@
+import hashlib
 import logging
 
 from django.conf import settings
@@ -8,10 +9,14 @@ from django.template.loaders.app_directories import Loader as AppDirectoriesLoad
 
 from mitxmako.template import Template
 
+import mitxmako
 import tempdir
 
 log = logging.getLogger(__name__)
 
+# the mako templates loaded by this process: (template name, file path) -> (source digest, Template)
+compiled_templates = {}
+
 
 class MakoLoader(object):
     """
@@ -26,7 +31,8 @@ class MakoLoader(object):
         # base_loader is an instance of a BaseLoader subclass
         self.base_loader = base_loader
 
-        module_directory = getattr(settings, 'MAKO_MODULE_DIR', None)
+        # prefer the directory chosen by mitxmako.startup, which may be shared between processes
+        module_directory = mitxmako.module_directory or getattr(settings, 'MAKO_MODULE_DIR', None)
 
         if module_directory is None:
             log.warning("For more caching of mako templates, set the MAKO_MODULE_DIR in settings!")
@@ -42,12 +48,20 @@ class MakoLoader(object):
         source, file_path = self.load_template_source(template_name, template_dirs)
 
         if source.startswith("## mako\n"):
-            # This is a mako template
+            # This is a mako template. Reuse the Template already loaded for
+            # this file unless its source changed.
+            key = (template_name, file_path)
+            digest = hashlib.md5(source.encode('utf-8')).hexdigest()
+            cached = compiled_templates.get(key)
+            if cached is not None and cached[0] == digest:
+                return cached[1], None
+
             template = Template(filename=file_path,
                                 module_directory=self.module_directory,
                                 input_encoding='utf-8',
                                 output_encoding='utf-8',
                                 uri=template_name)
+            compiled_templates[key] = (digest, template)
             return template, None
         else:
             # This is a regular template
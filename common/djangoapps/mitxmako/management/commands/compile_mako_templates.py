@@ -0,0 +1,68 @@
+"""
+Compile all the mako templates of MAKO_TEMPLATES ahead of time, so that the
+processes started after a deploy find their compiled modules instead of each
+compiling the templates on first use.
+
+Only useful with MAKO_MODULE_CACHE_ROOT set, see mitxmako.startup.get_module_directory.
+"""
+import os
+import shutil
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+import mitxmako
+from mitxmako import startup
+
+
+class Command(BaseCommand):
+    """
+    Compile the mako templates into the shared module directory.
+    """
+
+    help = "Compile the mako templates into the shared template module directory."
+
+    option_list = BaseCommand.option_list + (
+        make_option('--prune',
+                    action='store_true',
+                    dest='prune',
+                    default=False,
+                    help="Remove the module directories of other versions of the templates"),
+    )
+
+    def handle(self, *args, **options):
+        if getattr(settings, 'MAKO_MODULE_CACHE_ROOT', None) is None:
+            self.stderr.write("MAKO_MODULE_CACHE_ROOT isn't set, templates would be compiled to a private directory\n")
+            return
+
+        startup.run()
+        self.stdout.write("Compiling templates to {0}\n".format(mitxmako.module_directory))
+
+        compiled = failed = 0
+        for location, directories in settings.MAKO_TEMPLATES.iteritems():
+            lookup = mitxmako.lookup[location]
+            for _directory, name in startup.template_files(directories):
+                uri = '/' + name.replace(os.sep, '/')
+                try:
+                    lookup.get_template(uri)
+                    compiled += 1
+                except Exception as err:  # pylint: disable=W0703
+                    # not every file in a template directory is a mako template
+                    self.stderr.write("Could not compile {0}: {1}\n".format(uri, err))
+                    failed += 1
+
+        self.stdout.write("Compiled {0} templates, {1} failed\n".format(compiled, failed))
+
+        if options['prune']:
+            self._prune(settings.MAKO_MODULE_CACHE_ROOT, mitxmako.module_directory)
+
+    def _prune(self, cache_root, module_directory):
+        """
+        Remove the directories of `cache_root` other than `module_directory`.
+        """
+        for name in os.listdir(cache_root):
+            path = os.path.join(cache_root, name)
+            if os.path.isdir(path) and os.path.abspath(path) != os.path.abspath(module_directory):
+                self.stdout.write("Removing {0}\n".format(path))
+                shutil.rmtree(path, ignore_errors=True)
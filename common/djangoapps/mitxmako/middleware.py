@@ -12,14 +12,63 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import threading
+
 from django.template import RequestContext
 
-requestcontext = None
+# the LazyRequestContext of the request being handled by the current thread
+_local = threading.local()
+
+
+class LazyRequestContext(object):
+    """
+    The template context of a request. The context processors only run the
+    first time a template is rendered for the request, and their results are
+    merged once into a single dictionary.
+    """
+    def __init__(self, request):
+        self.request = request
+        self._dictionary = None
+
+    def dictionary(self):
+        """
+        Returns the merged dictionary of the request context. Don't modify it,
+        it's shared by all the renders of the request.
+        """
+        if self._dictionary is None:
+            requestcontext = RequestContext(self.request)
+            requestcontext['is_secure'] = self.request.is_secure()
+            requestcontext['site'] = self.request.get_host()
+
+            dictionary = {}
+            for d in requestcontext:
+                dictionary.update(d)
+            self._dictionary = dictionary
+        return self._dictionary
+
+
+def get_request_context():
+    """
+    Returns the LazyRequestContext of the request handled by the current thread,
+    or None outside of a request (e.g. in various testing contexts).
+    """
+    return getattr(_local, 'requestcontext', None)
+
+
+def request_context_dictionary():
+    """
+    Returns a new dictionary holding the template context of the current
+    request, which the caller may update.
+    """
+    requestcontext = get_request_context()
+    if requestcontext is None:
+        return {}
+    return dict(requestcontext.dictionary())
+
 
 class MakoMiddleware(object):
 
     def process_request(self, request):
-        global requestcontext
-        requestcontext = RequestContext(request)
-        requestcontext['is_secure'] = request.is_secure()
-        requestcontext['site'] = request.get_host()
+        # the context is kept until the thread handles its next request, as
+        # middleware which runs after this one may still render templates
+        _local.requestcontext = LazyRequestContext(request)
@@ -74,16 +74,13 @@ def render_to_string(template_name, dictionary, context=None, namespace='main'):
     context_instance = Context(dictionary)
     # add dictionary to context_instance
     context_instance.update(dictionary or {})
-    # collapse context_instance to a single dictionary for mako
-    context_dictionary = {}
     context_instance['settings'] = settings
     context_instance['MITX_ROOT_URL'] = settings.MITX_ROOT_URL
     context_instance['marketing_link'] = marketing_link
 
-    # In various testing contexts, there might not be a current request context.
-    if mitxmako.middleware.requestcontext is not None:
-        for d in mitxmako.middleware.requestcontext:
-            context_dictionary.update(d)
+    # collapse context_instance to a single dictionary for mako, on top of
+    # the request context if there's one
+    context_dictionary = mitxmako.middleware.request_context_dictionary()
     for d in context_instance:
         context_dictionary.update(d)
     if context:
@@ -2,6 +2,10 @@
 Initialize the mako template lookup
 """
 
+import hashlib
+import os
+
+import mako
 import tempdir
 from django.conf import settings
 from mako.lookup import TemplateLookup
@@ -9,14 +13,60 @@ from mako.lookup import TemplateLookup
 import mitxmako
 
 
+def template_files(directories):
+    """
+    Yields (directory, path relative to directory) for every file under the
+    template `directories`, in a stable order.
+    """
+    for directory in directories:
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                yield directory, os.path.relpath(os.path.join(dirpath, filename), directory)
+
+
+def templates_digest(template_locations):
+    """
+    Returns a hex digest of the names and contents of all the templates of
+    `template_locations`, and of the mako version which compiles them.
+    """
+    digest = hashlib.md5(mako.__version__)
+    for location in sorted(template_locations):
+        digest.update(location)
+        for directory, name in template_files(template_locations[location]):
+            digest.update(name)
+            with open(os.path.join(directory, name), 'rb') as template_file:
+                digest.update(hashlib.md5(template_file.read()).digest())
+    return digest.hexdigest()
+
+
+def get_module_directory():
+    """
+    Returns the directory where compiled template modules are written.
+
+    When MAKO_MODULE_CACHE_ROOT is set, this is a subdirectory of it named by
+    the digest of the templates, so all the processes running the same
+    templates share their compiled modules, including those compiled ahead of
+    time by the compile_mako_templates command. Mako writes each module to a
+    temporary file and moves it into place, so the directory can be written
+    to by several processes at once. Otherwise, this is MAKO_MODULE_DIR, or a
+    temporary directory when that isn't set.
+    """
+    cache_root = getattr(settings, 'MAKO_MODULE_CACHE_ROOT', None)
+    if cache_root is not None:
+        return os.path.join(cache_root, templates_digest(settings.MAKO_TEMPLATES))
+
+    module_directory = getattr(settings, 'MAKO_MODULE_DIR', None)
+    if module_directory is None:
+        module_directory = tempdir.mkdtemp_clean()
+    return module_directory
+
+
 def run():
     """Setup mako variables and lookup object"""
     # Set all mako variables based on django settings
     template_locations = settings.MAKO_TEMPLATES
-    module_directory = getattr(settings, 'MAKO_MODULE_DIR', None)
-
-    if module_directory is None:
-        module_directory = tempdir.mkdtemp_clean()
+    module_directory = get_module_directory()
 
     lookup = {}
 
@@ -31,3 +81,4 @@ def run():
         )
 
     mitxmako.lookup = lookup
+    mitxmako.module_directory = module_directory
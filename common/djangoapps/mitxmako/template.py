@@ -44,13 +44,9 @@ class Template(MakoTemplate):
         This takes a render call with a context (from Django) and translates
         it to a render call on the mako template.
         """
-        # collapse context_instance to a single dictionary for mako
-        context_dictionary = {}
-
-        # In various testing contexts, there might not be a current request context.
-        if mitxmako.middleware.requestcontext is not None:
-            for d in mitxmako.middleware.requestcontext:
-                context_dictionary.update(d)
+        # collapse context_instance to a single dictionary for mako, on top of
+        # the request context if there's one
+        context_dictionary = mitxmako.middleware.request_context_dictionary()
         for d in context_instance:
             context_dictionary.update(d)
         context_dictionary['settings'] = settings
@@ -1,7 +1,17 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from django.contrib.auth.models import AnonymousUser
+from django.template import RequestContext
 from django.test import TestCase
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
+from mitxmako.middleware import MakoMiddleware, get_request_context, request_context_dictionary
 from mitxmako.shortcuts import marketing_link
+from mitxmako.startup import get_module_directory, templates_digest
 from mock import patch
 from util.testing import UrlResetMixin
 
@@ -24,3 +34,69 @@ class ShortcutsTests(UrlResetMixin, TestCase):
             expected_link = reverse('login')
             link = marketing_link('ABOUT')
             self.assertEquals(link, expected_link)
+
+
+class ModuleDirectoryTests(TestCase):
+    """
+    Test the choice of the compiled template module directory
+    """
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        self.write_template('Hello ${name}')
+        self.template_locations = {'main': [self.template_dir]}
+
+    def write_template(self, source):
+        """ Write the test template """
+        with open(os.path.join(self.template_dir, 'hello.html'), 'w') as template_file:
+            template_file.write(source)
+
+    def test_digest_follows_template_content(self):
+        digest = templates_digest(self.template_locations)
+        self.assertEquals(digest, templates_digest(self.template_locations))
+        self.write_template('Goodbye ${name}')
+        self.assertNotEquals(digest, templates_digest(self.template_locations))
+
+    def test_shared_module_directory(self):
+        with override_settings(MAKO_TEMPLATES=self.template_locations, MAKO_MODULE_CACHE_ROOT='/tmp/mako_cache'):
+            self.assertEquals(
+                get_module_directory(),
+                os.path.join('/tmp/mako_cache', templates_digest(self.template_locations))
+            )
+
+    def test_private_module_directory(self):
+        with override_settings(MAKO_MODULE_CACHE_ROOT=None, MAKO_MODULE_DIR='/tmp/mako_private'):
+            self.assertEquals(get_module_directory(), '/tmp/mako_private')
+
+
+class RequestContextTests(TestCase):
+    """
+    Test the request context kept by MakoMiddleware
+    """
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+
+    def test_context_built_once_on_first_render(self):
+        with patch('mitxmako.middleware.RequestContext', wraps=RequestContext) as request_context:
+            MakoMiddleware().process_request(self.request)
+            # the context processors don't run until a template needs them
+            self.assertFalse(request_context.called)
+            first = request_context_dictionary()
+            second = request_context_dictionary()
+            self.assertEquals(request_context.call_count, 1)
+
+        self.assertEquals(first['site'], 'testserver')
+        # each render gets its own copy
+        first['site'] = 'changed'
+        self.assertEquals(second['site'], 'testserver')
+
+    def test_context_per_thread(self):
+        MakoMiddleware().process_request(self.request)
+        other_thread_contexts = []
+        thread = threading.Thread(target=lambda: other_thread_contexts.append(get_request_context()))
+        thread.start()
+        thread.join()
+
+        self.assertEquals(other_thread_contexts, [None])
+        self.assertEquals(get_request_context().request, self.request)
@@ -51,7 +51,7 @@ from xmodule.modulestore.django import modulestore
 
 from collections import namedtuple
 
-from courseware.courses import get_courses, sort_by_announcement
+from courseware.courses import get_courses, get_course_about_sections, sort_by_announcement
 from courseware.access import has_access
 
 from external_auth.models import ExternalAuthMap
@@ -99,6 +99,8 @@ def index(request, extra_context={}, user=None):
 
     courses = get_courses(None, domain=domain)
     courses = sort_by_announcement(courses)
+    # fetch the descriptions of all the courses at once, course.html then finds them in the request cache
+    get_course_about_sections(request, courses, 'short_description')
 
     context = {'courses': courses}
 
@@ -0,0 +1,40 @@
+"""
+A cache of the values computed most recently, for the parses and
+conversions of the math and chemistry libraries which see the same
+expressions again and again.
+"""
+from collections import OrderedDict
+
+
+class BoundedCache(object):
+    """
+    A dict of at most `size` entries: when it is full, setting a new key
+    drops the entry which was used least recently.
+
+    Reading a missing key raises KeyError, like a dict.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+
+    def __getitem__(self, key):
+        # move the entry to the end, which holds the most recently used ones
+        value = self._entries.pop(key)
+        self._entries[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._entries.pop(key, None)
+        while self._entries and len(self._entries) >= self.size:
+            self._entries.popitem(last=False)
+        self._entries[key] = value
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """ Drop all the entries. """
+        self._entries.clear()
@@ -0,0 +1,36 @@
+"""
+Unit tests for cache.py
+"""
+
+import unittest
+from calc.cache import BoundedCache
+
+
+class BoundedCacheTest(unittest.TestCase):
+    """
+    Test that BoundedCache keeps the entries used most recently.
+    """
+    def test_get_set(self):
+        cache = BoundedCache(2)
+        cache['a'] = 1
+        self.assertEqual(cache['a'], 1)
+        self.assertIn('a', cache)
+        self.assertRaises(KeyError, lambda: cache['b'])
+
+    def test_bounded(self):
+        cache = BoundedCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        # reading 'a' makes 'b' the least recently used entry
+        cache['a']
+        cache['c'] = 3
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_clear(self):
+        cache = BoundedCache(2)
+        cache['a'] = 1
+        cache.clear()
+        self.assertEqual(len(cache), 0)
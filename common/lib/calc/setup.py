@@ -2,7 +2,7 @@ from setuptools import setup
 
 setup(
     name="calc",
-    version="0.2",
+    version="0.3",
     packages=["calc"],
     install_requires=[
         "pyparsing==1.5.6",
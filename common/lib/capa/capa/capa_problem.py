@@ -388,6 +388,44 @@ class LoncapaProblem(object):
         html = contextualize_text(etree.tostring(self._extract_html(self.tree)), self.context)
         return html
 
+    def get_changed_responses(self, old_correct_map, old_student_answers):
+        '''
+        Return the ids of the responses whose HTML changed when the CorrectMap
+        and student answers of this problem replaced `old_correct_map` and
+        `old_student_answers`: those with an input whose CorrectMap entry or
+        answer changed.
+
+        Returns None if the HTML of every response changed, as the overall
+        message shown in each of them did.
+        '''
+        if old_correct_map.get_overall_message() != self.correct_map.get_overall_message():
+            return None
+
+        old_cmap = old_correct_map.get_dict()
+        new_cmap = self.correct_map.get_dict()
+        changed = []
+        for response, responder in self.responders.iteritems():
+            if any(old_cmap.get(answer_id) != new_cmap.get(answer_id) or
+                   old_student_answers.get(answer_id) != self.student_answers.get(answer_id)
+                   for answer_id in responder.answer_ids):
+                changed.append(response.get('id'))
+        return changed
+
+    def get_response_html(self, response_ids):
+        '''
+        Return the HTML of the responses with `response_ids`, as get_html
+        renders them, without rendering the rest of the problem.
+
+        Returns a dict mapping the id of the element of each response in the
+        problem HTML to its HTML.
+        '''
+        responses = dict((response.get('id'), response) for response in self.responders)
+        fragments = {}
+        for response_id in response_ids:
+            tree = self._extract_html(responses[response_id])
+            fragments[tree.get('id')] = contextualize_text(etree.tostring(tree, with_tail=False), self.context)
+        return fragments
+
     def handle_input_ajax(self, data):
         '''
         InputTypes can support specialized AJAX calls. Find the correct input and pass along the correct data
@@ -0,0 +1,57 @@
+"""
+Previews of the values typed in the input types which show one as the
+student types.
+
+A preview only depends on the value typed and on the type of the input, so
+it can be computed without the problem or the student's state, and the
+previews of the values typed most recently are kept for reuse.
+"""
+import functools
+
+from calc.cache import BoundedCache
+from capa import inputtypes
+
+# the number of previews kept per kind of preview
+PREVIEW_CACHE_SIZE = 10000
+
+
+def memoize_preview(preview):
+    """
+    Keeps the results of the `preview` function of a formula. The results
+    are copied, so that callers can add to them.
+    """
+    cache = BoundedCache(PREVIEW_CACHE_SIZE)
+
+    @functools.wraps(preview)
+    def memoized(formula):
+        try:
+            return dict(cache[formula])
+        except KeyError:
+            pass
+
+        result = preview(formula)
+        cache[formula] = result
+        return dict(result)
+
+    memoized.cache = cache
+    return memoized
+
+
+# type of preview -> function returning {'preview', 'error'} for a formula
+PREVIEWERS = {
+    'chemcalc': memoize_preview(inputtypes.preview_chemical_equation),
+    'formcalc': memoize_preview(inputtypes.preview_formula),
+}
+# numerical answers are math expressions too
+PREVIEWERS['numerical'] = PREVIEWERS['formcalc']
+
+
+def preview_input(preview_type, formula):
+    """
+    Returns the preview of `formula` typed in an input previewed as
+    `preview_type`, one of PREVIEWERS: a dict with the keys 'preview' and
+    'error', as returned by the input types' preview dispatches.
+
+    Raises KeyError for an unknown preview_type.
+    """
+    return PREVIEWERS[preview_type](formula)
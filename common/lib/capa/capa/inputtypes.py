@@ -1036,26 +1036,32 @@ class ChemicalEquationInput(InputTypeBase):
            'error' : 'the-error' or ''
         }
         """
-
-        result = {'preview': '',
-                  'error': ''}
         try:
             formula = data['formula']
         except KeyError:
-            result['error'] = "No formula specified."
-            return result
+            return {'preview': '', 'error': "No formula specified."}
 
-        try:
-            result['preview'] = chemcalc.render_to_html(formula)
-        except pyparsing.ParseException as err:
-            result['error'] = u"Couldn't parse formula: {0}".format(err.msg)
-        except Exception:
-            # this is unexpected, so log
-            log.warning(
-                "Error while previewing chemical formula", exc_info=True)
-            result['error'] = "Error while rendering preview"
+        return preview_chemical_equation(formula)
 
-        return result
+
+def preview_chemical_equation(formula):
+    """
+    Returns the preview of a chemical formula or equation typed in a
+    ChemicalEquationInput, see ChemicalEquationInput.preview_chemcalc.
+    """
+    result = {'preview': '',
+              'error': ''}
+    try:
+        result['preview'] = chemcalc.render_to_html(formula)
+    except pyparsing.ParseException as err:
+        result['error'] = u"Couldn't parse formula: {0}".format(err.msg)
+    except Exception:
+        # this is unexpected, so log
+        log.warning(
+            "Error while previewing chemical formula", exc_info=True)
+        result['error'] = "Error while rendering preview"
+
+    return result
 
 registry.register(ChemicalEquationInput)
 
@@ -1120,34 +1126,39 @@ class FormulaEquationInput(InputTypeBase):
            'request_start' : <time sent with request>
         }
         """
-
-        result = {'preview': '',
-                  'error': ''}
-
         try:
             formula = get['formula']
         except KeyError:
-            result['error'] = "No formula specified."
-            return result
+            return {'preview': '', 'error': "No formula specified."}
 
+        result = preview_formula(formula)
         result['request_start'] = int(get.get('request_start', 0))
+        return result
 
-        try:
-            # TODO add references to valid variables and functions
-            # At some point, we might want to mark invalid variables as red
-            # or something, and this is where we would need to pass those in.
-            result['preview'] = latex_preview(formula)
-        except pyparsing.ParseException as err:
-            result['error'] = "Sorry, couldn't parse formula"
-            result['formula'] = formula
-        except Exception:
-            # this is unexpected, so log
-            log.warning(
-                "Error while previewing formula", exc_info=True
-            )
-            result['error'] = "Error while rendering preview"
 
-        return result
+def preview_formula(formula):
+    """
+    Returns the preview of a math expression typed in a FormulaEquationInput,
+    see FormulaEquationInput.preview_formcalc.
+    """
+    result = {'preview': '',
+              'error': ''}
+    try:
+        # TODO add references to valid variables and functions
+        # At some point, we might want to mark invalid variables as red
+        # or something, and this is where we would need to pass those in.
+        result['preview'] = latex_preview(formula)
+    except pyparsing.ParseException as err:
+        result['error'] = "Sorry, couldn't parse formula"
+        result['formula'] = formula
+    except Exception:
+        # this is unexpected, so log
+        log.warning(
+            "Error while previewing formula", exc_info=True
+        )
+        result['error'] = "Error while rendering preview"
+
+    return result
 
 registry.register(FormulaEquationInput)
 
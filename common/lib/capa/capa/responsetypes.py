@@ -207,6 +207,8 @@ class LoncapaResponse(object):
         '''
         # render ourself as a <span> + our content
         tree = etree.Element('span')
+        # the client replaces this span when the response is rendered again
+        tree.set('id', 'response_{0}'.format(self.id))
 
         # problem author can make this span display:inline
         if self.xml.get('inline', ''):
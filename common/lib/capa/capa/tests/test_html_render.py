@@ -246,6 +246,41 @@ class CapaHtmlRenderTest(unittest.TestCase):
         the_html = problem.get_html()
         self.assertRegexpMatches(the_html, r"<div>\s+</div>")
 
+    def test_render_changed_responses(self):
+        xml_str = textwrap.dedent("""
+            <problem>
+                <stringresponse answer="first"><textline/></stringresponse>
+                <stringresponse answer="second"><textline/></stringresponse>
+            </problem>
+        """)
+
+        # Create the problem
+        problem = new_loncapa_problem(xml_str)
+        first_id, second_id = sorted(response.get('id') for response in problem.responders)
+        answers = {first_id + '_1': 'first', second_id + '_1': 'wrong'}
+
+        # Expect that grading the first answers changes every response
+        old_correct_map, old_student_answers = problem.correct_map, problem.student_answers
+        problem.grade_answers(answers)
+        changed = problem.get_changed_responses(old_correct_map, old_student_answers)
+        self.assertEqual(sorted(changed), [first_id, second_id])
+
+        # Expect that changing the second answer only changes its response
+        old_correct_map, old_student_answers = problem.correct_map, problem.student_answers
+        problem.grade_answers(dict(answers, **{second_id + '_1': 'second'}))
+        changed = problem.get_changed_responses(old_correct_map, old_student_answers)
+        self.assertEqual(changed, [second_id])
+
+        # Expect that the response is rendered as it is in the whole problem
+        fragments = problem.get_response_html(changed)
+        self.assertEqual(fragments.keys(), ['response_' + second_id])
+        rendered_html = etree.XML(problem.get_html())
+        response_element = rendered_html.find(".//span[@id='response_{0}']".format(second_id))
+        self.assertEqual(
+            etree.tostring(response_element, with_tail=False),
+            etree.tostring(etree.XML(fragments['response_' + second_id]))
+        )
+
     def _create_test_file(self, path, content_str):
         test_fp = self.system.filestore.open(path, "w")
         test_fp.write(content_str)
@@ -0,0 +1,40 @@
+"""
+Tests of the previews of the values typed in the input types.
+"""
+
+import unittest
+
+from mock import patch
+
+from capa import input_preview
+
+
+class InputPreviewTest(unittest.TestCase):
+    """
+    Tests of capa.input_preview.preview_input.
+    """
+    def setUp(self):
+        for previewer in input_preview.PREVIEWERS.itervalues():
+            previewer.cache.clear()
+
+    def test_formula_preview(self):
+        response = input_preview.preview_input('formcalc', 'x^2')
+        self.assertEqual(response['error'], '')
+        self.assertNotEqual(response['preview'], '')
+
+    def test_chemical_equation_preview(self):
+        response = input_preview.preview_input('chemcalc', 'H2O')
+        self.assertEqual(response['error'], '')
+        self.assertNotEqual(response['preview'], '')
+
+    def test_previews_are_reused(self):
+        with patch('capa.inputtypes.latex_preview', return_value='x') as mock_preview:
+            first = input_preview.preview_input('formcalc', 'x')
+            first['request_start'] = 1
+            second = input_preview.preview_input('numerical', 'x')
+        self.assertEqual(mock_preview.call_count, 1)
+        self.assertNotIn('request_start', second)
+
+    def test_unknown_type(self):
+        with self.assertRaises(KeyError):
+            input_preview.preview_input('unknown', 'x')
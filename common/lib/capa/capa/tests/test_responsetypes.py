@@ -9,7 +9,6 @@ import pyparsing
 import random
 import unittest
 import textwrap
-import requests
 import mock
 
 from . import new_loncapa_problem, test_system
@@ -209,24 +208,18 @@ class SymbolicResponseTest(ResponseTest):
                 <math xmlns="http://www.w3.org/1998/Math/MathML">
                     <mstyle displaystyle="true">
                     <mn>2</mn><mo>*</mo><mi>x</mi><mo>+</mo><mn>3</mn><mo>*</mo><mi>y</mi>
-                    </mstyle></math>"""),
-             'snuggletex_2x+3y.xml'),
+                    </mstyle></math>""")),
 
             ('x+x+3y', textwrap.dedent("""
                 <math xmlns="http://www.w3.org/1998/Math/MathML">
                     <mstyle displaystyle="true">
                     <mi>x</mi><mo>+</mo><mi>x</mi><mo>+</mo><mn>3</mn><mo>*</mo><mi>y</mi>
-                    </mstyle></math>"""),
-             'snuggletex_x+x+3y.xml'),
+                    </mstyle></math>""")),
         ]
 
-        for (input_str, input_mathml, server_fixture) in correct_inputs:
+        for (input_str, input_mathml) in correct_inputs:
             print "Testing input: {0}".format(input_str)
-            server_resp = self._load_fixture(server_fixture)
-            self._assert_symbolic_grade(
-                problem, input_str, input_mathml,
-                'correct', snuggletex_resp=server_resp
-            )
+            self._assert_symbolic_grade(problem, input_str, input_mathml, 'correct')
 
     def test_grade_single_input_incorrect(self):
         problem = self.build_problem(math_display=True, expect="2*x+3*y")
@@ -251,15 +244,10 @@ class SymbolicResponseTest(ResponseTest):
             options=["matrix", "imaginary"]
         )
 
-        correct_snuggletex = self._load_fixture('snuggletex_correct.html')
         dynamath_input = self._load_fixture('dynamath_input.txt')
         student_response = "cos(theta)*[[1,0],[0,1]] + i*sin(theta)*[[0,1],[1,0]]"
 
-        self._assert_symbolic_grade(
-            problem, student_response, dynamath_input,
-            'correct',
-            snuggletex_resp=correct_snuggletex
-        )
+        self._assert_symbolic_grade(problem, student_response, dynamath_input, 'correct')
 
     def test_complex_number_grade_incorrect(self):
 
@@ -267,18 +255,24 @@ class SymbolicResponseTest(ResponseTest):
                                      expect="[[cos(theta),i*sin(theta)],[i*sin(theta),cos(theta)]]",
                                      options=["matrix", "imaginary"])
 
-        wrong_snuggletex = self._load_fixture('snuggletex_wrong.html')
         dynamath_input = textwrap.dedent("""
             <math xmlns="http://www.w3.org/1998/Math/MathML">
               <mstyle displaystyle="true"><mn>2</mn></mstyle>
             </math>
         """)
 
-        self._assert_symbolic_grade(
-            problem, "2", dynamath_input,
-            'incorrect',
-            snuggletex_resp=wrong_snuggletex,
-        )
+        self._assert_symbolic_grade(problem, "2", dynamath_input, 'incorrect')
+
+    def test_illegal_math_grade_incorrect(self):
+        problem = self.build_problem(math_display=True, expect="2*x+3*y")
+
+        dynamath_input = textwrap.dedent("""
+            <math xmlns="http://www.w3.org/1998/Math/MathML">
+              <mstyle displaystyle="true"><mn>2</mn><mo>*</mo><mi>x</mi><mo>+</mo></mstyle>
+            </math>
+        """)
+
+        self._assert_symbolic_grade(problem, "2x+", dynamath_input, 'incorrect')
 
     def test_multiple_inputs_exception(self):
 
@@ -287,10 +281,7 @@ class SymbolicResponseTest(ResponseTest):
         with self.assertRaises(Exception):
             self.build_problem(math_display=True, expect="2*x+3*y", num_inputs=3)
 
-    def _assert_symbolic_grade(
-        self, problem, student_input, dynamath_input, expected_correctness,
-        snuggletex_resp=""
-    ):
+    def _assert_symbolic_grade(self, problem, student_input, dynamath_input, expected_correctness):
         """
         Assert that the symbolic response has a certain grade.
 
@@ -298,20 +289,15 @@ class SymbolicResponseTest(ResponseTest):
         `student_input` is the text the student entered.
         `dynamath_input` is the JavaScript rendered MathML from the page.
         `expected_correctness` is either "correct" or "incorrect"
-        `snuggletex_resp` is the simulated response from the Snuggletex server
         """
         input_dict = {'1_2_1': str(student_input),
                       '1_2_1_dynamath': str(dynamath_input)}
 
-        # Simulate what the Snuggletex server would respond
-        with mock.patch.object(requests, 'post') as mock_post:
-            mock_post.return_value.text = snuggletex_resp
-
-            correct_map = problem.grade_answers(input_dict)
+        correct_map = problem.grade_answers(input_dict)
 
-            self.assertEqual(
-                correct_map.get_correctness('1_2_1'), expected_correctness
-            )
+        self.assertEqual(
+            correct_map.get_correctness('1_2_1'), expected_correctness
+        )
 
     @staticmethod
     def _load_fixture(relpath):
@@ -0,0 +1,62 @@
+"""
+Benchmark of the parsing of chemical expressions.
+
+Compares, over expressions of the tests, the pyparsing tokenizer and NLTK
+chart parser of the grammar, the tokenizer and deterministic parser of
+chemcalc, and chemcalc with its cache of final trees, as used when checking
+and previewing answers.
+
+Run it with:
+    python benchmark.py [number of rounds]
+"""
+import sys
+import time
+
+import nltk
+
+from chem import chemcalc
+
+EXPRESSIONS = [
+    "H2O", "H2 + O2", "2H2O(s) + 2CO2", "3/4CO2 + H2O", "7/2H^+ + 3/5OH^-",
+    "5(H1H212)^70010- + 2H2O + 7/2HCl + H2O", "5[Ni(NH3)4]^2+ + 5/2SO4^2-",
+    "Fe(OH)^2- + (OH)^-", "H^+ + OH^-", "[Fe(CN)6]^4-(aq)", "10(NH4)2SO4",
+    "C6H12O6 + 6O2", "6CO2 + 6H2O", "H2O(", "Xe+",
+]
+
+
+def chart_parse(expression, chart_parser=nltk.ChartParser(chemcalc.cfg)):
+    """ Parse expression with pyparsing and a chart parser, like chemcalc used to. """
+    parsed = chart_parser.parse(chemcalc.tokenizer.parseString(expression))
+    return chemcalc._clean_parse_tree(chemcalc._merge_children(parsed, {'S', 'group'}))
+
+
+def cached_parse(expression):
+    """ Parse expression with chemcalc, keeping its trees between rounds. """
+    return chemcalc._get_final_tree(expression)
+
+
+def run(parse, rounds):
+    """ Return the seconds taken to parse each of the EXPRESSIONS rounds times. """
+    chemcalc._final_trees.clear()
+    start = time.time()
+    for _ in xrange(rounds):
+        for expression in EXPRESSIONS:
+            try:
+                parse(expression)
+            except (chemcalc.ParseException, ValueError):
+                pass
+    return time.time() - start
+
+
+def main(rounds):
+    parses = rounds * len(EXPRESSIONS)
+    print "{0} parses of {1} expressions".format(parses, len(EXPRESSIONS))
+    for name, parse in [('chart parser', chart_parse),
+                        ('chemcalc parser', chemcalc._parse_final_tree),
+                        ('chemcalc parser, cached', cached_parse)]:
+        seconds = run(parse, rounds)
+        print "{0:<25} {1:8.3f}s {2:10.1f} us/parse".format(name, seconds, seconds / parses * 1e6)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -1,10 +1,13 @@
 from __future__ import division
 from fractions import Fraction
+import re
 
 from pyparsing import (Literal, StringEnd, OneOrMore, ParseException)
 import nltk
 from nltk.tree import Tree
 
+from calc.cache import BoundedCache
+
 ARROWS = ('<->', '->')
 
 ## Defines a simple pyparsing tokenizer for chemical equations
@@ -25,6 +28,31 @@ phases = ["(s)", "(l)", "(g)", "(aq)"]
 tokens = reduce(lambda a, b: a ^ b, map(Literal, elements + digits + symbols + phases))
 tokenizer = OneOrMore(tokens) + StringEnd()
 
+## The same tokenizer as a regular expression, a lot faster than pyparsing's
+## longest match among all the literals: the longest literals come first.
+_token_re = re.compile('|'.join(
+    re.escape(token) for token in sorted(elements + digits + symbols + phases, key=len, reverse=True)))
+_whitespace_re = re.compile('[ \t\r\n]*')
+
+
+def _tokenize(s):
+    '''
+    Split s into the tokens of tokenizer.
+
+    Raises pyparsing.ParseException if s isn't made of tokens.
+    '''
+    tokens = []
+    position = _whitespace_re.match(s).end()
+    while position < len(s):
+        match = _token_re.match(s, position)
+        if match is None:
+            raise ParseException(s, position, "Expected an element, digit, symbol or phase")
+        tokens.append(str(match.group()))
+        position = _whitespace_re.match(s, match.end()).end()
+    if not tokens:
+        raise ParseException(s, position, "Expected an element, digit, symbol or phase")
+    return tokens
+
 
 def _orjoin(l):
     return "'" + "' | '".join(l) + "'"
@@ -51,7 +79,129 @@ grammar = """
 
   suffixed -> unsuffixed | unsuffixed suffix
 """
-parser = nltk.ChartParser(nltk.parse_cfg(grammar))
+cfg = nltk.parse_cfg(grammar)
+
+_elements = frozenset(elements)
+_digits = frozenset(digits)
+_phases = frozenset(phases)
+
+
+class _NoParse(Exception):
+    ''' Raised by _Parser when the tokens don't match the grammar '''
+    pass
+
+
+class _Parser(object):
+    '''
+    A deterministic parser of tokenized expressions for the grammar above,
+    returning the same trees as an NLTK chart parser of the grammar.
+
+    One token of lookahead is enough to pick the expansion of each rule: the
+    expansions of a rule start with different tokens, or its shorter
+    expansion can't be followed by the tokens which continue the longer one.
+    The one ambiguity of the grammar is a molecule which is only a paren
+    group, e.g. '(OH)', which is either an unphased paren group or a group
+    made of that paren group. It is always read as a group, like paren groups
+    followed by a suffix or by other groups, so that such molecules compare
+    equal to each other.
+    '''
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+        self.position = 0
+
+    def parse(self):
+        ''' Return the tree of the tokens, or None if they don't match the grammar '''
+        try:
+            tree = self.S()
+        except _NoParse:
+            return None
+        if self.position != len(self.tokens):
+            return None
+        return tree
+
+    def peek(self):
+        ''' The next token, or None at the end of the tokens '''
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self, allowed):
+        ''' Consume the next token, which must be in allowed '''
+        token = self.peek()
+        if token is None or token not in allowed:
+            raise _NoParse()
+        self.position += 1
+        return token
+
+    def S(self):
+        multimolecule = self.multimolecule()
+        if self.peek() == '+':
+            return Tree('S', [multimolecule, self.take('+'), self.S()])
+        return Tree('S', [multimolecule])
+
+    def multimolecule(self):
+        if self.peek() in _digits:
+            return Tree('multimolecule', [self.count(), self.molecule()])
+        return Tree('multimolecule', [self.molecule()])
+
+    def count(self):
+        number = self.number()
+        if self.peek() == '/':
+            return Tree('count', [number, self.take('/'), self.number()])
+        return Tree('count', [number])
+
+    def number(self):
+        digit = Tree('digit', [self.take(_digits)])
+        if self.peek() in _digits:
+            return Tree('number', [digit, self.number()])
+        return Tree('number', [digit])
+
+    def molecule(self):
+        unphased = Tree('unphased', [self.group()])
+        if self.peek() in _phases:
+            return Tree('molecule', [unphased, Tree('phase', [self.take(_phases)])])
+        return Tree('molecule', [unphased])
+
+    def group(self):
+        suffixed = self.suffixed()
+        token = self.peek()
+        if token in _elements or token in ('(', '['):
+            return Tree('group', [suffixed, self.group()])
+        return Tree('group', [suffixed])
+
+    def suffixed(self):
+        unsuffixed = self.unsuffixed()
+        token = self.peek()
+        if token in _digits or token == '^':
+            return Tree('suffixed', [unsuffixed, self.suffix()])
+        return Tree('suffixed', [unsuffixed])
+
+    def unsuffixed(self):
+        token = self.peek()
+        if token == '(':
+            child = Tree('paren_group_round', [self.take('('), self.group(), self.take(')')])
+        elif token == '[':
+            child = Tree('paren_group_square', [self.take('['), self.group(), self.take(']')])
+        else:
+            child = Tree('element', [self.take(_elements)])
+        return Tree('unsuffixed', [child])
+
+    def suffix(self):
+        if self.peek() == '^':
+            return Tree('suffix', [self.ion_suffix()])
+        number_suffix = Tree('number_suffix', [self.number()])
+        if self.peek() == '^':
+            return Tree('suffix', [number_suffix, self.ion_suffix()])
+        return Tree('suffix', [number_suffix])
+
+    def ion_suffix(self):
+        caret = self.take('^')
+        if self.peek() in _digits:
+            return Tree('ion_suffix', [caret, self.number(), self.plus_minus()])
+        return Tree('ion_suffix', [caret, self.plus_minus()])
+
+    def plus_minus(self):
+        return Tree('plus_minus', [self.take(('+', '-'))])
 
 
 def _clean_parse_tree(tree):
@@ -235,16 +385,46 @@ def render_to_html(eq):
     return spanify(render_expression(left) + render_arrow(arrow) + render_expression(right))
 
 
+def _parse_final_tree(s):
+    '''
+    Parse s, and return its final tree after merge and clean.
+    '''
+    tokenized = _tokenize(s)
+    cfg.check_coverage(tokenized)
+    parsed = _Parser(tokenized).parse()
+    merged = _merge_children(parsed, {'S', 'group'})
+    final = _clean_parse_tree(merged)
+    return final
+
+
+# the number of expressions whose final trees are kept, see _get_final_tree
+FINAL_TREE_CACHE_SIZE = 10000
+_final_trees = BoundedCache(FINAL_TREE_CACHE_SIZE)
+
+
 def _get_final_tree(s):
     '''
     Return final tree after merge and clean.
 
+    The trees of the expressions parsed most recently are kept: the same
+    instructor answers are compared to every submission, and previews render
+    again what the student has typed so far. The returned tree is shared,
+    and must not be modified.
+
     Raises pyparsing.ParseException if s is invalid.
     '''
-    tokenized = tokenizer.parseString(s)
-    parsed = parser.parse(tokenized)
-    merged = _merge_children(parsed, {'S', 'group'})
-    final = _clean_parse_tree(merged)
+    try:
+        final = _final_trees[s]
+    except KeyError:
+        try:
+            final = _parse_final_tree(s)
+        except (ParseException, ValueError) as err:
+            # invalid expressions are typed again and again while previewing
+            final = err
+        _final_trees[s] = final
+
+    if isinstance(final, Exception):
+        raise final
     return final
 
 
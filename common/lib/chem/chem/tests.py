@@ -2,6 +2,11 @@ import codecs
 from fractions import Fraction
 import unittest
 
+from mock import patch
+import nltk
+from pyparsing import ParseException
+
+from . import chemcalc
 from .chemcalc import (compare_chemical_expression, divide_chemical_expression,
                       render_to_html, chemical_equations_equal)
 
@@ -209,6 +214,14 @@ class Test_Divide_Expressions(unittest.TestCase):
         self.assertFalse(divide_chemical_expression(
             "6/2CO2 + H2O", "2H2O+9/6CO2"), 2)
 
+    def test_divide_paren_groups(self):
+        self.assertEqual(divide_chemical_expression(
+            "2(OH)^- + 2(H)", "(OH)^- + (H)"), 2)
+        self.assertEqual(divide_chemical_expression(
+            "2(OH)", "(OH)"), 2)
+        self.assertFalse(divide_chemical_expression(
+            "(OH)", "(H)"))
+
 
 class Test_Render_Equations(unittest.TestCase):
 
@@ -318,6 +331,54 @@ class Test_Render_Equations(unittest.TestCase):
         self.assertEqual(out, correct)
 
 
+class Test_Parser(unittest.TestCase):
+    ''' The parser must read expressions like an NLTK chart parser of the grammar '''
+    expressions = [
+        "H2O", "2H2O(s) + 2CO2", "3/4CO2 + H2O", "5(H1H212)^70010- + 2H2O + 7/2HCl + H2O",
+        "5[Ni(NH3)4]^2+ + 5/2SO4^2-", "H^+ + OH^-", "Fe(OH)^2- + (OH)^-", "H^1- + H2^1+",
+        "[Fe(CN)6]^4-(aq)", "10(NH4)2SO4", "Xe+", "H2O(", "2/H", "H^2", "H2O + ", "(H)2(O)",
+    ]
+
+    def setUp(self):
+        chemcalc._final_trees.clear()
+
+    def test_same_trees(self):
+        chart_parser = nltk.ChartParser(chemcalc.cfg)
+        for expression in self.expressions:
+            tokens = chemcalc.tokenizer.parseString(expression)
+            parsed = chemcalc._Parser(tokens).parse()
+            if parsed is None:
+                self.assertEqual(chart_parser.nbest_parse(tokens), [], expression)
+            else:
+                self.assertIn(parsed, chart_parser.nbest_parse(tokens), expression)
+
+    def test_same_tokens(self):
+        for expression in self.expressions + [" H2O (aq) ", "Uuo2 + Uu", "5.2H20", "H{2}", "(aq", ""]:
+            try:
+                tokens = list(chemcalc.tokenizer.parseString(expression))
+            except ParseException:
+                self.assertRaises(ParseException, chemcalc._tokenize, expression)
+            else:
+                self.assertEqual(chemcalc._tokenize(expression), tokens, expression)
+
+    def test_parse_errors(self):
+        for expression in ("Xe+", "H2O(", "5.2H20", "H{"):
+            exception = ValueError if '{' in expression else ParseException
+            # a second time from the cache
+            for _ in range(2):
+                with self.assertRaises(exception):
+                    chemcalc._get_final_tree(expression)
+
+    def test_trees_are_kept(self):
+        with patch.object(chemcalc._final_trees, 'size', 2):
+            tree = chemcalc._get_final_tree("H2O")
+            self.assertIs(chemcalc._get_final_tree("H2O"), tree)
+            chemcalc._get_final_tree("CO2")
+            chemcalc._get_final_tree("O2")
+            self.assertNotIn("H2O", chemcalc._final_trees)
+            self.assertEqual(chemcalc._get_final_tree("H2O"), tree)
+
+
 class Test_Crystallography_Miller(unittest.TestCase):
     ''' Tests  for crystallography grade function.'''
 
@@ -459,6 +520,7 @@ def suite():
     testcases = [Test_Compare_Expressions,
                  Test_Divide_Expressions,
                  Test_Render_Equations,
+                 Test_Parser,
                  Test_Crystallography_Miller]
     suites = []
     for testcase in testcases:
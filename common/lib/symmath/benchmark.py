@@ -0,0 +1,67 @@
+"""
+Benchmark of symbolic math checking.
+
+Times symmath_check over the cases of symmath/test_symmath_check.py, with the
+Content MathML conversions converted for each check, and kept between checks
+as when grading. The conversions used to be posted to a SnuggleTeX server,
+which took a network round trip per check.
+
+Run it with:
+    python benchmark.py [number of rounds]
+"""
+import logging
+import sys
+import time
+
+from symmath.formula import _cmathml_cache
+from symmath.symmath_check import symmath_check
+
+
+def mathml(*elements):
+    """ The Presentation MathML of ASCIIMathML for elements, a list of (tag, text) """
+    return (
+        '<math xmlns="http://www.w3.org/1998/Math/MathML"><mstyle displaystyle="true"><mrow>' +
+        ''.join('<{0}>{1}</{0}>'.format(tag, text) for tag, text in elements) +
+        '</mrow></mstyle></math>'
+    )
+
+# (expected, answer, dynamath) of test_symmath_check.py
+NUMBER_CASES = (
+    [(str(n), str(n), None) for n in range(-100, 100)] +
+    [(str(n + 0.01), str(n + 0.01), None) for n in range(-100, 100)]
+)
+MATHML_CASES = [
+    ("x+2*y", "x+2*y", mathml(('mi', 'x'), ('mo', '+'), ('mn', '2'), ('mo', '*'), ('mi', 'y'))),
+    ("x+2*y", "x+y+y", mathml(('mi', 'x'), ('mo', '+'), ('mi', 'y'), ('mo', '+'), ('mi', 'y'))),
+    ("0", "x+y", mathml(('mi', 'x'), ('mo', '+'), ('mi', 'y'))),
+    # answers which are only checked from their MathML
+    ("x^2+2*x*y", "x(x+2y)", mathml(('mi', 'x'), ('mo', '('), ('mi', 'x'), ('mo', '+'),
+                                     ('mn', '2'), ('mi', 'y'), ('mo', ')'))),
+    ("sin(x)/2", "sin x/2", mathml(('mi', 'sin'), ('mi', 'x'), ('mo', '/'), ('mn', '2'))),
+]
+
+
+def run(cases, rounds, keep_conversions):
+    """ Return the seconds taken to check each of the cases rounds times. """
+    _cmathml_cache.clear()
+    start = time.time()
+    for _ in xrange(rounds):
+        for expect, ans, dynamath in cases:
+            if not keep_conversions:
+                _cmathml_cache.clear()
+            symmath_check(expect, ans, dynamath=[dynamath] if dynamath else None)
+    return time.time() - start
+
+
+def main(rounds):
+    for cases_name, cases in [('numbers', NUMBER_CASES), ('MathML', MATHML_CASES)]:
+        checks = rounds * len(cases)
+        print "{0} checks of {1} {2} cases".format(checks, len(cases), cases_name)
+        for name, keep_conversions in [('converted', False), ('conversions kept', True)]:
+            seconds = run(cases, rounds, keep_conversions)
+            print "  {0:<20} {1:8.3f}s {2:10.1f} us/check".format(name, seconds, seconds / checks * 1e6)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.ERROR)
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
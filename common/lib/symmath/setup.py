@@ -2,9 +2,10 @@ from setuptools import setup
 
 setup(
     name="symmath",
-    version="0.1",
+    version="0.2",
     packages=["symmath"],
     install_requires=[
         "sympy",
+        "calc",
     ],
 )
@@ -24,20 +24,26 @@ from sympy.physics.quantum.state import *
 # from sympy.core.operations import LatticeOp
 # import sympy.physics.quantum.qubit
 
-from xml.sax.saxutils import unescape
 import sympy
 import unicodedata
 from lxml import etree
 #import subprocess
-import requests
 from copy import deepcopy
 
+from calc.cache import BoundedCache
+
+from .upconversion import pmathml_to_cmathml, UpConversionError, FAILURE_MESSAGE
+
 log = logging.getLogger(__name__)
 
 log.warning("Dark code. Needs review before enabling in prod.")
 
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
+# the number of Content MathML conversions kept, see formula.GetContentMathML
+CMATHML_CACHE_SIZE = 10000
+_cmathml_cache = BoundedCache(CMATHML_CACHE_SIZE)
+
 #-----------------------------------------------------------------------------
 
 
@@ -559,39 +565,25 @@ class formula(object):
     sympy = property(make_sympy, None, None, 'sympy representation')
 
     def GetContentMathML(self, asciimath, mathml):
-        # URL = 'http://192.168.1.2:8080/snuggletex-webapp-1.2.2/ASCIIMathMLUpConversionDemo'
-        # URL = 'http://127.0.0.1:8080/snuggletex-webapp-1.2.2/ASCIIMathMLUpConversionDemo'
-        URL = 'https://math-xserver.mitx.mit.edu/snuggletex-webapp-1.2.2/ASCIIMathMLUpConversionDemo'
-
-        if 1:
-            payload = {'asciiMathInput': asciimath,
-                       'asciiMathML': mathml,
-                       #'asciiMathML':unicode(mathml).encode('utf-8'),
-                       }
-            headers = {'User-Agent': "Mozilla/5.0 (Windows; U; Windows NT 5.1; en-US; rv:1.8.1.13) Gecko/20080311 Firefox/2.0.0.13"}
-            r = requests.post(URL, data=payload, headers=headers, verify=False)
-            r.encoding = 'utf-8'
-            ret = r.text
-            #print "encoding: ",r.encoding
-
-        # return ret
-
-        mode = 0
-        cmathml = []
-        for k in ret.split('\n'):
-            if 'conversion to Content MathML' in k:
-                mode = 1
-                continue
-            if mode == 1:
-                if '<h3>Maxima Input Form</h3>' in k:
-                    mode = 0
-                    continue
-                cmathml.append(k)
-        # return '\n'.join(cmathml)
-        cmathml = '\n'.join(cmathml[2:])
-        cmathml = '<math xmlns="http://www.w3.org/1998/Math/MathML">\n' + unescape(cmathml) + '\n</math>'
-        # print cmathml
-        #return unicode(cmathml)
+        '''
+        Return the Content MathML of the pre-processed presentation MathML
+        mathml, converted in process by symmath.upconversion. The conversions
+        of the inputs converted most recently are kept.
+
+        asciimath, the ASCIIMathML input, was only used by SnuggleTeX.
+        '''
+        try:
+            return _cmathml_cache[mathml]
+        except KeyError:
+            pass
+
+        try:
+            cmathml = pmathml_to_cmathml(mathml)
+        except UpConversionError as err:
+            # not XML, so that make_sympy reports an illegal math expression
+            cmathml = '%s: %s' % (FAILURE_MESSAGE, err)
+
+        _cmathml_cache[mathml] = cmathml
         return cmathml
 
 #-----------------------------------------------------------------------------
@@ -0,0 +1,120 @@
+"""
+Tests of the up-conversion of Presentation MathML to Content MathML
+"""
+
+import re
+import sys
+import unittest
+
+from mock import patch
+
+from .formula import formula, _cmathml_cache
+from .upconversion import pmathml_to_cmathml, UpConversionError
+
+
+def stripXML(xml):
+    xml = xml.replace('\n', '')
+    xml = re.sub(r'\> *\<', '><', xml)
+    return xml.strip()
+
+
+class UpConversionTest(unittest.TestCase):
+    mathml_start = '<math xmlns="http://www.w3.org/1998/Math/MathML"><mstyle displaystyle="true">'
+    mathml_end = '</mstyle></math>'
+
+    def assert_converts(self, pmathml, cmathml):
+        converted = pmathml_to_cmathml(self.mathml_start + pmathml + self.mathml_end)
+        expected = '<math xmlns="http://www.w3.org/1998/Math/MathML">' + cmathml + '</math>'
+        self.assertEqual(stripXML(converted), stripXML(expected))
+
+    def test_snuggletex_sum_of_products(self):
+        # as converted by SnuggleTeX
+        self.assert_converts(
+            '<mn>2</mn><mo>*</mo><mi>x</mi><mo>+</mo><mn>3</mn><mo>*</mo><mi>y</mi>',
+            '<apply><plus/>'
+            '<apply><times/><cn>2</cn><ci>x</ci></apply>'
+            '<apply><times/><cn>3</cn><ci>y</ci></apply>'
+            '</apply>'
+        )
+        self.assert_converts(
+            '<mi>x</mi><mo>+</mo><mi>x</mi><mo>+</mo><mn>3</mn><mo>*</mo><mi>y</mi>',
+            '<apply><plus/><ci>x</ci><ci>x</ci><apply><times/><cn>3</cn><ci>y</ci></apply></apply>'
+        )
+
+    def test_snuggletex_functions_and_matrices(self):
+        # as converted by SnuggleTeX
+        self.assert_converts(
+            '<mrow><mi>cos</mi><mrow><mo>(</mo><mi>theta</mi><mo>)</mo></mrow></mrow>'
+            '<mo>&#x22C5;</mo>'
+            '<mrow><mo>[</mo><mtable>'
+            '<mtr><mtd><mn>1</mn></mtd><mtd><mn>0</mn></mtd></mtr>'
+            '<mtr><mtd><mn>0</mn></mtd><mtd><mn>1</mn></mtd></mtr>'
+            '</mtable><mo>]</mo></mrow>',
+            '<apply><times/>'
+            '<apply><cos/><ci>theta</ci></apply>'
+            '<list><matrix>'
+            '<vector><cn>1</cn><cn>0</cn></vector>'
+            '<vector><cn>0</cn><cn>1</cn></vector>'
+            '</matrix></list>'
+            '</apply>'
+        )
+
+    def test_precedence(self):
+        self.assert_converts(
+            '<mo>-</mo><mi>a</mi><mo>-</mo><mi>b</mi><mi>c</mi><mo>/</mo><mn>2</mn>',
+            '<apply><minus/>'
+            '<apply><minus/><ci>a</ci></apply>'
+            '<apply><divide/><apply><times/><ci>b</ci><ci>c</ci></apply><cn>2</cn></apply>'
+            '</apply>'
+        )
+
+    def test_fractions_powers_and_roots(self):
+        self.assert_converts(
+            '<mfrac><mrow><mi>x</mi><mo>+</mo><mn>1</mn></mrow><msup><mi>y</mi><mn>2</mn></msup></mfrac>'
+            '<mo>+</mo><msqrt><mi>z</mi></msqrt>',
+            '<apply><plus/>'
+            '<apply><divide/>'
+            '<apply><plus/><ci>x</ci><cn>1</cn></apply>'
+            '<apply><power/><ci>y</ci><cn>2</cn></apply>'
+            '</apply>'
+            '<apply><root/><ci>z</ci></apply>'
+            '</apply>'
+        )
+
+    def test_lists(self):
+        self.assert_converts(
+            '<mo>[</mo><mn>1</mn><mo>,</mo><mi>x</mi><mo>]</mo>',
+            '<list><cn>1</cn><ci>x</ci></list>'
+        )
+
+    def test_errors(self):
+        for pmathml in ['<mo>(</mo><mi>x</mi>', '<mi>x</mi><mo>+</mo>', '<mi>x</mi><mo>,</mo><mi>y</mi>',
+                        '<munder><mi>x</mi><mi>y</mi></munder>', '']:
+            with self.assertRaises(UpConversionError):
+                pmathml_to_cmathml(self.mathml_start + pmathml + self.mathml_end)
+
+
+class FormulaSympyTest(unittest.TestCase):
+    def setUp(self):
+        _cmathml_cache.clear()
+
+    def sympy(self, pmathml, options=None):
+        expr = UpConversionTest.mathml_start + pmathml + UpConversionTest.mathml_end
+        return formula(expr, options=options).sympy
+
+    def test_sympy(self):
+        self.assertEqual(str(self.sympy('<mi>x</mi><mo>+</mo><mi>y</mi><mo>+</mo><mi>y</mi>')), 'x + 2*y')
+        self.assertEqual(str(self.sympy('<mi>i</mi><mi>x</mi>', options='imaginary')), 'I*x')
+        self.assertEqual(str(self.sympy('<msub><mi>x</mi><mn>1</mn></msub><mo>-</mo><mn>1</mn>')), 'x_1 - 1')
+
+    def test_illegal_expression(self):
+        with self.assertRaisesRegexp(Exception, 'Illegal math expression'):
+            self.sympy('<mi>x</mi><mo>+</mo>')
+
+    def test_conversions_are_kept(self):
+        # the formula module is hidden by the formula class in the package
+        formula_module = sys.modules[formula.__module__]
+        with patch.object(formula_module, 'pmathml_to_cmathml', wraps=pmathml_to_cmathml) as mock_convert:
+            self.sympy('<mi>x</mi>')
+            self.sympy('<mi>x</mi>')
+        self.assertEqual(mock_convert.call_count, 1)
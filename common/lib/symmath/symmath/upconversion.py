@@ -0,0 +1,358 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Up-conversion of Presentation MathML to Content MathML.
+#
+# Handles the Presentation MathML generated by ASCIIMathML, once pre-processed
+# by formula.preprocess_pmathml, and writes Content MathML like the SnuggleTeX
+# up-conversion which formula used to post every expression to, with the
+# elements formula.make_sympy turns into sympy expressions:
+#
+#   x+2*y          <apply><plus/><ci>x</ci><apply><times/><cn>2</cn><ci>y</ci></apply></apply>
+#   sin(theta)/2   <apply><divide/><apply><sin/><ci>theta</ci></apply><cn>2</cn></apply>
+#   [[1,0],[0,1]]  <list><matrix><vector><cn>1</cn><cn>0</cn></vector>...</matrix></list>
+
+import re
+from lxml import etree
+
+MATHML_NAMESPACE = 'http://www.w3.org/1998/Math/MathML'
+
+# make_sympy reports expressions whose conversion fails with this as illegal
+FAILURE_MESSAGE = 'The conversion from Presentation MathML to Content MathML was not successful'
+
+# ASCIIMathML function name -> Content MathML operator
+FUNCTIONS = dict((name, name) for name in [
+    'sin', 'cos', 'tan', 'cot', 'sinh', 'cosh', 'tanh', 'coth',
+    'asin', 'acos', 'atan', 'acot', 'asinh', 'acosh', 'atanh', 'acoth',
+    'exp', 'log', 'ln',
+])
+FUNCTIONS.update({'arcsin': 'asin', 'arccos': 'acos', 'arctan': 'atan'})
+
+PLUS = (u'+',)
+MINUS = (u'-', u'\u2212')
+# *, dot, cross, middle dot, invisible times
+TIMES = (u'*', u'\u22c5', u'\u00d7', u'\u00b7', u'\u2062')
+DIVIDE = (u'/', u'\u00f7')
+EQUALS = (u'=',)
+# comma, invisible separator
+SEPARATORS = (u',', u'\u2063')
+BRACKETS = {u'(': u')', u'[': u']', u'{': u'}'}
+# function application, zero width space
+IGNORED = (u'', u'\u2061', u'\u200b')
+
+# elements whose children are read as one expression
+ROWS = ('math', 'mstyle', 'mrow', 'mtd', 'mpadded', 'mphantom')
+
+
+class UpConversionError(Exception):
+    '''
+    Raised for Presentation MathML which can't be converted to Content MathML.
+    '''
+    pass
+
+
+def gettag(x):
+    return re.sub('{http://[^}]+}', '', x.tag)
+
+
+def _element(tag, children=(), text=None):
+    ''' A Content MathML element '''
+    element = etree.Element('{%s}%s' % (MATHML_NAMESPACE, tag), nsmap={None: MATHML_NAMESPACE})
+    element.text = text
+    element.extend(children)
+    return element
+
+
+def _apply(operator, *args):
+    ''' <apply><operator/>args</apply> '''
+    return _element('apply', [_element(operator)] + list(args))
+
+
+def _nary(operator, args):
+    ''' Apply an associative operator to args, or return the only one '''
+    if len(args) == 1:
+        return args[0]
+    return _apply(operator, *args)
+
+
+class _Operator(object):
+    ''' An operator or bracket of a row '''
+    def __init__(self, text):
+        self.text = text
+
+
+class _Function(object):
+    ''' A function name of a row, applied to the next operand '''
+    def __init__(self, operator):
+        self.operator = operator
+
+
+class _Group(object):
+    ''' The items of a row between brackets '''
+    def __init__(self, opening, items):
+        self.opening = opening
+        self.items = items
+
+
+def _text(xml):
+    return (xml.text or '').strip()
+
+
+def _row_items(children):
+    '''
+    Return the items of a row of Presentation MathML elements: the operators,
+    functions and bracketed groups, and the elements of the operands.
+    '''
+    items = []
+    # the groups being read, innermost last
+    stack = []
+    for child in children:
+        if not isinstance(child.tag, basestring):
+            # comments and processing instructions
+            continue
+        tag = gettag(child)
+        if tag in ('mo', 'mi') and isinstance(child.text, basestring):
+            text = _text(child)
+        else:
+            text = None
+
+        if tag == 'mo' and text in BRACKETS:
+            stack.append((text, items))
+            items = []
+        elif tag == 'mo' and text in BRACKETS.values():
+            if not stack:
+                raise UpConversionError("Unmatched closing bracket %s" % text)
+            opening, outer = stack.pop()
+            outer.append(_Group(opening, items))
+            items = outer
+        elif tag == 'mo' and text in IGNORED:
+            continue
+        elif tag == 'mo':
+            items.append(_Operator(text))
+        elif tag == 'mi' and text in FUNCTIONS:
+            items.append(_Function(FUNCTIONS[text]))
+        elif tag == 'mspace' or (tag == 'mtext' and not _text(child)):
+            continue
+        else:
+            items.append(child)
+
+    if stack:
+        raise UpConversionError("Unmatched opening bracket %s" % stack[-1][0])
+    return items
+
+
+def _split_items(items):
+    ''' Split items on their separators '''
+    parts = [[]]
+    for item in items:
+        if isinstance(item, _Operator) and item.text in SEPARATORS:
+            parts.append([])
+        else:
+            parts[-1].append(item)
+    return parts
+
+
+class _RowParser(object):
+    '''
+    Parse the items of a row as an expression, with the usual precedence of
+    operators: equations of sums and differences of products and quotients
+    of signed factors. Adjacent operands are multiplied, and functions are
+    applied to the operand which follows them.
+    '''
+    def __init__(self, items):
+        self.items = items
+        self.position = 0
+
+    def parse(self):
+        if not self.items:
+            raise UpConversionError("Empty expression")
+        result = self.equation()
+        if self.position != len(self.items):
+            raise UpConversionError("Unexpected %s" % self.describe(self.peek()))
+        return result
+
+    def peek(self):
+        if self.position < len(self.items):
+            return self.items[self.position]
+        return None
+
+    def next(self):
+        item = self.peek()
+        if item is None:
+            raise UpConversionError("Incomplete expression")
+        self.position += 1
+        return item
+
+    def peek_operator(self, operators):
+        item = self.peek()
+        return isinstance(item, _Operator) and item.text in operators
+
+    @staticmethod
+    def describe(item):
+        if isinstance(item, _Operator):
+            return "operator %s" % item.text
+        if isinstance(item, _Function):
+            return "function %s" % item.operator
+        if isinstance(item, _Group):
+            return "bracket %s" % item.opening
+        return "element %s" % gettag(item)
+
+    def equation(self):
+        sides = [self.sum()]
+        while self.peek_operator(EQUALS):
+            self.next()
+            sides.append(self.sum())
+        return _nary('eq', sides)
+
+    def sum(self):
+        terms = [self.signed_product()]
+        while self.peek_operator(PLUS + MINUS):
+            operator = self.next()
+            if operator.text in PLUS:
+                terms.append(self.product())
+            else:
+                terms = [_apply('minus', _nary('plus', terms), self.product())]
+        return _nary('plus', terms)
+
+    def signed_product(self):
+        if self.peek_operator(MINUS):
+            self.next()
+            return _apply('minus', self.product())
+        if self.peek_operator(PLUS):
+            self.next()
+        return self.product()
+
+    def product(self):
+        factors = [self.factor()]
+        while True:
+            item = self.peek()
+            if isinstance(item, _Operator) and item.text in TIMES:
+                self.next()
+                factors.append(self.signed_factor())
+            elif isinstance(item, _Operator) and item.text in DIVIDE:
+                self.next()
+                factors = [_apply('divide', _nary('times', factors), self.signed_factor())]
+            elif item is not None and not isinstance(item, _Operator):
+                # implicit multiplication
+                factors.append(self.factor())
+            else:
+                return _nary('times', factors)
+
+    def signed_factor(self):
+        if self.peek_operator(MINUS):
+            self.next()
+            return _apply('minus', self.signed_factor())
+        return self.factor()
+
+    def factor(self):
+        item = self.next()
+        if isinstance(item, _Operator):
+            raise UpConversionError("Unexpected %s" % self.describe(item))
+        if isinstance(item, _Function):
+            return _apply(item.operator, self.signed_factor())
+        if isinstance(item, _Group):
+            return _convert_group(item.opening, item.items)
+        return _convert(item)
+
+
+def _convert_row(children):
+    ''' Convert a row of Presentation MathML elements '''
+    return _RowParser(_row_items(children)).parse()
+
+
+def _convert_group(opening, items):
+    '''
+    Convert the items of a bracketed group: round brackets group an
+    expression, separators make a list, and square brackets make a list or
+    enclose a matrix.
+    '''
+    parts = _split_items(items)
+    if len(parts) == 1 and opening != '[':
+        return _RowParser(items).parse()
+    if len(items) == 1 and isinstance(items[0], etree._Element) and gettag(items[0]) == 'mtable':
+        return _convert(items[0])
+    return _element('list', [_RowParser(part).parse() for part in parts])
+
+
+def _convert(xml):
+    ''' Convert a Presentation MathML element '''
+    tag = gettag(xml)
+
+    if tag in ROWS:
+        return _convert_row(xml)
+
+    elif tag == 'mi':
+        if not _text(xml):
+            raise UpConversionError("Empty identifier")
+        return _element('ci', text=_text(xml))
+
+    elif tag == 'mn':
+        if not _text(xml):
+            raise UpConversionError("Empty number")
+        return _element('cn', text=_text(xml))
+
+    elif tag == 'msup':
+        if len(xml) != 2:
+            raise UpConversionError("msup needs two children")
+        return _apply('power', _convert(xml[0]), _convert(xml[1]))
+
+    elif tag == 'msub':
+        # a subscripted name, which make_sympy reads from the Presentation MathML
+        symbol = _element('ci')
+        symbol.append(_presentation_copy(xml))
+        return symbol
+
+    elif tag == 'mfrac':
+        if len(xml) != 2:
+            raise UpConversionError("mfrac needs two children")
+        return _apply('divide', _convert(xml[0]), _convert(xml[1]))
+
+    elif tag == 'msqrt':
+        return _apply('root', _convert_row(xml))
+
+    elif tag == 'mroot':
+        if len(xml) != 2:
+            raise UpConversionError("mroot needs two children")
+        return _apply('power', _convert(xml[0]), _apply('divide', _element('cn', text='1'), _convert(xml[1])))
+
+    elif tag == 'mfenced':
+        items = []
+        for child in xml:
+            if items:
+                items.append(_Operator(u','))
+            items.extend(_row_items([child]))
+        return _convert_group(xml.get('open', '('), items)
+
+    elif tag == 'mtable':
+        rows = []
+        for row in xml:
+            if gettag(row) != 'mtr':
+                raise UpConversionError("Unexpected element %s in a table" % gettag(row))
+            rows.append(_element('vector', [_convert(cell) for cell in row]))
+        return _element('list', [_element('matrix', rows)])
+
+    raise UpConversionError("Unsupported element %s" % tag)
+
+
+def _presentation_copy(xml):
+    ''' Copy a Presentation MathML element into the MathML namespace '''
+    element = etree.Element('{%s}%s' % (MATHML_NAMESPACE, gettag(xml)), nsmap={None: MATHML_NAMESPACE})
+    element.text = xml.text
+    element.extend(_presentation_copy(child) for child in xml)
+    return element
+
+
+def pmathml_to_cmathml(pmathml):
+    '''
+    Convert Presentation MathML, a string or an element, to a string of
+    Content MathML <math>.
+
+    Raises UpConversionError if the expression can't be converted.
+    '''
+    if isinstance(pmathml, basestring):
+        try:
+            pmathml = etree.fromstring(pmathml)
+        except etree.XMLSyntaxError as err:
+            raise UpConversionError("Invalid MathML: %s" % err)
+    math = _element('math', [_convert(pmathml)])
+    return etree.tostring(math, pretty_print=True)
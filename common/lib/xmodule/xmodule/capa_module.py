@@ -3,17 +3,19 @@ import datetime
 import hashlib
 import json
 import logging
+import math
 import os
 import traceback
 import struct
 import sys
+import time
 
 from pkg_resources import resource_string
 
 from capa.capa_problem import LoncapaProblem
 from capa.responsetypes import StudentInputError, \
     ResponseError, LoncapaProblemError
-from capa.util import convert_files_to_filenames
+from capa.util import convert_files_to_filenames, is_list_of_files
 from .progress import Progress
 from xmodule.x_module import XModule
 from xmodule.raw_module import RawDescriptor
@@ -173,6 +175,10 @@ class CapaModule(CapaFields, XModule):
     js_module_name = "Problem"
     css = {'scss': [resource_string(__name__, 'css/capa/display.scss')]}
 
+    # Seconds for which the last graded submission is kept in the system
+    # cache, to answer checks of the same answers without grading them again
+    GRADED_SUBMISSION_TIMEOUT = 60 * 60
+
     def __init__(self, *args, **kwargs):
         """
         Accepts the same arguments as xmodule.x_module:XModule.__init__
@@ -332,6 +338,8 @@ class CapaModule(CapaFields, XModule):
             'element_id': self.location.html_id(),
             'id': self.id,
             'ajax_url': self.system.ajax_url,
+            # the LMS serves input previews without loading the problem
+            'input_preview_url': getattr(self.system, 'input_preview_url', None) or '',
             'progress_status': Progress.to_js_status_str(progress),
             'progress_detail': Progress.to_js_detail_str(progress),
         })
@@ -504,6 +512,19 @@ class CapaModule(CapaFields, XModule):
         except Exception as err:
             html = self.handle_problem_html_error(err)
 
+        html = self.system.render_template('problem.html', self.get_problem_context(html))
+
+        if encapsulate:
+            html = u'<div id="problem_{id}" class="problem" data-url="{ajax_url}">'.format(
+                id=self.location.html_id(), ajax_url=self.system.ajax_url
+            ) + html + "</div>"
+
+        return self.substitute_urls(html)
+
+    def get_problem_context(self, html):
+        """
+        Return the context of the problem.html template, for the problem HTML `html`.
+        """
         # The convention is to pass the name of the check button
         # if we want to show a check button, and False otherwise
         # This works because non-empty strings evaluate to True
@@ -517,25 +538,50 @@ class CapaModule(CapaFields, XModule):
                    'weight': self.weight,
                    }
 
-        context = {'problem': content,
-                   'id': self.id,
-                   'check_button': check_button,
-                   'reset_button': self.should_show_reset_button(),
-                   'save_button': self.should_show_save_button(),
-                   'answer_available': self.answer_available(),
-                   'attempts_used': self.attempts,
-                   'attempts_allowed': self.max_attempts,
-                   }
+        return {'problem': content,
+                'id': self.id,
+                'check_button': check_button,
+                'reset_button': self.should_show_reset_button(),
+                'save_button': self.should_show_save_button(),
+                'answer_available': self.answer_available(),
+                'attempts_used': self.attempts,
+                'attempts_allowed': self.max_attempts,
+                }
 
-        html = self.system.render_template('problem.html', context)
+    def get_problem_fragments(self, response_ids):
+        """
+        Return the HTML of the responses with `response_ids`, and of the
+        actions of the problem, for the client to patch into the problem it
+        shows instead of rendering the whole problem again.
 
-        if encapsulate:
-            html = u'<div id="problem_{id}" class="problem" data-url="{ajax_url}">'.format(
-                id=self.location.html_id(), ajax_url=self.system.ajax_url
-            ) + html + "</div>"
+        Returns a dict:
+          {'fragments': {id of the element of a response: html},
+           'actions': html}
+        or None if the whole problem must be rendered again with
+        get_problem_html, as every response changed or one of them can't be
+        rendered.
+        """
+        if response_ids is None:
+            return None
 
-        # now do all the substitutions which the LMS module_render normally does, but
-        # we need to do here explicitly since we can get called for our HTML via AJAX
+        try:
+            fragments = self.lcp.get_response_html(response_ids)
+        except Exception:
+            # get_problem_html reports the error
+            log.exception("Unable to render the responses %s", response_ids)
+            return None
+
+        actions = self.system.render_template('problem_actions.html', self.get_problem_context(None))
+        return {
+            'fragments': dict((element_id, self.substitute_urls(html)) for element_id, html in fragments.iteritems()),
+            'actions': self.substitute_urls(actions),
+        }
+
+    def substitute_urls(self, html):
+        """
+        Do all the substitutions which the LMS module_render normally does, but
+        we need to do here explicitly since we can get called for our HTML via AJAX
+        """
         html = self.system.replace_urls(html)
         if self.system.replace_course_urls:
             html = self.system.replace_course_urls(html)
@@ -872,6 +918,9 @@ class CapaModule(CapaFields, XModule):
         Returns a map of correct/incorrect answers:
           {'success' : 'correct' | 'incorrect' | AJAX alert msg string,
            'contents' : html}
+        where, unless every response changed, 'contents' is replaced by the
+        'fragments' and 'actions' of get_problem_fragments, with the HTML of
+        the responses the check changed.
         """
         event_info = dict()
         event_info['state'] = self.lcp.get_state()
@@ -902,37 +951,62 @@ class CapaModule(CapaFields, XModule):
                     wait=waittime_between_requests)
                 return {'success': msg, 'html': ''}  # Prompts a modal dialog in ajax callback
 
-        try:
-            correct_map = self.lcp.grade_answers(answers)
+        # Too many checks in a row. Students must wait for the bucket of checks to refill
+        wait = self.take_check_token()
+        if wait is not None:
+            event_info['failure'] = 'rate_limited'
+            self.system.track_function('problem_check_fail', event_info)
+            msg = u'You must wait {wait} seconds before checking your answers again'.format(
+                wait=int(math.ceil(wait)))
+            return {'success': msg, 'html': ''}  # Prompts a modal dialog in ajax callback
+
+        old_correct_map = self.lcp.correct_map
+        old_student_answers = self.lcp.student_answers
+        digest = self.submission_digest(answers)
+
+        # Same answers as the last graded submission. Answer with its CorrectMap
+        # instead of grading them again; the check still uses up an attempt
+        duplicate = self.is_graded_submission(digest)
+        if duplicate:
+            correct_map = self.lcp.correct_map
+            self.lcp.student_answers = convert_files_to_filenames(answers)
             self.attempts = self.attempts + 1
             self.lcp.done = True
             self.set_state_from_lcp()
 
-        except (StudentInputError, ResponseError, LoncapaProblemError) as inst:
-            log.warning("StudentInputError in capa_module:problem_check",
-                        exc_info=True)
-
-            # If the user is a staff member, include
-            # the full exception, including traceback,
-            # in the response
-            if self.system.user_is_staff:
-                msg = u"Staff debug info: {tb}".format(tb=cgi.escape(traceback.format_exc()))
-
-            # Otherwise, display just an error message,
-            # without a stack trace
-            else:
-                msg = u"Error: {msg}".format(msg=inst.message)
-
-            return {'success': msg}
+        else:
+            try:
+                correct_map = self.lcp.grade_answers(answers)
+                self.attempts = self.attempts + 1
+                self.lcp.done = True
+                self.set_state_from_lcp()
+
+            except (StudentInputError, ResponseError, LoncapaProblemError) as inst:
+                log.warning("StudentInputError in capa_module:problem_check",
+                            exc_info=True)
+
+                # If the user is a staff member, include
+                # the full exception, including traceback,
+                # in the response
+                if self.system.user_is_staff:
+                    msg = u"Staff debug info: {tb}".format(tb=cgi.escape(traceback.format_exc()))
+
+                # Otherwise, display just an error message,
+                # without a stack trace
+                else:
+                    msg = u"Error: {msg}".format(msg=inst.message)
 
-        except Exception as err:
-            if self.system.DEBUG:
-                msg = u"Error checking problem: {}".format(err.message)
-                msg += u'\nTraceback:\n{}'.format(traceback.format_exc())
                 return {'success': msg}
-            raise
 
-        self.publish_grade()
+            except Exception as err:
+                if self.system.DEBUG:
+                    msg = u"Error checking problem: {}".format(err.message)
+                    msg += u'\nTraceback:\n{}'.format(traceback.format_exc())
+                    return {'success': msg}
+                raise
+
+            self.keep_graded_submission(digest, correct_map)
+            self.publish_grade()
 
         # success = correct if ALL questions in this problem are correct
         success = 'correct'
@@ -945,17 +1019,100 @@ class CapaModule(CapaFields, XModule):
         event_info['correct_map'] = correct_map.get_dict()
         event_info['success'] = success
         event_info['attempts'] = self.attempts
+        event_info['duplicate'] = duplicate
         self.system.track_function('problem_check', event_info)
 
-        if hasattr(self.system, 'psychometrics_handler'):  # update PsychometricsData using callback
+        if hasattr(self.system, 'psychometrics_handler') and not duplicate:  # update PsychometricsData using callback
             self.system.psychometrics_handler(self.get_state_for_lcp())
 
-        # render problem into HTML
-        html = self.get_problem_html(encapsulate=False)
+        # render the responses the check changed into HTML
+        changed_responses = self.lcp.get_changed_responses(old_correct_map, old_student_answers)
+        result = self.get_problem_fragments(changed_responses)
+        if result is None:
+            # render problem into HTML
+            result = {'contents': self.get_problem_html(encapsulate=False)}
 
-        return {'success': success,
-                'contents': html,
-                }
+        result['success'] = success
+        return result
+
+    def keep_graded_submission(self, digest, correct_map):
+        """
+        Keep `correct_map` as the CorrectMap of the submission with `digest`,
+        the last one graded.
+        """
+        if digest is not None:
+            self.system.cache.set(
+                self.cache_key('graded_submission'),
+                (digest, correct_map.get_dict()),
+                self.GRADED_SUBMISSION_TIMEOUT
+            )
+
+    def cache_key(self, name):
+        """
+        Return the key of the value `name` of this problem for this student
+        in the system cache.
+        """
+        return u'capa.{name}.{digest}'.format(
+            name=name,
+            digest=hashlib.sha1(u'{0}:{1}'.format(
+                self.system.anonymous_student_id, self.location.url()
+            ).encode('utf-8')).hexdigest()
+        )
+
+    def take_check_token(self):
+        """
+        Take a check from the bucket of checks of this problem by this
+        student, which lets them check the problem `burst` times in a row, and
+        then once every `interval` seconds, per the system's check_rate_limit.
+
+        Returns None if the student can check the problem, or else the number
+        of seconds before the bucket holds a check again.
+        """
+        rate_limit = self.system.check_rate_limit
+        if rate_limit is None:
+            return None
+        burst, interval = rate_limit['burst'], rate_limit['interval']
+
+        key = self.cache_key('check_bucket')
+        now = time.time()
+
+        bucket = self.system.cache.get(key)
+        if bucket is None:
+            tokens = burst
+        else:
+            tokens, updated = bucket
+            tokens = min(burst, tokens + (now - updated) / interval)
+
+        if tokens < 1:
+            return (1 - tokens) * interval
+
+        # the bucket is full again, and can be forgotten, once it expires
+        timeout = int(math.ceil(burst * interval))
+        self.system.cache.set(key, (tokens - 1, now), timeout)
+        return None
+
+    def submission_digest(self, answers):
+        """
+        Return a digest of the submission of `answers` to this problem, as it
+        is now defined and randomized, or None if it has files, whose contents
+        can change without their names changing.
+        """
+        if any(is_list_of_files(answer) for answer in answers.values()):
+            return None
+
+        submission = json.dumps([answers, self.lcp.seed, self.data], sort_keys=True)
+        return hashlib.sha1(submission.encode('utf-8')).hexdigest()
+
+    def is_graded_submission(self, digest):
+        """
+        Return whether the submission with `digest` is the last one graded,
+        and the CorrectMap of the problem is still the one it got.
+        """
+        if digest is None:
+            return False
+
+        graded = self.system.cache.get(self.cache_key('graded_submission'))
+        return graded is not None and tuple(graded) == (digest, self.lcp.correct_map.get_dict())
 
     def rescore_problem(self):
         """
@@ -96,26 +96,58 @@ class ConditionalModule(ConditionalFields, XModule):
                 return xml_value, attr_name
         raise Exception('Error in conditional module: unknown condition "%s"' % xml_attr)
 
+    # Map
+    # key: <name of module attribute>
+    # value: (<name of the student state field it reads>, <function of the field value>)
+    # The conditions on these attributes are evaluated from the student state of
+    # the required modules, which is already loaded in the FieldDataCache, instead
+    # of instantiating the modules just to read it.
+    field_conditions = {
+        'poll_answer': ('poll_answer', lambda value: value),
+        'voted': ('voted', lambda value: value),
+        'is_submitted': ('done', lambda value: value),
+        'is_attempted': ('attempts', lambda value: value > 0),
+    }
+
+    def _get_field_condition(self, descriptor, attr_name):
+        """
+        Return the value of `attr_name` for the module of `descriptor`, read
+        from its student state, or raise KeyError if it isn't a field condition
+        of that module.
+        """
+        field_name, value_of = self.field_conditions[attr_name]
+        if not hasattr(descriptor.module_class, attr_name):
+            raise KeyError(attr_name)
+        field = descriptor.fields[field_name]
+        try:
+            value = field.from_json(self.system.xblock_field_data(descriptor).get(descriptor, field_name))
+        except KeyError:
+            value = field.default
+        return value_of(value)
+
     def is_condition_satisfied(self):
-        self.required_modules = [self.system.get_module(descriptor) for
-                                 descriptor in self.descriptor.get_required_module_descriptors()]
+        self.required_descriptors = self.descriptor.get_required_module_descriptors()
 
         xml_value, attr_name = self._get_condition()
 
-        if xml_value and self.required_modules:
-            for module in self.required_modules:
-                if not hasattr(module, attr_name):
-                    # We don't throw an exception here because it is possible for
-                    # the descriptor of a required module to have a property but
-                    # for the resulting module to be a (flavor of) ErrorModule.
-                    # So just log and return false.
-                    log.warn('Error in conditional module: \
-                        required module {module} has no {module_attr}'.format(module=module, module_attr=attr_name))
-                    return False
-
-                attr = getattr(module, attr_name)
-                if callable(attr):
-                    attr = attr()
+        if xml_value and self.required_descriptors:
+            for descriptor in self.required_descriptors:
+                try:
+                    attr = self._get_field_condition(descriptor, attr_name)
+                except (KeyError, AttributeError):
+                    module = self.system.get_module(descriptor)
+                    if not hasattr(module, attr_name):
+                        # We don't throw an exception here because it is possible for
+                        # the descriptor of a required module to have a property but
+                        # for the resulting module to be a (flavor of) ErrorModule.
+                        # So just log and return false.
+                        log.warn('Error in conditional module: \
+                            required module {module} has no {module_attr}'.format(module=module, module_attr=attr_name))
+                        return False
+
+                    attr = getattr(module, attr_name)
+                    if callable(attr):
+                        attr = attr()
 
                 if xml_value != str(attr):
                     break
@@ -158,8 +190,17 @@ class ConditionalModule(ConditionalFields, XModule):
         # OBSOLETE: This obsoletes 'type'
         class_priority = ['video', 'problem']
 
-        child_classes = [self.system.get_module(child_descriptor).get_icon_class()
-                         for child_descriptor in self.descriptor.get_children()]
+        child_classes = []
+        for child_descriptor in self.descriptor.get_children():
+            module_class = getattr(child_descriptor, 'module_class', None)
+            get_icon_class = getattr(module_class, 'get_icon_class', None)
+            if getattr(get_icon_class, 'im_func', None) is XModule.get_icon_class.im_func:
+                # the icon of the child doesn't depend on its state
+                child_classes.append(module_class.icon_class)
+            else:
+                child = self.system.get_module(child_descriptor)
+                if child is not None:
+                    child_classes.append(child.get_icon_class())
         for c in class_priority:
             if c in child_classes:
                 new_class = c
@@ -176,6 +217,8 @@ class ConditionalDescriptor(ConditionalFields, SequenceDescriptor):
 
     has_score = False
 
+    _required_module_descriptors = None
+
     @staticmethod
     def parse_sources(xml_element, system, return_descriptor=False):
         """Parse xml_element 'sources' attr and:
@@ -204,8 +247,12 @@ class ConditionalDescriptor(ConditionalFields, SequenceDescriptor):
         """Returns a list of XModuleDescritpor instances upon
         which this module depends.
         """
-        return ConditionalDescriptor.parse_sources(
-            self.xml_attributes, self.system, True)
+        # the sources are resolved once per descriptor, not on every
+        # evaluation of the condition
+        if self._required_module_descriptors is None:
+            self._required_module_descriptors = ConditionalDescriptor.parse_sources(
+                self.xml_attributes, self.system, True)
+        return self._required_module_descriptors
 
     @classmethod
     def definition_from_xml(cls, xml_object, system):
@@ -189,6 +189,14 @@ class ContentStore(object):
         '''
         raise NotImplementedError
 
+    def get_content_page_for_course(self, location, start=0, maxresults=None, sort=None,
+                                    name_prefix=None, content_type=None):
+        '''
+        Returns (assets, total): a page of the static assets of a course, in the format
+        of get_all_content_for_course, and the number of assets which match the filters.
+        '''
+        raise NotImplementedError
+
     def generate_thumbnail(self, content, tempfile_path=None):
         thumbnail_content = None
         # use a naming convention to associate originals with the thumbnail
@@ -1,3 +1,6 @@
+import re
+
+import pymongo
 from pymongo import Connection
 import gridfs
 from gridfs.errors import NoFile
@@ -14,6 +17,22 @@ from fs.osfs import OSFS
 import os
 
 
+# the number of GridFS chunks inserted at once by copy_all_course_assets
+CHUNK_COPY_BATCH_SIZE = 16
+
+# the fields which assets can be sorted by, see get_content_page_for_course
+ASSET_SORT_FIELDS = ('uploadDate', 'displayname')
+
+# the fields of the asset ids which select the assets of a course
+_COURSE_ASSET_KEY = [
+    ('_id.tag', pymongo.ASCENDING),
+    ('_id.org', pymongo.ASCENDING),
+    ('_id.course', pymongo.ASCENDING),
+    ('_id.category', pymongo.ASCENDING),
+    ('_id.revision', pymongo.ASCENDING),
+]
+
+
 class MongoContentStore(ContentStore):
     def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', **kwargs):
         logging.debug('Using MongoDB for static content serving at host={0} db={1}'.format(host, db))
@@ -25,6 +44,21 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(_db, bucket)
 
         self.fs_files = _db[bucket + ".files"]   # the underlying collection GridFS uses
+        self.fs_chunks = _db[bucket + ".chunks"]
+        self._create_indexes()
+
+    def _create_indexes(self):
+        """
+        Index the assets of a course in every order that get_content_page_for_course
+        pages them, so that reading a page only reads the assets of that page.
+        Built in the background, as fs.files can be big.
+        """
+        self.fs_files.ensure_index(_COURSE_ASSET_KEY + [('uploadDate', pymongo.DESCENDING)], background=True)
+        self.fs_files.ensure_index(_COURSE_ASSET_KEY + [('displayname', pymongo.ASCENDING)], background=True)
+        self.fs_files.ensure_index(
+            _COURSE_ASSET_KEY + [('contentType', pymongo.ASCENDING), ('uploadDate', pymongo.DESCENDING)],
+            background=True
+        )
 
     def save(self, content):
         id = content.get_id()
@@ -44,8 +78,8 @@ class MongoContentStore(ContentStore):
         return content
 
     def delete(self, id):
-        if self.fs.exists({"_id": id}):
-            self.fs.delete(id)
+        # GridFS ignores ids which don't exist, so there's no need for an exists() round trip first
+        self.fs.delete(id)
 
     def find(self, location, throw_on_not_found=True, as_stream=False):
         id = StaticContent.get_id_from_location(location)
@@ -104,6 +138,52 @@ class MongoContentStore(ContentStore):
             asset_location = Location(asset['_id'])
             self.export(asset_location, output_directory)
 
+    def copy_all_course_assets(self, source_location, dest_location):
+        """
+        Copies all the assets and thumbnails of the course of source_location to
+        the course of dest_location, replacing the assets of the same names.
+
+        The GridFS documents are copied as they are stored, a batch of chunks at
+        a time, rather than read back into files and uploaded again.
+
+        Returns the number of files copied.
+        """
+        query = {
+            '_id.tag': XASSET_LOCATION_TAG,
+            '_id.org': source_location.org,
+            '_id.course': source_location.course,
+        }
+        copied = 0
+        for asset in self.fs_files.find(query):
+            # ids are matched as documents, so they are built the way save() builds them
+            source_loc = Location(asset['_id'])
+            dest_loc = source_loc._replace(org=dest_location.org, course=dest_location.course)
+            source_id = StaticContent.get_id_from_location(source_loc)
+            asset['_id'] = dest_id = StaticContent.get_id_from_location(dest_loc)
+            asset['filename'] = StaticContent.get_url_path_from_location(dest_loc)
+            if asset.get('thumbnail_location') is not None:
+                asset['thumbnail_location'] = Location(asset['thumbnail_location'])._replace(
+                    org=dest_location.org, course=dest_location.course
+                )
+
+            self.delete(dest_id)
+
+            chunks = []
+            for chunk in self.fs_chunks.find({'files_id': source_id}, sort=[('n', pymongo.ASCENDING)]):
+                del chunk['_id']
+                chunk['files_id'] = dest_id
+                chunks.append(chunk)
+                if len(chunks) == CHUNK_COPY_BATCH_SIZE:
+                    self.fs_chunks.insert(chunks)
+                    chunks = []
+            if chunks:
+                self.fs_chunks.insert(chunks)
+
+            # the file is only visible once all its chunks are there
+            self.fs_files.insert(asset)
+            copied += 1
+        return copied
+
     def get_all_content_thumbnails_for_course(self, location):
         return self._get_all_content_for_course(location, get_thumbnails=True)
 
@@ -130,8 +210,50 @@ class MongoContentStore(ContentStore):
 
             ]
         '''
+        items = self.fs_files.find(self._course_assets_query(location, get_thumbnails))
+        return list(items)
+
+    def get_content_page_for_course(self, location, start=0, maxresults=None, sort=None,
+                                    name_prefix=None, content_type=None):
+        """
+        Returns (assets, total): a page of the static assets of a course, in the
+        format of get_all_content_for_course, and the number of assets of the
+        course which match the filters.
+
+        `start` is the index of the first asset of the page, `maxresults` the size
+            of the page, or None for all the remaining assets
+        `sort` is a (field, pymongo direction) tuple, field being one of
+            ASSET_SORT_FIELDS; assets are listed most recent first by default
+        `name_prefix` only matches the assets whose display name starts with it
+        `content_type` only matches the assets of that mime type, or of all the
+            subtypes of a type given without a subtype, e.g. 'image'
+        """
+        if sort is None:
+            sort = ('uploadDate', pymongo.DESCENDING)
+        if sort[0] not in ASSET_SORT_FIELDS:
+            raise ValueError("Can't sort assets by {0}".format(sort[0]))
+
+        query = self._course_assets_query(location)
+        if name_prefix:
+            query['displayname'] = {'$regex': '^' + re.escape(name_prefix)}
+        if content_type:
+            if '/' in content_type:
+                query['contentType'] = content_type
+            else:
+                query['contentType'] = {'$regex': '^' + re.escape(content_type + '/')}
+
+        cursor = self.fs_files.find(query).sort([sort]).skip(start)
+        if maxresults is not None:
+            cursor = cursor.limit(maxresults)
+        # count() ignores the skip and limit of the cursor
+        return list(cursor), cursor.count()
+
+    @staticmethod
+    def _course_assets_query(location, get_thumbnails=False):
+        """
+        Returns the query of the assets, or of their thumbnails, of the course of location.
+        """
         course_filter = Location(XASSET_LOCATION_TAG, category="asset" if not get_thumbnails else "thumbnail",
                                  course=location.course, org=location.org)
         # 'borrow' the function 'location_to_query' from the Mongo modulestore implementation
-        items = self.fs_files.find(location_to_query(course_filter))
-        return list(items)
+        return location_to_query(course_filter)
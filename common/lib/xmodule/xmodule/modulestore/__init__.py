@@ -379,6 +379,29 @@ class ModuleStore(object):
         '''
         raise NotImplementedError
 
+    def get_course_path_index(self, course_id):
+        """
+        Returns the courseware path index of a course (see
+        `xmodule.modulestore.search.compute_path_index`), or None if this
+        modulestore doesn't keep one. Used by path_to_location().
+        """
+        raise NotImplementedError
+
+    def get_course_version(self, course_id):
+        """
+        Returns a string which changes whenever any content of the course
+        changes, for caching data computed from the course content, or None if
+        this modulestore can't tell when the course changes.
+        """
+        raise NotImplementedError
+
+    def get_course_versions(self, course_ids):
+        """
+        Returns a dict of course id -> get_course_version(course id) for
+        `course_ids`, for pages which list many courses.
+        """
+        raise NotImplementedError
+
     def get_errored_courses(self):
         """
         Return a dictionary of course_dir -> [(msg, exception_str)], for each
@@ -443,6 +466,26 @@ class ModuleStoreBase(ModuleStore):
         """
         return {}
 
+    def get_course_path_index(self, course_id):
+        """
+        Returns None: path_to_location() searches the course graph of stores
+        which don't keep a course path index.
+        """
+        return None
+
+    def get_course_version(self, course_id):
+        """
+        Returns None: data computed from the content of courses of this
+        modulestore can't be cached.
+        """
+        return None
+
+    def get_course_versions(self, course_ids):
+        """
+        Default impl--calls get_course_version for each course
+        """
+        return dict((course_id, self.get_course_version(course_id)) for course_id in course_ids)
+
     def get_course(self, course_id):
         """Default impl--linear search through course list"""
         for c in self.get_courses():
@@ -6,6 +6,8 @@ In this way, courses can be served up both - say - XMLModuleStore or MongoModule
 IMPORTANT: This modulestore only supports READONLY applications, e.g. LMS
 """
 
+from collections import defaultdict
+
 from . import ModuleStoreBase
 from xmodule.modulestore.django import create_modulestore_instance
 import logging
@@ -132,6 +134,31 @@ class MixedModuleStore(ModuleStoreBase):
         """
         return self._get_modulestore_for_courseid(course_id).get_parent_locations(location, course_id)
 
+    def get_course_path_index(self, course_id):
+        """
+        returns the courseware path index of a course, if its modulestore keeps one
+        """
+        return self._get_modulestore_for_courseid(course_id).get_course_path_index(course_id)
+
+    def get_course_version(self, course_id):
+        """
+        returns the content version of a course, if its modulestore keeps one
+        """
+        return self._get_modulestore_for_courseid(course_id).get_course_version(course_id)
+
+    def get_course_versions(self, course_ids):
+        """
+        returns the content versions of courses, asking each modulestore for all its courses at once
+        """
+        course_ids_by_store = defaultdict(list)
+        for course_id in course_ids:
+            course_ids_by_store[self._get_modulestore_for_courseid(course_id)].append(course_id)
+
+        versions = {}
+        for store, store_course_ids in course_ids_by_store.iteritems():
+            versions.update(store.get_course_versions(store_course_ids))
+        return versions
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given
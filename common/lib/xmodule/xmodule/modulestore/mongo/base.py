@@ -20,6 +20,7 @@ import copy
 from fs.osfs import OSFS
 from itertools import repeat
 from path import path
+from uuid import uuid4
 from operator import attrgetter
 
 from importlib import import_module
@@ -34,9 +35,13 @@ from xblock.fields import Scope, ScopeIds
 from xmodule.modulestore import ModuleStoreBase, Location, namedtuple_to_son, MONGO_MODULESTORE_TYPE
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import own_metadata, InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
+from xmodule.modulestore.search import compute_path_index
 
 log = logging.getLogger(__name__)
 
+# the revision of the draft version of an item, see xmodule.modulestore.mongo.draft
+DRAFT = 'draft'
+
 # TODO (cpennington): This code currently operates under the assumption that
 # there is only one revision for each item. Once we start versioning inside the CMS,
 # that assumption will have to change
@@ -238,10 +243,32 @@ def location_to_query(location, wildcard=True):
 metadata_cache_key = attrgetter('org', 'course')
 
 
+def path_index_cache_key(revision, org, course):
+    """
+    Returns the cache key of the course path index of the `revision` ('published'
+    or 'draft') content of the org/course combination.
+    """
+    return ('course_path_index', revision, org, course)
+
+
+# number of locations per cache entry of a course path index, so that the
+# index of a large course is not silently rejected by memcached's item size limit
+PATH_INDEX_CHUNK_SIZE = 1000
+
+
+def course_version_cache_key(org, course):
+    """
+    Returns the cache key of the content version of the org/course combination.
+    """
+    return ('course_version', org, course)
+
+
 class MongoModuleStore(ModuleStoreBase):
     """
     A Mongodb backed ModuleStore
     """
+    # the content indexed by get_course_path_index, see path_index_cache_key
+    path_index_revision = 'published'
 
     # TODO (cpennington): Enable non-filesystem filestores
     def __init__(self, host, db, collection, fs_root, render_template,
@@ -405,6 +432,158 @@ class MongoModuleStore(ModuleStoreBase):
         pseudo_course_id = '/'.join([location.org, location.course])
         if pseudo_course_id not in self.ignore_write_events_on_courses:
             self.get_cached_metadata_inheritance_tree(location, force_refresh=True)
+            self.invalidate_course_path_index(location)
+            # drafts aren't part of the published content which the version tracks
+            if location.revision != DRAFT:
+                self.invalidate_course_version(location)
+
+    def get_course_path_index(self, course_id):
+        """
+        Returns the courseware path index of a course, see
+        `xmodule.modulestore.search.compute_path_index`.
+
+        The index is kept in the caching subsystem and built on first use after
+        any change to the course. Returns None when there is no caching subsystem,
+        as building the index for a single lookup costs more than searching the
+        course graph.
+        """
+        if self.metadata_inheritance_cache_subsystem is None:
+            return None
+
+        org, course, _ = course_id.split('/')
+        key = path_index_cache_key(self.path_index_revision, org, course)
+
+        if self.request_cache is not None and key in self.request_cache.data.get('course_path_index', {}):
+            return self.request_cache.data['course_path_index'][key]
+
+        index = self._get_cached_path_index(key)
+        if index is None:
+            index = compute_path_index(self, course_id)
+            self._set_cached_path_index(key, index)
+
+        if self.request_cache is not None:
+            self.request_cache.data.setdefault('course_path_index', {})[key] = index
+
+        return index
+
+    def _get_cached_path_index(self, key):
+        """
+        Returns the course path index cached under key, or None if it isn't
+        cached or any of its chunks was evicted.
+        """
+        header = self.metadata_inheritance_cache_subsystem.get(key)
+        if header is None:
+            return None
+
+        token, chunk_count = header
+        chunk_keys = [key + (token, chunk) for chunk in range(chunk_count)]
+        chunks = self.metadata_inheritance_cache_subsystem.get_many(chunk_keys)
+        if len(chunks) != chunk_count:
+            return None
+
+        index = {}
+        for chunk_key in chunk_keys:
+            index.update(chunks[chunk_key])
+        return index
+
+    def _set_cached_path_index(self, key, index):
+        """
+        Cache a course path index under key, in chunks of PATH_INDEX_CHUNK_SIZE
+        locations. The header stored under key names the chunks of the latest
+        build, so readers never mix the chunks of two builds.
+        """
+        token = uuid4().hex
+        entries = index.items()
+        chunks = {}
+        for chunk, start in enumerate(range(0, len(entries), PATH_INDEX_CHUNK_SIZE)):
+            chunks[key + (token, chunk)] = dict(entries[start:start + PATH_INDEX_CHUNK_SIZE])
+
+        self.metadata_inheritance_cache_subsystem.set_many(chunks)
+        self.metadata_inheritance_cache_subsystem.set(key, (token, len(chunks)))
+
+    def invalidate_course_path_index(self, location):
+        """
+        Drop the cached course path indexes of the org/course combination for location,
+        so that they're rebuilt with the current course structure on next use. Both the
+        published and draft indexes are dropped, as publishing changes the former. Only
+        the headers are deleted: the chunks they named are left to expire.
+        """
+        keys = [path_index_cache_key(revision, location.org, location.course) for revision in ('published', 'draft')]
+        if self.metadata_inheritance_cache_subsystem is not None:
+            self.metadata_inheritance_cache_subsystem.delete_many(keys)
+        if self.request_cache is not None:
+            for key in keys:
+                self.request_cache.data.get('course_path_index', {}).pop(key, None)
+
+    def get_course_version(self, course_id):
+        """
+        Returns the content version of a course: a token kept in the caching
+        subsystem, which is replaced after any change to the course. Returns
+        None when there is no caching subsystem to share the token between
+        processes.
+        """
+        if self.metadata_inheritance_cache_subsystem is None:
+            return None
+
+        org, course, _ = course_id.split('/')
+        key = course_version_cache_key(org, course)
+
+        if self.request_cache is not None and key in self.request_cache.data.get('course_version', {}):
+            return self.request_cache.data['course_version'][key]
+
+        version = self.metadata_inheritance_cache_subsystem.get(key)
+        if version is None:
+            # add() doesn't overwrite the token of another process which got there first
+            self.metadata_inheritance_cache_subsystem.add(key, uuid4().hex)
+            version = self.metadata_inheritance_cache_subsystem.get(key)
+
+        if self.request_cache is not None and version is not None:
+            self.request_cache.data.setdefault('course_version', {})[key] = version
+
+        return version
+
+    def get_course_versions(self, course_ids):
+        """
+        Returns a dict of course id -> content version (see get_course_version) for
+        `course_ids`, reading the versions from the caching subsystem in a single
+        round trip.
+        """
+        if self.metadata_inheritance_cache_subsystem is None:
+            return dict((course_id, None) for course_id in course_ids)
+
+        keys = {}
+        for course_id in course_ids:
+            org, course, _ = course_id.split('/')
+            keys[course_id] = course_version_cache_key(org, course)
+
+        request_versions = {}
+        if self.request_cache is not None:
+            request_versions = self.request_cache.data.setdefault('course_version', {})
+
+        versions = dict((key, request_versions[key]) for key in keys.itervalues() if key in request_versions)
+        missing = [key for key in set(keys.itervalues()) if key not in versions]
+        if missing:
+            versions.update(self.metadata_inheritance_cache_subsystem.get_many(missing))
+            unversioned = [key for key in missing if key not in versions]
+            if unversioned:
+                # add() doesn't overwrite the token of another process which got there first
+                for key in unversioned:
+                    self.metadata_inheritance_cache_subsystem.add(key, uuid4().hex)
+                versions.update(self.metadata_inheritance_cache_subsystem.get_many(unversioned))
+            request_versions.update((key, versions[key]) for key in missing if key in versions)
+
+        return dict((course_id, versions.get(key)) for course_id, key in keys.iteritems())
+
+    def invalidate_course_version(self, location):
+        """
+        Drop the content version of the org/course combination for location, so
+        that a new one is issued on next use.
+        """
+        key = course_version_cache_key(location.org, location.course)
+        if self.metadata_inheritance_cache_subsystem is not None:
+            self.metadata_inheritance_cache_subsystem.delete(key)
+        if self.request_cache is not None:
+            self.request_cache.data.get('course_version', {}).pop(key, None)
 
     def _clean_item_data(self, item):
         """
@@ -734,6 +913,10 @@ class MongoModuleStore(ModuleStoreBase):
         )
         if result['n'] == 0:
             raise ItemNotFoundError(location)
+        # the published content of the course changed, so do the sections rendered from it
+        location = Location(location)
+        if location.revision != DRAFT and get_course_id_no_run(location) not in self.ignore_write_events_on_courses:
+            self.invalidate_course_version(location)
 
     def update_item(self, location, data, allow_not_found=False):
         """
@@ -6,17 +6,17 @@ returns the i4x://org/course/cat/name@draft object if that exists,
 and otherwise returns i4x://org/course/cat/name).
 """
 
+from collections import OrderedDict
 from datetime import datetime
 
 from xmodule.exceptions import InvalidVersionError
 from xmodule.modulestore import Location, namedtuple_to_son
 from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateItemError
 from xmodule.modulestore.inheritance import own_metadata
-from xmodule.modulestore.mongo.base import location_to_query, get_course_id_no_run, MongoModuleStore
+from xmodule.modulestore.mongo.base import location_to_query, get_course_id_no_run, MongoModuleStore, DRAFT
 import pymongo
 from pytz import UTC
 
-DRAFT = 'draft'
 # Things w/ these categories should never be marked as version='draft'
 DIRECT_ONLY_CATEGORIES = ['course', 'chapter', 'sequential', 'about', 'static_tab', 'course_info']
 
@@ -35,6 +35,37 @@ def as_published(location):
     return Location(location).replace(revision=None)
 
 
+def draft_aware_query(location, wildcard=True):
+    """
+    Returns a query for `location` which matches both its draft and its published
+    revisions, see `location_to_query`. A query for the draft revision only matches drafts.
+    """
+    query = location_to_query(location, wildcard=wildcard)
+    if Location(location).revision != DRAFT:
+        query['_id.revision'] = {'$in': [None, DRAFT]}
+    return query
+
+
+def prefer_drafts(items):
+    """
+    Given the json of items in either revision, returns a list with the draft
+    version of each item when there is one, and the published version otherwise
+    """
+    chosen = OrderedDict()
+    for item in items:
+        published_loc = Location(item['_id']).replace(revision=None)
+        if published_loc not in chosen or item['_id']['revision'] == DRAFT:
+            chosen[published_loc] = item
+    return chosen.values()
+
+
+def _same_content(draft, published):
+    """
+    Returns whether the draft and published documents of an item hold the same content
+    """
+    return dict(draft, _id=None) == dict(published, _id=None)
+
+
 def wrap_draft(item):
     """
     Sets `item.is_draft` to `True` if the item is a
@@ -56,6 +87,7 @@ class DraftModuleStore(MongoModuleStore):
     This module also includes functionality to promote DRAFT modules (and optionally
     their children) to published modules.
     """
+    path_index_revision = 'draft'
 
     def get_item(self, location, depth=0):
         """
@@ -77,21 +109,19 @@ class DraftModuleStore(MongoModuleStore):
             get_children() to cache. None indicates to cache all descendents
         """
 
-        try:
-            return wrap_draft(super(DraftModuleStore, self).get_item(as_draft(location), depth=depth))
-        except ItemNotFoundError:
-            return wrap_draft(super(DraftModuleStore, self).get_item(location, depth=depth))
+        location = Location.ensure_fully_specified(location)
+        # read both revisions in one round trip
+        items = prefer_drafts(self.collection.find(draft_aware_query(location, wildcard=False)))
+        if not items:
+            raise ItemNotFoundError(location)
+        return wrap_draft(self._load_items(items, depth)[0])
 
     def get_instance(self, course_id, location, depth=0):
         """
         Get an instance of this location, with policy for course_id applied.
         TODO (vshnayder): this may want to live outside the modulestore eventually
         """
-
-        try:
-            return wrap_draft(super(DraftModuleStore, self).get_instance(course_id, as_draft(location), depth=depth))
-        except ItemNotFoundError:
-            return wrap_draft(super(DraftModuleStore, self).get_instance(course_id, location, depth=depth))
+        return self.get_item(location, depth=depth)
 
     def create_xmodule(self, location, definition_data=None, metadata=None, system=None):
         """
@@ -121,19 +151,9 @@ class DraftModuleStore(MongoModuleStore):
             in the request. The depth is counted in the number of calls to
             get_children() to cache. None indicates to cache all descendents
         """
-        draft_loc = as_draft(location)
-
-        draft_items = super(DraftModuleStore, self).get_items(draft_loc, course_id=course_id, depth=depth)
-        items = super(DraftModuleStore, self).get_items(location, course_id=course_id, depth=depth)
-
-        draft_locs_found = set(item.location.replace(revision=None) for item in draft_items)
-        non_draft_items = [
-            item
-            for item in items
-            if (item.location.revision != DRAFT
-                and item.location.replace(revision=None) not in draft_locs_found)
-        ]
-        return [wrap_draft(item) for item in draft_items + non_draft_items]
+        # read both revisions in one query, and only load the one that's returned for each item
+        items = prefer_drafts(self.collection.find(draft_aware_query(location)))
+        return [wrap_draft(item) for item in self._load_items(items, depth)]
 
     def convert_to_draft(self, source_location):
         """
@@ -249,33 +269,151 @@ class DraftModuleStore(MongoModuleStore):
         self.convert_to_draft(location)
         super(DraftModuleStore, self).delete_item(location)
 
-    def _query_children_for_cache_children(self, items):
-        # first get non-draft in a round-trip
-        to_process_non_drafts = super(DraftModuleStore, self)._query_children_for_cache_children(items)
+    def _get_subtree_documents(self, location):
+        """
+        Returns the raw documents of the subtree rooted at `location`, as a list of
+        (published location, draft document or None, published document or None)
+        in breadth first order. The children of an item are read from its draft when
+        it has one. Each level of the tree is read with a single query for both revisions.
 
-        to_process_dict = {}
-        for non_draft in to_process_non_drafts:
-            to_process_dict[Location(non_draft["_id"])] = non_draft
+        Raises ItemNotFoundError if there's no item at `location`.
+        """
+        subtree = []
+        visited = set()
+        to_process = [as_published(location)]
+        while to_process:
+            query = {
+                '_id': {'$in': [
+                    namedtuple_to_son(loc)
+                    for item_loc in to_process
+                    for loc in (item_loc, as_draft(item_loc))
+                ]}
+            }
+            documents = dict((Location(document['_id']), document) for document in self.collection.find(query))
+
+            next_level = []
+            for item_loc in to_process:
+                if item_loc in visited:
+                    continue
+                visited.add(item_loc)
+                draft = documents.get(as_draft(item_loc))
+                published = documents.get(item_loc)
+                if draft is None and published is None:
+                    continue
+                subtree.append((item_loc, draft, published))
+                current = draft if draft is not None else published
+                next_level.extend(as_published(child) for child in current.get('definition', {}).get('children', []))
+            to_process = next_level
+
+        if not subtree:
+            raise ItemNotFoundError(location)
+        return subtree
+
+    def _subtree_updated(self, location):
+        """
+        Refresh the caches and signal a write once after a batched write to a subtree.
+        """
+        self.refresh_cached_metadata_inheritance_tree(location)
+        self.fire_updated_modulestore_signal(get_course_id_no_run(location), location)
 
-        # now query all draft content in another round-trip
-        query = {
-            '_id': {'$in': [namedtuple_to_son(as_draft(Location(item))) for item in items]}
-        }
-        to_process_drafts = list(self.collection.find(query))
+    def _insert_drafts(self, originals):
+        """
+        Insert, in one batch, a draft copy of each of the `originals` documents.
+        """
+        drafts = []
+        for original in originals:
+            draft_location = as_draft(Location(original['_id']))
+            if draft_location.category in DIRECT_ONLY_CATEGORIES:
+                raise InvalidVersionError(as_published(draft_location))
+            draft = dict(original)
+            draft['_id'] = draft_location.dict()
+            drafts.append(draft)
+        if not drafts:
+            return
+        try:
+            self.collection.insert(drafts, safe=self.collection.safe)
+        except pymongo.errors.DuplicateKeyError:
+            raise DuplicateItemError([draft['_id'] for draft in drafts])
 
-        # now we have to go through all drafts and replace the non-draft
-        # with the draft. This is because the semantics of the DraftStore is to
-        # always return the draft - if available
-        for draft in to_process_drafts:
-            draft_loc = Location(draft["_id"])
-            draft_as_non_draft_loc = draft_loc.replace(revision=None)
+    def convert_subtree_to_draft(self, location):
+        """
+        Create a draft of `location` and of each of its descendants which doesn't have one yet,
+        writing all the drafts in a single batch.
+        """
+        subtree = self._get_subtree_documents(location)
+        self._insert_drafts([published for _, draft, published in subtree if draft is None and published is not None])
+        # the published content didn't change
+        self._subtree_updated(as_draft(location))
 
-            # does non-draft exist in the collection
-            # if so, replace it
-            if draft_as_non_draft_loc in to_process_dict:
-                to_process_dict[draft_as_non_draft_loc] = draft
+    def publish_subtree(self, location, published_by_id):
+        """
+        Publish `location` and all its descendants: the same as calling publish on each of
+        them, but reading the subtree level by level and writing it in batches. The drafts
+        are deleted in a single batch once all the published documents are written.
+        """
+        location = as_published(location)
+        subtree = self._get_subtree_documents(location)
+
+        # published_date is stored the way the DateTuple field serializes it
+        published_date = list(datetime.now(UTC).timetuple())
+        unchanged_ids = []
+        new_documents = []
+        changed_documents = []
+        for item_loc, draft, published in subtree:
+            if published is not None and (draft is None or _same_content(draft, published)):
+                unchanged_ids.append(namedtuple_to_son(item_loc))
+                continue
+            document = dict(draft)
+            document['_id'] = item_loc.dict()
+            document['metadata'] = dict(document.get('metadata', {}), published_date=published_date,
+                                        published_by=published_by_id)
+            if published is None:
+                new_documents.append(document)
+            else:
+                changed_documents.append(document)
+
+        # the published versions are never removed, so that readers never miss them: the
+        # unchanged ones are stamped in one update and the new ones inserted in one batch.
+        # mongo has no batched replace, so only the edited items are saved one by one
+        if unchanged_ids:
+            self.collection.update(
+                {'_id': {'$in': unchanged_ids}},
+                {'$set': {'metadata.published_date': published_date, 'metadata.published_by': published_by_id}},
+                multi=True, safe=self.collection.safe
+            )
+        if new_documents:
+            self.collection.insert(new_documents, safe=self.collection.safe)
+        for document in changed_documents:
+            self.collection.save(document, safe=self.collection.safe)
+        draft_ids = [namedtuple_to_son(as_draft(item_loc)) for item_loc, draft, _ in subtree if draft is not None]
+        if draft_ids:
+            self.collection.remove({'_id': {'$in': draft_ids}}, safe=self.collection.safe)
+
+        self._subtree_updated(location)
+
+    def unpublish_subtree(self, location):
+        """
+        Turn the published versions of `location` and its descendants into drafts, removing
+        the published versions, in single batches. Items which already have a draft keep it.
+        """
+        location = as_published(location)
+        subtree = self._get_subtree_documents(location)
 
-        # convert the dict - which is used for look ups - back into a list
-        queried_children = to_process_dict.values()
+        self._insert_drafts([published for _, draft, published in subtree if draft is None and published is not None])
+        published_ids = [namedtuple_to_son(item_loc) for item_loc, _, published in subtree if published is not None]
+        if published_ids:
+            self.collection.remove({'_id': {'$in': published_ids}}, safe=self.collection.safe)
 
-        return queried_children
+        self._subtree_updated(location)
+
+    def _query_children_for_cache_children(self, items):
+        # get both revisions of the children in a round-trip, keeping the draft when there is one,
+        # as the semantics of the DraftStore is to always return the draft - if available
+        query = {
+            '_id': {'$in': [
+                namedtuple_to_son(loc)
+                for item in items
+                for loc in (as_published(item), as_draft(item))
+            ]}
+        }
+        return prefer_drafts(self.collection.find(query))
@@ -5,6 +5,53 @@ from xmodule.course_module import CourseDescriptor
 from .exceptions import (ItemNotFoundError, NoPathToItem)
 from . import Location
 
+# categories whose children are addressed by a position in the courseware url
+POSITIONAL_CATEGORIES = ('sequential', 'videosequence')
+
+
+def path_index_key(location):
+    """
+    Returns the key of `location` in a course path index.
+    """
+    return Location(location).replace(revision=None).url()
+
+
+def compute_path_index(modulestore, course_id):
+    """
+    Compute the courseware path of every module of a course in one pass over
+    the course tree.
+
+    Returns a dict of `path_index_key(location)` -> (chapter, section, position),
+    with the same values as path_to_location would return for the location. A
+    location which can be reached through several paths is indexed with one of
+    them.
+    """
+    course = modulestore.get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=None)
+
+    index = {}
+    # the work queue holds (descriptor, path of names from the chapter, positions)
+    queue = [(course, (), ())]
+    while queue:
+        descriptor, names, positions = queue.pop()
+        key = path_index_key(descriptor.location)
+        if key in index:
+            continue
+
+        chapter = names[0] if len(names) > 0 else None
+        section = names[1] if len(names) > 1 else None
+        # positions are only given to modules below the section, see path_to_location
+        position = "_".join(positions) if len(names) > 2 else None
+        index[key] = (chapter, section, position)
+
+        positional = len(names) >= 2 and descriptor.location.category in POSITIONAL_CATEGORIES
+        for child_index, child in enumerate(descriptor.get_children()):
+            # positions are 1-indexed, and should be strings to be consistent with
+            # url parsing.
+            child_positions = positions + (str(child_index + 1),) if positional else positions
+            queue.append((child, names + (child.location.name,), child_positions))
+
+    return index
+
 
 def path_to_location(modulestore, course_id, location):
     '''
@@ -29,6 +76,9 @@ def path_to_location(modulestore, course_id, location):
     If the section is a sequential or vertical, position will be the position
     of this location in that sequence.  Otherwise, position will
     be None. TODO (vshnayder): Not true yet.
+
+    The path is looked up in the course path index of the modulestore when it
+    keeps one, and is otherwise searched for in the course graph.
     '''
 
     def flatten(xs):
@@ -84,6 +134,12 @@ def path_to_location(modulestore, course_id, location):
     if not modulestore.has_item(course_id, location):
         raise ItemNotFoundError
 
+    path_index = modulestore.get_course_path_index(course_id)
+    if path_index is not None:
+        indexed_path = path_index.get(path_index_key(location))
+        if indexed_path is not None:
+            return (course_id,) + tuple(indexed_path)
+
     path = find_path_to_course()
     if path is None:
         raise NoPathToItem(location)
@@ -106,7 +162,7 @@ def path_to_location(modulestore, course_id, location):
         position_list = []
         for path_index in range(2, n - 1):
             category = path[path_index].category
-            if category == 'sequential' or category == 'videosequence':
+            if category in POSITIONAL_CATEGORIES:
                 section_desc = modulestore.get_instance(course_id, path[path_index])
                 child_locs = [c.location for c in section_desc.get_children()]
                 # positions are 1-indexed, and should be strings to be consistent with
@@ -1,11 +1,15 @@
 import re
 from xmodule.contentstore.content import StaticContent
-from xmodule.modulestore import Location
+from xmodule.contentstore.mongo import MongoContentStore
+from xmodule.modulestore import Location, namedtuple_to_son
 from xmodule.modulestore.mongo import MongoModuleStore
+from xmodule.modulestore.mongo.base import get_course_id_no_run
 from xmodule.modulestore.inheritance import own_metadata
 
 import logging
 
+log = logging.getLogger(__name__)
+
 
 def _prefix_only_url_replace_regex(prefix):
     """
@@ -160,39 +164,56 @@ def _clone_modules(modulestore, modules, source_location, dest_location):
         modulestore.update_metadata(module.location, own_metadata(module))
 
 
-def clone_course(modulestore, contentstore, source_location, dest_location, delete_original=False):
-    # check to see if the dest_location exists as an empty course
-    # we need an empty course because the app layers manage the permissions and users
-    if not modulestore.has_item(dest_location.course_id, dest_location):
-        raise Exception("An empty course at {0} must have already been created. Aborting...".format(dest_location))
-
-    # verify that the dest_location really is an empty course, which means only one with an optional 'overview'
-    dest_modules = modulestore.get_items([dest_location.tag, dest_location.org, dest_location.course, None, None, None])
-
-    basically_empty = True
-    for module in dest_modules:
-        if module.location.category == 'course' or (module.location.category == 'about'
-                                                    and module.location.name == 'overview'):
-            continue
-
-        basically_empty = False
-        break
-
-    if not basically_empty:
-        raise Exception("Course at destination {0} is not an empty course. You can only clone into an empty course. Aborting...".format(dest_location))
-
-    # check to see if the source course is actually there
-    if not modulestore.has_item(source_location.course_id, source_location):
-        raise Exception("Cannot find a course at {0}. Aborting".format(source_location))
-
-    # Get all modules under this namespace which is (tag, org, course) tuple
-
-    modules = modulestore.get_items([source_location.tag, source_location.org, source_location.course, None, None, None])
-    _clone_modules(modulestore, modules, source_location, dest_location)
-
-    modules = modulestore.get_items([source_location.tag, source_location.org, source_location.course, None, None, 'draft'])
-    _clone_modules(modulestore, modules, source_location, dest_location)
+def _clone_module_documents(modulestore, source_location, dest_location):
+    """
+    Clones the modules of a course, published and draft, in a Mongo modulestore:
+    reads all the module documents of the source course in one query, rewrites
+    their locations, children and links, and inserts them in one batch.
+    Inheritance is computed for the destination course once, at the end.
 
+    Returns the number of modules cloned.
+    """
+    def dest_location_of(location):
+        """ The location in the destination course of a source location """
+        location = Location(location)
+        replacements = {'tag': dest_location.tag, 'org': dest_location.org, 'course': dest_location.course}
+        if location.category == 'course':
+            # on the course module we also have to update the module name
+            replacements['name'] = dest_location.name
+        return location._replace(**replacements)
+
+    documents = list(modulestore.collection.find({
+        '_id.tag': source_location.tag,
+        '_id.org': source_location.org,
+        '_id.course': source_location.course,
+    }))
+
+    for document in documents:
+        new_location = dest_location_of(document['_id'])
+        log.debug("Cloning module %s to %s", Location(document['_id']), new_location)
+        document['_id'] = namedtuple_to_son(new_location)
+
+        definition = document.setdefault('definition', {})
+        if isinstance(definition.get('data'), basestring):
+            definition['data'] = rewrite_nonportable_content_links(
+                source_location.course_id, dest_location.course_id, definition['data'])
+        if 'children' in definition:
+            definition['children'] = [dest_location_of(child).url() for child in definition['children']]
+
+    if documents:
+        # the empty destination course has its own course and overview modules, which the clones replace
+        modulestore.collection.remove({'_id': {'$in': [document['_id'] for document in documents]}})
+        modulestore.collection.insert(documents)
+
+    modulestore.refresh_cached_metadata_inheritance_tree(dest_location)
+    modulestore.fire_updated_modulestore_signal(get_course_id_no_run(dest_location), dest_location)
+    return len(documents)
+
+
+def _clone_assets(contentstore, source_location, dest_location):
+    """
+    Clones the assets of a course one at a time, through the ContentStore interface.
+    """
     # now iterate through all of the assets and clone them
     # first the thumbnails
     thumbs = contentstore.get_all_content_thumbnails_for_course(source_location)
@@ -224,6 +245,48 @@ def clone_course(modulestore, contentstore, source_location, dest_location, dele
 
         contentstore.save(content)
 
+
+def clone_course(modulestore, contentstore, source_location, dest_location, delete_original=False):
+    # check to see if the dest_location exists as an empty course
+    # we need an empty course because the app layers manage the permissions and users
+    if not modulestore.has_item(dest_location.course_id, dest_location):
+        raise Exception("An empty course at {0} must have already been created. Aborting...".format(dest_location))
+
+    # verify that the dest_location really is an empty course, which means only one with an optional 'overview'
+    dest_modules = modulestore.get_items([dest_location.tag, dest_location.org, dest_location.course, None, None, None])
+
+    basically_empty = True
+    for module in dest_modules:
+        if module.location.category == 'course' or (module.location.category == 'about'
+                                                    and module.location.name == 'overview'):
+            continue
+
+        basically_empty = False
+        break
+
+    if not basically_empty:
+        raise Exception("Course at destination {0} is not an empty course. You can only clone into an empty course. Aborting...".format(dest_location))
+
+    # check to see if the source course is actually there
+    if not modulestore.has_item(source_location.course_id, source_location):
+        raise Exception("Cannot find a course at {0}. Aborting".format(source_location))
+
+    if isinstance(modulestore, MongoModuleStore):
+        _clone_module_documents(modulestore, source_location, dest_location)
+    else:
+        # Get all modules under this namespace which is (tag, org, course) tuple
+
+        modules = modulestore.get_items([source_location.tag, source_location.org, source_location.course, None, None, None])
+        _clone_modules(modulestore, modules, source_location, dest_location)
+
+        modules = modulestore.get_items([source_location.tag, source_location.org, source_location.course, None, None, 'draft'])
+        _clone_modules(modulestore, modules, source_location, dest_location)
+
+    if isinstance(contentstore, MongoContentStore):
+        contentstore.copy_all_course_assets(source_location, dest_location)
+    else:
+        _clone_assets(contentstore, source_location, dest_location)
+
     return True
 
 
@@ -1,7 +1,8 @@
+from mock import patch
 from nose.tools import assert_equals, assert_raises  # pylint: disable=E0611
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.modulestore.search import path_to_location
+from xmodule.modulestore.search import path_to_location, compute_path_index
 
 
 def check_path_to_location(modulestore):
@@ -23,3 +24,16 @@ def check_path_to_location(modulestore):
     )
     for location in not_found:
         assert_raises(ItemNotFoundError, path_to_location, modulestore, course_id, location)
+
+
+def check_path_index(modulestore):
+    '''Make sure that the course path index of the toy course gives the same
+    paths as searching the course graph: should be passed a modulestore with
+    the toy course loaded.'''
+    course_id = "edX/toy/2012_Fall"
+    index = compute_path_index(modulestore, course_id)
+    assert_equals(index["i4x://edX/toy/video/Welcome"], ("Overview", "Welcome", None))
+
+    with patch.object(modulestore, 'get_course_path_index', return_value=None):
+        for location, indexed_path in index.items():
+            assert_equals(path_to_location(modulestore, course_id, location), (course_id,) + indexed_path)
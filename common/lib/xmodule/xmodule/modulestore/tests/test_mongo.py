@@ -4,20 +4,22 @@ from nose.tools import assert_equals, assert_raises, \
     assert_not_equals, assert_false
 # pylint: enable=E0611
 import pymongo
+from mock import patch
 from uuid import uuid4
 
 from xblock.fields import Scope
 from xblock.runtime import KeyValueStore
 from xblock.exceptions import InvalidScopeError
 
-from xmodule.tests import DATA_DIR
+from xmodule.tests import DATA_DIR, DictCache
 from xmodule.modulestore import Location
 from xmodule.modulestore.mongo import MongoModuleStore, MongoKeyValueStore
+from xmodule.modulestore.search import compute_path_index
 from xmodule.modulestore.draft import DraftModuleStore
 from xmodule.modulestore.xml_importer import import_from_xml, perform_xlint
 from xmodule.contentstore.mongo import MongoContentStore
 
-from xmodule.modulestore.tests.test_modulestore import check_path_to_location
+from xmodule.modulestore.tests.test_modulestore import check_path_to_location, check_path_index
 
 
 HOST = 'localhost'
@@ -137,6 +139,58 @@ class TestMongoModuleStore(object):
         '''Make sure that path_to_location works'''
         check_path_to_location(self.store)
 
+    def test_path_index(self):
+        '''Make sure that the course path index agrees with path_to_location'''
+        check_path_index(self.store)
+
+    def test_path_index_cached_in_chunks(self):
+        '''Make sure that the course path index is cached in bounded chunks'''
+        course_id = "edX/toy/2012_Fall"
+        cache = DictCache()
+        index = compute_path_index(self.store, course_id)
+        with patch.object(self.store, 'metadata_inheritance_cache_subsystem', cache):
+            with patch('xmodule.modulestore.mongo.base.PATH_INDEX_CHUNK_SIZE', 2):
+                assert_equals(self.store.get_course_path_index(course_id), index)
+                chunks = [value for value in cache.values.values() if isinstance(value, dict)]
+                assert_equals(len(chunks), (len(index) + 1) // 2)
+                assert_equals(max(len(chunk) for chunk in chunks), 2)
+
+                # an evicted chunk gets the index rebuilt
+                cache.values.pop([key for key, value in cache.values.items() if isinstance(value, dict)][0])
+                with patch('xmodule.modulestore.mongo.base.compute_path_index', return_value=index) as compute:
+                    assert_equals(self.store.get_course_path_index(course_id), index)
+                assert_equals(compute.call_count, 1)
+
+    def test_course_versions(self):
+        '''Make sure that the course versions are read in bulk, and only replaced by published writes'''
+        course_ids = ["edX/toy/2012_Fall", "edX/simple/2012_Fall"]
+        cache = DictCache()
+        with patch.object(self.store, 'metadata_inheritance_cache_subsystem', cache):
+            versions = self.store.get_course_versions(course_ids)
+            for course_id in course_ids:
+                assert_equals(versions[course_id], self.store.get_course_version(course_id))
+            assert_not_equals(versions[course_ids[0]], versions[course_ids[1]])
+
+            collection = self.store.collection
+            with patch.object(collection, 'update', return_value={'n': 1}):
+                self.store.update_item(Location("i4x://edX/toy/html/toyhtml@draft"), 'draft')
+                assert_equals(self.store.get_course_version(course_ids[0]), versions[course_ids[0]])
+
+                self.store.update_item(Location("i4x://edX/toy/html/toyhtml"), 'published')
+                assert_not_equals(self.store.get_course_version(course_ids[0]), versions[course_ids[0]])
+            assert_equals(self.store.get_course_version(course_ids[1]), versions[course_ids[1]])
+
+    def test_draft_get_item_single_query(self):
+        '''Make sure that the draft store reads both revisions of an item in one query'''
+        location = Location("i4x://edX/toy/video/Welcome")
+        collection = self.draft_store.collection
+        with patch.object(self.draft_store, 'get_cached_metadata_inheritance_tree', return_value={}):
+            with patch.object(collection, 'find', wraps=collection.find) as find:
+                item = self.draft_store.get_item(location)
+        assert_equals(find.call_count, 1)
+        assert_false(item.is_draft)
+        assert_equals(item.location, location)
+
     def test_xlinter(self):
         '''
         Run through the xlinter, we know the 'toy' course has violations, but the
@@ -1,12 +1,16 @@
 import os.path
+import pickle
+import shutil
+import tempfile
 
-from nose.tools import assert_raises, assert_equals  # pylint: disable=E0611
+from mock import patch
+from nose.tools import assert_raises, assert_equals, assert_true, assert_false  # pylint: disable=E0611
 
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore.xml import XMLModuleStore
 from xmodule.modulestore import XML_MODULESTORE_TYPE
 
-from .test_modulestore import check_path_to_location
+from .test_modulestore import check_path_to_location, check_path_index
 from xmodule.tests import DATA_DIR
 
 
@@ -20,6 +24,11 @@ class TestXMLModuleStore(object):
 
         check_path_to_location(modulestore)
 
+    def test_path_index(self):
+        """Make sure that the course path index agrees with path_to_location"""
+        modulestore = XMLModuleStore(DATA_DIR, course_dirs=['toy'])
+        check_path_index(modulestore)
+
     def test_xml_modulestore_type(self):
         store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'])
         assert_equals(store.get_modulestore_type('foo/bar/baz'), XML_MODULESTORE_TYPE)
@@ -42,3 +51,71 @@ class TestXMLModuleStore(object):
         location = CourseDescriptor.id_to_location("edX/toy/2012_Fall")
         errors = modulestore.get_item_errors(location)
         assert errors == []
+
+
+class TestXMLModuleStoreLoading(object):
+    """
+    Test the parallel, snapshot and lazy loading options of XMLModuleStore
+    """
+    def setUp(self):
+        self.snapshot_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.snapshot_dir)
+
+    def _module_locations(self, store):
+        """ Return the set of (course_id, location) of all modules in store """
+        return set(
+            (course_id, location)
+            for course_id, modules in store.modules.iteritems()
+            for location in modules
+        )
+
+    def test_parallel_load(self):
+        serial = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'])
+        parallel = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], load_workers=2)
+        assert_equals(self._module_locations(parallel), self._module_locations(serial))
+        assert_equals(sorted(parallel.courses.keys()), ['simple', 'toy'])
+        check_path_to_location(parallel)
+
+    def test_snapshot_restore(self):
+        store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], snapshot_dir=self.snapshot_dir)
+        assert_equals(len(os.listdir(self.snapshot_dir)), 2)
+
+        restored = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], snapshot_dir=self.snapshot_dir)
+        assert_equals(self._module_locations(restored), self._module_locations(store))
+        course = restored.get_instance('edX/toy/2012_Fall', CourseDescriptor.id_to_location('edX/toy/2012_Fall'))
+        assert_equals(course.grade_cutoffs, store.courses['toy'].grade_cutoffs)
+        check_path_to_location(restored)
+
+    def test_bad_snapshot(self):
+        store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], snapshot_dir=self.snapshot_dir)
+        for name in os.listdir(self.snapshot_dir):
+            with open(os.path.join(self.snapshot_dir, name), 'rb') as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+            # a snapshot which fails to restore once its modules are rebuilt
+            snapshot['location'] = None
+            with open(os.path.join(self.snapshot_dir, name), 'wb') as snapshot_file:
+                pickle.dump(snapshot, snapshot_file)
+
+        # the courses are parsed again instead
+        reloaded = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], snapshot_dir=self.snapshot_dir)
+        assert_equals(self._module_locations(reloaded), self._module_locations(store))
+        check_path_to_location(reloaded)
+
+    def test_parallel_restore_failure(self):
+        store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'])
+        with patch.object(XMLModuleStore, 'restore_course', side_effect=ValueError):
+            parallel = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], load_workers=2)
+        assert_equals(self._module_locations(parallel), self._module_locations(store))
+        assert_equals(sorted(parallel.courses.keys()), ['simple', 'toy'])
+
+    def test_lazy_load(self):
+        store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], lazy=True)
+        assert_false(store._modules)  # pylint: disable=W0212
+
+        location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+        assert_true(store.has_item('edX/toy/2012_Fall', location))
+        assert_equals(store._modules.keys(), ['edX/toy/2012_Fall'])  # pylint: disable=W0212
+
+        assert_equals(len(store.get_courses()), 2)
@@ -1,6 +1,8 @@
+import cPickle as pickle
 import hashlib
 import json
 import logging
+import multiprocessing
 import os
 import re
 import sys
@@ -27,6 +29,7 @@ from . import ModuleStoreBase, Location, XML_MODULESTORE_TYPE
 
 from .exceptions import ItemNotFoundError
 from .inheritance import compute_inherited_metadata
+from .search import compute_path_index
 
 edx_xml_parser = etree.XMLParser(dtd_validation=False, load_dtd=False,
                                  remove_comments=True, remove_blank_text=True)
@@ -35,6 +38,10 @@ etree.set_default_parser(edx_xml_parser)
 
 log = logging.getLogger(__name__)
 
+# Bump this whenever the content of course snapshots changes, so that
+# snapshots written by older code are not restored.
+SNAPSHOT_VERSION = 1
+
 
 # VS[compat]
 # TODO (cpennington): Remove this once all fall 2012 courses have been imported
@@ -192,7 +199,7 @@ class ImportSystem(XMLParsingSystem, MakoDescriptorSystem):
 
             setattr(descriptor, 'data_dir', course_dir)
 
-            xmlstore.modules[course_id][descriptor.location] = descriptor
+            xmlstore._modules[course_id][descriptor.location] = descriptor  # pylint: disable=W0212
 
             if hasattr(descriptor, 'children'):
                 for child in descriptor.get_children():
@@ -259,11 +266,78 @@ class ParentTracker(object):
         return list(self._parents[child])
 
 
+def _files_fingerprint(root, extensions=None):
+    """
+    Hash the relative path, size and modification time of every file under
+    root, skipping hidden files and directories (e.g. .git). If extensions
+    is given, only files with one of these extensions are considered.
+
+    This changes whenever a file is added, removed or edited, without
+    having to read the files.
+    """
+    digest = hashlib.sha1()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.'):
+                continue
+            if extensions is not None and os.path.splitext(filename)[1] not in extensions:
+                continue
+            filepath = os.path.join(dirpath, filename)
+            stat = os.stat(filepath)
+            digest.update('{0}\0{1}\0{2!r}\0'.format(os.path.relpath(filepath, root), stat.st_size, stat.st_mtime))
+    return digest.hexdigest()
+
+
+_CODE_FINGERPRINT = []
+
+
+def _code_fingerprint():
+    """
+    Fingerprint of the xmodule sources, computed once per process, so that
+    course snapshots are not restored by a different version of the code.
+    """
+    if not _CODE_FINGERPRINT:
+        xmodule_dir = path(__file__).abspath().dirname().dirname()
+        _CODE_FINGERPRINT.append(_files_fingerprint(xmodule_dir, extensions=('.py',)))
+    return _CODE_FINGERPRINT[0]
+
+
+def _load_course_snapshot(args):
+    """
+    Load a course directory in a fresh XMLModuleStore and return the pickled
+    snapshot of the loaded course, or None if it failed to load.
+
+    This is run in the worker processes of a parallel XMLModuleStore load,
+    so it takes a single picklable tuple of arguments:
+    (data_dir, default_class, load_error_modules, xblock_mixins, course_dir)
+    """
+    data_dir, default_class, load_error_modules, xblock_mixins, course_dir = args
+    try:
+        store = XMLModuleStore(
+            data_dir,
+            default_class=default_class,
+            course_dirs=[],
+            load_error_modules=load_error_modules,
+            xblock_mixins=xblock_mixins,
+        )
+        store.try_load_course(course_dir)
+        snapshot = store.snapshot_course(course_dir)
+        if snapshot is None:
+            return None
+        return pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL)
+    except Exception:  # pylint: disable=W0703
+        # the parent process will load the course itself and record the errors
+        log.exception("Failed to load a snapshot of course '%s'", course_dir)
+        return None
+
+
 class XMLModuleStore(ModuleStoreBase):
     """
     An XML backed ModuleStore
     """
-    def __init__(self, data_dir, default_class=None, course_dirs=None, load_error_modules=True, **kwargs):
+    def __init__(self, data_dir, default_class=None, course_dirs=None, load_error_modules=True,
+                 load_workers=None, snapshot_dir=None, lazy=False, **kwargs):
         """
         Initialize an XMLModuleStore from data_dir
 
@@ -274,16 +348,35 @@ class XMLModuleStore(ModuleStoreBase):
 
         course_dirs: If specified, the list of course_dirs to load. Otherwise,
             load all course dirs
+
+        load_workers: If greater than 1, the number of processes used to
+            parse course directories in parallel.
+
+        snapshot_dir: If specified, a directory where a pickled snapshot of
+            each loaded course is kept. Courses whose directory didn't change
+            since their snapshot was written are restored from it instead of
+            being parsed again. The directory can be shared by all the
+            processes on a machine. Only point it at a directory which is
+            writable by the LMS alone: snapshots are unpickled.
+
+        lazy: If True, only read the course ids when the store is created,
+            and load each course the first time it is accessed.
         """
         super(XMLModuleStore, self).__init__(**kwargs)
 
         self.data_dir = path(data_dir)
-        self.modules = defaultdict(dict)  # course_id -> dict(location -> XModuleDescriptor)
-        self.courses = {}  # course_dir -> XModuleDescriptor for the course
-        self.errored_courses = {}  # course_dir -> errorlog, for dirs that failed to load
+        self._modules = defaultdict(dict)  # course_id -> dict(location -> XModuleDescriptor)
+        self._courses = {}  # course_dir -> XModuleDescriptor for the course
+        self._errored_courses = {}  # course_dir -> errorlog, for dirs that failed to load
+        self._pending_course_dirs = {}  # course_id -> [course_dir], for lazy courses not loaded yet
+        self._path_indexes = {}  # course_id -> course path index, built on first use
 
         self.load_error_modules = load_error_modules
+        self.load_workers = load_workers or 1
+        self.snapshot_dir = path(snapshot_dir) if snapshot_dir else None
 
+        # kept to configure the stores of parallel loading processes
+        self._default_class_path = default_class
         if default_class is None:
             self.default_class = None
         else:
@@ -301,8 +394,271 @@ class XMLModuleStore(ModuleStoreBase):
         if course_dirs is None:
             course_dirs = sorted([d for d in os.listdir(self.data_dir) if
                                   os.path.exists(self.data_dir / d / "course.xml")])
+        if lazy:
+            for course_dir in course_dirs:
+                self._defer_course(course_dir)
+        else:
+            self._load_courses(course_dirs)
+
+    @property
+    def modules(self):
+        """
+        course_id -> dict(location -> XModuleDescriptor) for all the courses
+        of the store (loads any lazy course which isn't loaded yet)
+        """
+        self._load_pending_courses()
+        return self._modules
+
+    @property
+    def courses(self):
+        """
+        course_dir -> XModuleDescriptor for all the courses of the store
+        (loads any lazy course which isn't loaded yet)
+        """
+        self._load_pending_courses()
+        return self._courses
+
+    @property
+    def errored_courses(self):
+        """
+        course_dir -> errorlog, for dirs that failed to load
+        (loads any lazy course which isn't loaded yet)
+        """
+        self._load_pending_courses()
+        return self._errored_courses
+
+    def _course_modules(self, course_id):
+        """
+        Return the location -> XModuleDescriptor dict of a course, loading
+        the course first if it is lazy and not loaded yet.
+        """
+        if course_id in self._pending_course_dirs:
+            self._load_courses(self._pending_course_dirs.pop(course_id))
+        return self._modules[course_id]
+
+    def _load_pending_courses(self):
+        """ Load every lazy course which isn't loaded yet. """
+        while self._pending_course_dirs:
+            _, course_dirs = self._pending_course_dirs.popitem()
+            self._load_courses(course_dirs)
+
+    def _defer_course(self, course_dir):
+        """
+        Register a course directory to be loaded on first access. Only
+        course.xml is read, to find out the course id.
+        """
+        try:
+            with open(self.data_dir / course_dir / "course.xml") as course_file:
+                course_data = etree.parse(
+                    StringIO(clean_out_mako_templating(course_file.read())),
+                    parser=edx_xml_parser
+                ).getroot()
+            url_name = course_data.get('url_name', course_data.get('slug'))
+            if not url_name:
+                url_name = Location.clean(course_data.get('name'))
+            org = course_data.get('org')
+            course = course_data.get('course')
+            course_id = CourseDescriptor.make_id(
+                'edx' if org is None else org,
+                course_dir if course is None else course,
+                url_name
+            )
+        except Exception:  # pylint: disable=W0703
+            # let a regular load report what's wrong with the course
+            self._load_courses([course_dir])
+            return
+        self._pending_course_dirs.setdefault(course_id, []).append(course_dir)
+
+    def _load_courses(self, course_dirs):
+        """
+        Load course directories, restoring them from their snapshots when
+        possible, and parsing the others in parallel if load_workers > 1.
+        """
+        to_parse = []
         for course_dir in course_dirs:
-            self.try_load_course(course_dir)
+            if not self._restore_course_snapshot(course_dir):
+                to_parse.append(course_dir)
+
+        if self.load_workers > 1 and len(to_parse) > 1:
+            self._load_courses_in_parallel(to_parse)
+        else:
+            for course_dir in to_parse:
+                self.try_load_course(course_dir)
+                if self.snapshot_dir is not None:
+                    snapshot = self.snapshot_course(course_dir)
+                    if snapshot is not None:
+                        self._write_course_snapshot(course_dir, snapshot)
+
+    def _load_courses_in_parallel(self, course_dirs):
+        """
+        Parse course directories in a pool of load_workers processes. The
+        workers send back course snapshots, which are restored in this store.
+        """
+        args = [
+            (self.data_dir, self._default_class_path, self.load_error_modules, self.xblock_mixins, course_dir)
+            for course_dir in course_dirs
+        ]
+        pool = multiprocessing.Pool(min(self.load_workers, len(course_dirs)))
+        try:
+            results = pool.map(_load_course_snapshot, args)
+        finally:
+            pool.close()
+            pool.join()
+
+        for course_dir, pickled_snapshot in zip(course_dirs, results):
+            if pickled_snapshot is None:
+                # errored courses are loaded again here so that their errors are recorded
+                self.try_load_course(course_dir)
+                continue
+            try:
+                self.restore_course(pickle.loads(pickled_snapshot))
+            except Exception:  # pylint: disable=W0703
+                log.exception("Failed to restore course '%s' loaded by a worker, parsing it again", course_dir)
+                self.try_load_course(course_dir)
+                continue
+            if self.snapshot_dir is not None:
+                self._write_course_snapshot(course_dir, pickled_snapshot)
+
+    def snapshot_course(self, course_dir):
+        """
+        Return a picklable snapshot of the course loaded from course_dir,
+        from which `restore_course` can rebuild the course without parsing
+        its xml. Returns None if the course failed to load.
+        """
+        course_descriptor = self._courses.get(course_dir)
+        if course_descriptor is None:
+            return None
+        course_id = course_descriptor.id
+
+        modules = []
+        for module in self._modules[course_id].itervalues():
+            if getattr(module, 'data_dir', None) != course_dir:
+                continue
+            # write any cached field values to the field data before pickling it
+            module.save()
+            modules.append((
+                getattr(module, 'unmixed_class', module.__class__),
+                module._field_data,  # pylint: disable=W0212
+                module.scope_ids,
+                module.data_dir,
+            ))
+
+        return {
+            'course_dir': course_dir,
+            'course_id': course_id,
+            'location': course_descriptor.location,
+            'policy': getattr(course_descriptor.system, 'policy', {}),
+            'modules': modules,
+            'parents': self.parent_trackers[course_id]._parents,  # pylint: disable=W0212
+            'errors': self._location_errors[course_descriptor.location].errors,
+        }
+
+    def restore_course(self, snapshot):
+        """
+        Rebuild a course from a snapshot returned by `snapshot_course`.
+        The course is only added to the store once it is fully rebuilt, so
+        a bad snapshot leaves the store as it was.
+        """
+        course_dir = snapshot['course_dir']
+        course_id = snapshot['course_id']
+
+        errorlog = make_error_tracker()
+        errorlog.errors.extend(snapshot['errors'])
+
+        parent_tracker = self.parent_trackers[course_id]
+        system = ImportSystem(
+            xmlstore=self,
+            course_id=course_id,
+            course_dir=course_dir,
+            error_tracker=errorlog.tracker,
+            parent_tracker=parent_tracker,
+            load_error_modules=self.load_error_modules,
+            policy=snapshot['policy'],
+            mixins=self.xblock_mixins,
+        )
+
+        modules = {}
+        course_descriptor = None
+        for block_class, field_data, scope_ids, data_dir in snapshot['modules']:
+            descriptor = system.construct_xblock_from_class(block_class, field_data, scope_ids)
+            setattr(descriptor, 'data_dir', data_dir)
+            modules[descriptor.location] = descriptor
+            if descriptor.location == snapshot['location']:
+                course_descriptor = descriptor
+        if course_descriptor is None:
+            raise ValueError("Snapshot of course '{0}' has no course module".format(course_dir))
+
+        self._modules[course_id].update(modules)
+        for child, parents in snapshot['parents'].iteritems():
+            for parent in parents:
+                parent_tracker.add_parent(child, parent)
+        parent_tracker.make_known(course_descriptor.location)
+        self._courses[course_dir] = course_descriptor
+        self._location_errors[course_descriptor.location] = errorlog
+
+    def _snapshot_path(self, course_dir):
+        """
+        Path of the snapshot of course_dir for its current content. The name
+        combines a fingerprint of the course files, of the xmodule code and
+        of the store options, so a changed course is never restored from a
+        stale snapshot.
+        """
+        key = hashlib.sha1(repr((
+            SNAPSHOT_VERSION,
+            _code_fingerprint(),
+            _files_fingerprint(self.data_dir / course_dir),
+            self._default_class_path,
+            self.load_error_modules,
+            [(mixin.__module__, mixin.__name__) for mixin in self.xblock_mixins],
+        ))).hexdigest()
+        return self.snapshot_dir / '{0}-{1}.pickle'.format(course_dir, key)
+
+    def _restore_course_snapshot(self, course_dir):
+        """
+        Restore course_dir from its snapshot if there is an up to date one.
+        Returns True if the course was restored.
+        """
+        if self.snapshot_dir is None:
+            return False
+        snapshot_path = self._snapshot_path(course_dir)
+        if not snapshot_path.exists():
+            return False
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+            self.restore_course(snapshot)
+        except Exception:  # pylint: disable=W0703
+            log.exception("Failed to restore course '%s' from snapshot %s", course_dir, snapshot_path)
+            return False
+        log.debug('========> Restored course %s from snapshot %s', course_dir, snapshot_path)
+        return True
+
+    def _write_course_snapshot(self, course_dir, snapshot):
+        """
+        Write the snapshot (a dict, or an already pickled string) of course_dir,
+        and remove its outdated snapshots. The file is renamed into place so
+        that other processes never read a partial snapshot.
+        """
+        snapshot_path = self._snapshot_path(course_dir)
+        try:
+            if not self.snapshot_dir.exists():
+                os.makedirs(self.snapshot_dir)
+            if not isinstance(snapshot, str):
+                snapshot = pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL)
+            tmp_path = snapshot_path + '.{0}.tmp'.format(os.getpid())
+            with open(tmp_path, 'wb') as snapshot_file:
+                snapshot_file.write(snapshot)
+            os.rename(tmp_path, snapshot_path)
+            for old_path in self.snapshot_dir.glob('{0}-*.pickle'.format(course_dir)):
+                if old_path != snapshot_path:
+                    try:
+                        os.remove(old_path)
+                    except OSError:
+                        # already removed by another process
+                        pass
+        except Exception:  # pylint: disable=W0703
+            # snapshots are an optimization, not being able to write one isn't fatal
+            log.exception("Failed to write snapshot of course '%s' to %s", course_dir, snapshot_path)
 
     def try_load_course(self, course_dir):
         '''
@@ -322,19 +678,19 @@ class XMLModuleStore(ModuleStoreBase):
             errorlog.tracker(msg)
 
         if course_descriptor is not None and not isinstance(course_descriptor, ErrorDescriptor):
-            self.courses[course_dir] = course_descriptor
+            self._courses[course_dir] = course_descriptor
             self._location_errors[course_descriptor.location] = errorlog
             self.parent_trackers[course_descriptor.id].make_known(course_descriptor.location)
         else:
             # Didn't load course.  Instead, save the errors elsewhere.
-            self.errored_courses[course_dir] = errorlog
+            self._errored_courses[course_dir] = errorlog
 
     def __unicode__(self):
         '''
         String representation - for debugging
         '''
         return '<XMLModuleStore data_dir=%r, %d courses, %d modules>' % (
-            self.data_dir, len(self.courses), len(self.modules))
+            self.data_dir, len(self._courses), len(self._modules))
 
     def load_policy(self, policy_path, tracker):
         """
@@ -491,7 +847,7 @@ class XMLModuleStore(ModuleStoreBase):
                                 module.display_name = tab['name']
                     module.data_dir = course_dir
                     module.save()
-                    self.modules[course_descriptor.id][module.location] = module
+                    self._modules[course_descriptor.id][module.location] = module
                 except Exception, e:
                     logging.exception("Failed to load {0}. Skipping... Exception: {1}".format(filepath, str(e)))
                     system.error_tracker("ERROR: " + str(e))
@@ -513,7 +869,7 @@ class XMLModuleStore(ModuleStoreBase):
         """
         location = Location(location)
         try:
-            return self.modules[course_id][location]
+            return self._course_modules(course_id)[location]
         except KeyError:
             raise ItemNotFoundError(location)
 
@@ -522,7 +878,7 @@ class XMLModuleStore(ModuleStoreBase):
         Returns True if location exists in this ModuleStore.
         """
         location = Location(location)
-        return location in self.modules[course_id]
+        return location in self._course_modules(course_id)
 
     def get_item(self, location, depth=0):
         """
@@ -553,7 +909,7 @@ class XMLModuleStore(ModuleStoreBase):
             for _, modules in self.modules.iteritems():
                 _add_get_items(self, location, modules)
         else:
-            _add_get_items(self, location, self.modules[course_id])
+            _add_get_items(self, location, self._course_modules(course_id))
 
         return items
 
@@ -562,7 +918,8 @@ class XMLModuleStore(ModuleStoreBase):
         Returns a list of course descriptors.  If there were errors on loading,
         some of these may be ErrorDescriptors instead.
         """
-        return self.courses.values()
+        self._load_pending_courses()
+        return self._courses.values()
 
     def get_errored_courses(self):
         """
@@ -609,11 +966,23 @@ class XMLModuleStore(ModuleStoreBase):
         be empty if there are no parents.
         '''
         location = Location.ensure_fully_specified(location)
+        # make sure a lazy course is loaded before looking at its parents
+        self._course_modules(course_id)
         if not self.parent_trackers[course_id].is_known(location):
             raise ItemNotFoundError("{0} not in {1}".format(location, course_id))
 
         return self.parent_trackers[course_id].parents(location)
 
+    def get_course_path_index(self, course_id):
+        """
+        Returns the courseware path index of a course, see
+        `xmodule.modulestore.search.compute_path_index`. XML courses don't
+        change once loaded, so the index is built once per course.
+        """
+        if course_id not in self._path_indexes:
+            self._path_indexes[course_id] = compute_path_index(self, course_id)
+        return self._path_indexes[course_id]
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given
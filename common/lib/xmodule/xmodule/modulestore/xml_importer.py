@@ -1,6 +1,8 @@
+import hashlib
 import logging
 import os
 import mimetypes
+from multiprocessing.pool import ThreadPool
 from path import path
 
 from xblock.fields import Scope
@@ -15,9 +17,69 @@ from .store_utilities import rewrite_nonportable_content_links
 log = logging.getLogger(__name__)
 
 
+# size of the blocks in which static files are hashed and streamed into the content store
+STATIC_IMPORT_CHUNK_SIZE = 256 * 1024
+
+# number of threads which generate thumbnails and upload static files in parallel
+STATIC_IMPORT_WORKERS = 4
+
+
+def _read_chunks(content_path, chunk_size=STATIC_IMPORT_CHUNK_SIZE):
+    """
+    Generator over the content of a file in blocks of `chunk_size` bytes, so that
+    a file can be streamed to the content store without being read in memory.
+    """
+    with open(content_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _file_md5(content_path):
+    """
+    Returns the hex md5 digest of a file, which is what GridFS stores for the files it holds.
+    """
+    digest = hashlib.md5()
+    for chunk in _read_chunks(content_path):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _import_static_file(static_content_store, content, content_path):
+    """
+    Generate the thumbnail of `content` and save it to the content store, streaming
+    its data from `content_path`. Runs in the static import worker pool.
+    """
+    try:
+        # first let's save a thumbnail so we can get back a thumbnail location. The thumbnail
+        # is read off disk so that content.data can stay a stream.
+        (thumbnail_content, thumbnail_location) = static_content_store.generate_thumbnail(
+            content, tempfile_path=content_path
+        )
+
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
+
+        #then commit the content
+        static_content_store.save(content)
+    except Exception as err:
+        log.exception('Error importing {0}, error={1}'.format(content.import_path, err))
+
+
 def import_static_content(modules, course_loc, course_data_path, static_content_store, target_location_namespace,
-                          subpath='static', verbose=False):
+                          subpath='static', verbose=False, workers=STATIC_IMPORT_WORKERS):
+    """
+    Import the files under `course_data_path`/`subpath` into `static_content_store`.
 
+    Files are streamed into the store in chunks, and files whose md5 and import path match
+    what the store already holds for the course are not uploaded again, so re-importing
+    a course only transfers the assets which changed. Thumbnail generation and uploads run
+    in a pool of `workers` threads.
+
+    Returns a dict of file path (relative to `subpath`) -> asset name.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -25,41 +87,48 @@ def import_static_content(modules, course_loc, course_data_path, static_content_
 
     verbose = True
 
+    # the assets already in the store, so that unchanged files can be skipped
+    existing_assets = dict(
+        (asset['_id']['name'], asset)
+        for asset in static_content_store.get_all_content_for_course(target_location_namespace)
+    )
+
+    pending = []
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
-            try:
-                content_path = os.path.join(dirname, filename)
-                if verbose:
-                    log.debug('importing static content {0}...'.format(content_path))
+            content_path = os.path.join(dirname, filename)
 
-                fullname_with_subpath = content_path.replace(static_dir, '')  # strip away leading path from the name
-                if fullname_with_subpath.startswith('/'):
-                    fullname_with_subpath = fullname_with_subpath[1:]
-                content_loc = StaticContent.compute_location(target_location_namespace.org, target_location_namespace.course, fullname_with_subpath)
-                mime_type = mimetypes.guess_type(filename)[0]
+            fullname_with_subpath = content_path.replace(static_dir, '')  # strip away leading path from the name
+            if fullname_with_subpath.startswith('/'):
+                fullname_with_subpath = fullname_with_subpath[1:]
+            content_loc = StaticContent.compute_location(target_location_namespace.org, target_location_namespace.course, fullname_with_subpath)
 
-                with open(content_path, 'rb') as f:
-                    data = f.read()
+            #store the remapping information which will be needed to subsitute in the module data
+            remap_dict[fullname_with_subpath] = content_loc.name
 
-                content = StaticContent(content_loc, filename, mime_type, data, import_path=fullname_with_subpath)
+            existing = existing_assets.get(content_loc.name)
+            if (existing is not None and existing.get('import_path') == fullname_with_subpath and
+                    existing.get('md5') == _file_md5(content_path)):
+                if verbose:
+                    log.debug('static content {0} is unchanged, skipping'.format(content_path))
+                continue
 
-                # first let's save a thumbnail so we can get back a thumbnail location
-                (thumbnail_content, thumbnail_location) = static_content_store.generate_thumbnail(content)
+            if verbose:
+                log.debug('importing static content {0}...'.format(content_path))
 
-                if thumbnail_content is not None:
-                    content.thumbnail_location = thumbnail_location
+            mime_type = mimetypes.guess_type(filename)[0]
+            content = StaticContent(content_loc, filename, mime_type, _read_chunks(content_path),
+                                    import_path=fullname_with_subpath)
+            pending.append((content, content_path))
 
-                #then commit the content
-                try:
-                    static_content_store.save(content)
-                except Exception as err:
-                    log.exception('Error importing {0}, error={1}'.format(fullname_with_subpath, err))
-
-                #store the remapping information which will be needed to subsitute in the module data
-                remap_dict[fullname_with_subpath] = content_loc.name
-            except:
-                raise
+    if pending:
+        pool = ThreadPool(max(1, min(workers, len(pending))))
+        try:
+            pool.map(lambda args: _import_static_file(static_content_store, *args), pending)
+        finally:
+            pool.close()
+            pool.join()
 
     return remap_dict
 
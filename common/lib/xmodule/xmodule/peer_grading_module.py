@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 
@@ -8,6 +9,7 @@ from pkg_resources import resource_string
 from .capa_module import ComplexEncoder
 from .x_module import XModule
 from xmodule.raw_module import RawDescriptor
+from xmodule.modulestore import Location
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from .timeinfo import TimeInfo
 from xblock.fields import Dict, String, Scope, Boolean, Float
@@ -91,6 +93,9 @@ class PeerGradingModule(PeerGradingFields, XModule):
 
     css = {'scss': [resource_string(__name__, 'css/combinedopenended/display.scss')]}
 
+    # the due dates of the problems of a course are cached per version of the course
+    PROBLEM_METADATA_TIMEOUT = 24 * 60 * 60
+
     def __init__(self, *args, **kwargs):
         super(PeerGradingModule, self).__init__(*args, **kwargs)
 
@@ -102,13 +107,14 @@ class PeerGradingModule(PeerGradingFields, XModule):
             self.peer_gs = MockPeerGradingService()
 
         if self.use_for_single_location:
-            try:
-                self.linked_problem = self.system.get_module(self.link_to_location)
-            except ItemNotFoundError:
+            # only the due date of the linked problem is needed, which doesn't need the problem module
+            linked_location = Location(self.link_to_location).url()
+            linked_metadata = self.get_problem_metadata([linked_location])[linked_location]
+            if linked_metadata is None:
                 log.error("Linked location {0} for peer grading module {1} does not exist".format(
                     self.link_to_location, self.location))
-                raise
-            due_date = self.linked_problem.due
+                raise ItemNotFoundError(self.link_to_location)
+            due_date = linked_metadata['due']
             if due_date:
                 self.due = due_date
 
@@ -129,6 +135,78 @@ class PeerGradingModule(PeerGradingFields, XModule):
         if not self.ajax_url.endswith("/"):
             self.ajax_url = self.ajax_url + "/"
 
+    @property
+    def linked_problem(self):
+        """
+        The module of the problem linked to by link_to_location, which is only
+        instantiated when it's used.
+        """
+        if getattr(self, '_linked_problem', None) is None:
+            self._linked_problem = self.system.get_module(self.link_to_location)
+        return self._linked_problem
+
+    def _problem_metadata_cache_key(self):
+        """
+        Returns the cache key of the metadata of the problems of the course at
+        its current version, or None if the modulestore doesn't keep versions.
+        """
+        store = getattr(self.descriptor.runtime, 'modulestore', None)
+        version = store.get_course_version(self.system.course_id) if store is not None else None
+        if version is None:
+            return None
+        return 'peer_grading.problem_metadata.{0}'.format(
+            hashlib.sha1(u'{0}:{1}'.format(self.system.course_id, version).encode('utf-8')).hexdigest()
+        )
+
+    def _load_problem_descriptors(self, locations):
+        """
+        Returns a dict of location url -> descriptor of the open ended problems
+        of the course, and of any others of `locations`. All the open ended
+        problems are read with a single modulestore call when the descriptor's
+        runtime has a modulestore; the others of `locations` are loaded one by one.
+        """
+        descriptors = {}
+        store = getattr(self.descriptor.runtime, 'modulestore', None)
+        if store is not None:
+            query = self.location.replace(category='combinedopenended', name=None, revision=None)
+            for descriptor in store.get_items(query, course_id=self.system.course_id):
+                descriptors[descriptor.location.replace(revision=None).url()] = descriptor
+
+        for location in locations:
+            if location in descriptors:
+                continue
+            try:
+                descriptors[location] = self.descriptor.runtime.load_item(location)
+            except Exception:
+                # the linked problem doesn't exist
+                log.error("Problem {0} does not exist in this course".format(location))
+        return descriptors
+
+    def get_problem_metadata(self, locations):
+        """
+        Returns a dict of location url -> {'due', 'graceperiod'} of the problems
+        at `locations`, or None for those which don't exist in the course.
+
+        The metadata of all the open ended problems of the course is cached
+        per version of the course, so showing the problem list reads the
+        modulestore at most once after the course changes.
+        """
+        locations = [Location(location).url() for location in locations]
+        key = self._problem_metadata_cache_key()
+        metadata = self.system.cache.get(key) if key is not None else None
+        if metadata is not None and all(location in metadata for location in locations):
+            return metadata
+
+        metadata = dict(
+            (location, {'due': descriptor.due, 'graceperiod': descriptor.graceperiod})
+            for location, descriptor in self._load_problem_descriptors(locations).iteritems()
+        )
+        for location in locations:
+            metadata.setdefault(location, None)
+        if key is not None:
+            self.system.cache.set(key, metadata, self.PROBLEM_METADATA_TIMEOUT)
+        return metadata
+
     def closed(self):
         return self._closed(self.timeinfo)
 
@@ -513,40 +591,22 @@ class PeerGradingModule(PeerGradingFields, XModule):
             success = False
 
 
-        def _find_corresponding_module_for_location(location):
-            '''
-            find the peer grading module that links to the given location
-            '''
-            try:
-                return modulestore().get_instance(self.system.course_id, location)
-            except Exception:
-                # the linked problem doesn't exist
-                log.error("Problem {0} does not exist in this course".format(location))
-                raise
+        problem_metadata = self.get_problem_metadata([problem['location'] for problem in problem_list])
 
         good_problem_list = []
         for problem in problem_list:
             problem_location = problem['location']
+            metadata = problem_metadata.get(Location(problem_location).url())
+            if metadata is None:
+                # the problem doesn't exist in this course
+                continue
+            problem['due'] = metadata['due']
             try:
-                descriptor = _find_corresponding_module_for_location(problem_location)
+                problem_timeinfo = TimeInfo(problem['due'], metadata['graceperiod'])
             except Exception:
-                continue
-            if descriptor:
-                problem['due'] = descriptor.due
-                grace_period = descriptor.graceperiod
-                try:
-                    problem_timeinfo = TimeInfo(problem['due'], grace_period)
-                except Exception:
-                    log.error("Malformed due date or grace period string for location {0}".format(problem_location))
-                    raise
-                if self._closed(problem_timeinfo):
-                    problem['closed'] = True
-                else:
-                    problem['closed'] = False
-            else:
-                # if we can't find the due date, assume that it doesn't have one
-                problem['due'] = None
-                problem['closed'] = False
+                log.error("Malformed due date or grace period string for location {0}".format(problem_location))
+                raise
+            problem['closed'] = self._closed(problem_timeinfo)
             good_problem_list.append(problem)
 
         ajax_url = self.ajax_url
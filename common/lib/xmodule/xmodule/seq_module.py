@@ -18,6 +18,27 @@ log = logging.getLogger(__name__)
 class_priority = ['video', 'problem']
 
 
+def priority_icon_class(child_classes):
+    """
+    Returns the icon class of a container given the icon classes of its children.
+    """
+    new_class = 'other'
+    for c in class_priority:
+        if c in child_classes:
+            new_class = c
+    return new_class
+
+
+def descriptor_icon_class(descriptor):
+    """
+    Returns the icon class the module of `descriptor` would have, without
+    instantiating the modules of its descendants.
+    """
+    if descriptor.has_children:
+        return priority_icon_class(set(descriptor_icon_class(child) for child in descriptor.get_children()))
+    return getattr(getattr(descriptor, 'module_class', None), 'icon_class', 'other')
+
+
 class SequenceFields(object):
     has_children = True
 
@@ -67,8 +88,30 @@ class SequenceModule(SequenceFields, XModule):
         if dispatch == 'goto_position':
             self.position = int(data['position'])
             return json.dumps({'success': True})
+        if dispatch == 'render_position':
+            # fetch a unit which wasn't rendered with the page, see render()
+            items = self.get_display_items()
+            position = int(data['position'])
+            if not 1 <= position <= len(items):
+                raise NotFoundError('Position {0} is not in this sequence'.format(position))
+            child = items[position - 1]
+            progress = child.get_progress()
+            return json.dumps({
+                'success': True,
+                'html': child.get_html(),
+                'progress_status': Progress.to_js_status_str(progress),
+            })
         raise NotFoundError('Unexpected dispatch type')
 
+    @property
+    def render_lazily(self):
+        """
+        True if only the unit at the current position is rendered with the
+        page, the others being fetched with the 'render_position' dispatch when
+        the student opens them. Set by the runtime through system.lazy_sequence_rendering.
+        """
+        return bool(getattr(self.system, 'lazy_sequence_rendering', False))
+
     def render(self):
         # If we're rendering this sequence, but no position is set yet,
         # default the position to the first element
@@ -79,10 +122,16 @@ class SequenceModule(SequenceFields, XModule):
             return
         ## Returns a set of all types of all sub-children
         contents = []
-        for child in self.get_display_items():
+        for position, child in enumerate(self.get_display_items(), start=1):
+            if self.render_lazily and position != self.position:
+                # only describe the unit from its descriptors: its content and
+                # progress are fetched when it's opened
+                contents.append(self._lazy_childinfo(child))
+                continue
             progress = child.get_progress()
             childinfo = {
                 'content': child.get_html(),
+                'rendered': True,
                 'title': "\n".join(
                     grand_child.display_name
                     for grand_child in child.get_children()
@@ -107,14 +156,40 @@ class SequenceModule(SequenceFields, XModule):
         self.content = self.system.render_template('seq_module.html', params)
         self.rendered = True
 
+    def _lazy_childinfo(self, child):
+        """
+        Returns the template info of a unit which isn't rendered with the page.
+        The title and icon come from the descriptors of the unit's children, so
+        that their modules aren't instantiated.
+        """
+        if child.has_children:
+            grand_children = child.get_child_descriptors()
+            icon_class = priority_icon_class(set(descriptor_icon_class(grand_child) for grand_child in grand_children))
+        else:
+            grand_children = []
+            icon_class = child.get_icon_class()
+
+        childinfo = {
+            'content': '',
+            'rendered': False,
+            'title': "\n".join(
+                grand_child.display_name
+                for grand_child in grand_children
+                if grand_child.display_name is not None
+            ),
+            'progress_status': Progress.to_js_status_str(None),
+            'progress_detail': Progress.to_js_detail_str(None),
+            'type': icon_class,
+            'id': child.id,
+        }
+        if childinfo['title'] == '':
+            childinfo['title'] = child.display_name_with_default
+        return childinfo
+
     def get_icon_class(self):
         child_classes = set(child.get_icon_class()
                             for child in self.get_children())
-        new_class = 'other'
-        for c in class_priority:
-            if c in child_classes:
-                new_class = c
-        return new_class
+        return priority_icon_class(child_classes)
 
 
 class SequenceDescriptor(SequenceFields, MakoModuleDescriptor, XmlDescriptor):
@@ -30,6 +30,33 @@ MODULE_DIR = path(__file__).dirname()
 DATA_DIR = path.joinpath(*MODULE_DIR.splitall()[:-4]) / 'test/data/'
 
 
+class DictCache(object):
+    """
+    A cache kept in a dict, with the interface of ModuleSystem.cache
+    """
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.values[key] = value
+
+    def add(self, key, value, timeout=None):
+        self.values.setdefault(key, value)
+
+    def get_many(self, keys):
+        return dict((key, self.values[key]) for key in keys if key in self.values)
+
+    def set_many(self, values, timeout=None):
+        self.values.update(values)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
 open_ended_grading_interface = {
         'url': 'blah/',
         'username': 'incorrect_user',
@@ -23,7 +23,7 @@ from xblock.fields import ScopeIds
 
 from django.http import QueryDict
 
-from . import get_test_system
+from . import get_test_system, DictCache
 from pytz import UTC
 from capa.correctmap import CorrectMap
 
@@ -67,6 +67,13 @@ class CapaFactory(object):
                          'SampleProblem%d' % CapaFactory.num]) +
                 "_2_1")
 
+    @staticmethod
+    def response_element_id():
+        """
+        Return the id of the element of the response in the problem HTML
+        """
+        return "response_" + CapaFactory.answer_key().rsplit('_', 1)[0]
+
     @staticmethod
     def create(graceperiod=None,
                due=None,
@@ -418,8 +425,13 @@ class CapaModuleTest(unittest.TestCase):
         # Expect that the problem is marked correct
         self.assertEqual(result['success'], 'correct')
 
-        # Expect that we get the (mocked) HTML
-        self.assertEqual(result['contents'], 'Test HTML')
+        # Expect that we get the HTML of the response which changed,
+        # instead of the HTML of the whole problem
+        self.assertFalse('contents' in result)
+        self.assertFalse(mock_html.called)
+        self.assertEqual(result['fragments'].keys(), [CapaFactory.response_element_id()])
+        self.assertTrue('Test Template HTML' in result['fragments'][CapaFactory.response_element_id()])
+        self.assertEqual(result['actions'], "<div>Test Template HTML</div>")
 
         # Expect that the number of attempts is incremented by 1
         self.assertEqual(module.attempts, 2)
@@ -442,6 +454,90 @@ class CapaModuleTest(unittest.TestCase):
         # Expect that the number of attempts is incremented by 1
         self.assertEqual(module.attempts, 1)
 
+    def test_check_problem_unchanged(self):
+
+        module = CapaFactory.create(attempts=0)
+        get_request_dict = {CapaFactory.input_key(): '0'}
+        module.check_problem(get_request_dict)
+
+        # Check the same answer again
+        with patch('xmodule.capa_module.CapaModule.get_problem_html') as mock_html:
+            result = module.check_problem(get_request_dict)
+
+        # Expect that only the actions are rendered again
+        self.assertEqual(result['success'], 'incorrect')
+        self.assertFalse(mock_html.called)
+        self.assertEqual(result['fragments'], {})
+        self.assertEqual(result['actions'], "<div>Test Template HTML</div>")
+
+    def test_check_problem_every_response_changed(self):
+
+        module = CapaFactory.create(attempts=0)
+
+        # Simulate a change of the overall message shown in every response
+        with patch('capa.capa_problem.LoncapaProblem.get_changed_responses') as mock_changed, \
+                patch('xmodule.capa_module.CapaModule.get_problem_html') as mock_html:
+            mock_changed.return_value = None
+            mock_html.return_value = "Test HTML"
+
+            get_request_dict = {CapaFactory.input_key(): '0'}
+            result = module.check_problem(get_request_dict)
+
+        # Expect that the whole problem is rendered again
+        self.assertEqual(result['contents'], 'Test HTML')
+        self.assertFalse('fragments' in result)
+
+    def test_check_problem_rate_limited(self):
+
+        module = CapaFactory.create(attempts=0)
+        module.system.cache = DictCache()
+        module.system.check_rate_limit = {'burst': 2, 'interval': 3}
+
+        with patch('xmodule.capa_module.time.time') as mock_time:
+            mock_time.return_value = 1000.0
+
+            # Expect that a burst of checks is graded
+            for answer in ['1', '2']:
+                result = module.check_problem({CapaFactory.input_key(): answer})
+                self.assertEqual(result['success'], 'incorrect')
+            self.assertEqual(module.attempts, 2)
+
+            # Expect that the next check must wait
+            result = module.check_problem({CapaFactory.input_key(): '3'})
+            self.assertEqual(result['success'], 'You must wait 3 seconds before checking your answers again')
+            self.assertEqual(module.attempts, 2)
+
+            # Expect that it can be checked once the bucket refilled
+            mock_time.return_value = 1000.0 + 3
+            result = module.check_problem({CapaFactory.input_key(): '3.14'})
+            self.assertEqual(result['success'], 'correct')
+            self.assertEqual(module.attempts, 3)
+
+    def test_check_problem_duplicate(self):
+
+        module = CapaFactory.create(attempts=0)
+        module.system.cache = DictCache()
+        get_request_dict = {CapaFactory.input_key(): '3.14'}
+        module.check_problem(get_request_dict)
+
+        # Expect that the same answers are not graded again, but still use up an attempt
+        with patch('capa.capa_problem.LoncapaProblem.grade_answers') as mock_grade:
+            result = module.check_problem(get_request_dict)
+        self.assertFalse(mock_grade.called)
+        self.assertEqual(result['success'], 'correct')
+        self.assertEqual(module.attempts, 2)
+
+        # Expect that other answers are graded
+        result = module.check_problem({CapaFactory.input_key(): '0'})
+        self.assertEqual(result['success'], 'incorrect')
+        self.assertEqual(module.attempts, 3)
+
+        # Expect that answers are graded again once the problem was reset
+        module.reset_problem({})
+        result = module.check_problem({CapaFactory.input_key(): '0'})
+        self.assertEqual(result['success'], 'incorrect')
+        self.assertEqual(module.attempts, 4)
+
     def test_check_problem_closed(self):
         module = CapaFactory.create(attempts=3)
 
@@ -11,6 +11,7 @@ from xblock.fields import ScopeIds
 from xmodule.error_module import NonStaffErrorDescriptor
 from xmodule.modulestore import Location
 from xmodule.modulestore.xml import ImportSystem, XMLModuleStore
+from xmodule.capa_module import CapaModule
 from xmodule.conditional_module import ConditionalModule
 from xmodule.tests import DATA_DIR, get_test_system
 
@@ -69,7 +70,8 @@ class ConditionalFactory(object):
                                                                  error_msg='random error message')
             source_module = source_descriptor.xmodule(system)
         else:
-            source_descriptor = Mock()
+            # a descriptor without fields, so that the condition is read from its module
+            source_descriptor = Mock(spec=['location'])
             source_descriptor.location = source_location
             source_module = Mock()
 
@@ -146,6 +148,24 @@ class ConditionalModuleBasicTest(unittest.TestCase):
         html = ajax['html']
         self.assertTrue(any(['This is a secret' in item for item in html]))
 
+    def test_condition_from_student_state(self):
+        '''
+        Check that the condition on a problem is evaluated from its student state,
+        without instantiating it.
+        '''
+        modules = ConditionalFactory.create(self.test_system)
+        source_descriptor = modules['cond_module'].descriptor.get_required_module_descriptors()[0]
+        source_descriptor.module_class = CapaModule
+        source_descriptor.fields = CapaModule.fields
+        source_field_data = DictFieldData({})
+        self.test_system.xblock_field_data = lambda descriptor: source_field_data
+        self.test_system.get_module = Mock(return_value=modules['child_module'])
+
+        self.assertFalse(modules['cond_module'].is_condition_satisfied())
+        source_field_data.set(source_descriptor, 'attempts', 1)
+        self.assertTrue(modules['cond_module'].is_condition_satisfied())
+        self.assertFalse(self.test_system.get_module.called)
+
     def test_error_as_source(self):
         '''
         Check that handle_ajax works properly if the source is really an ErrorModule,
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import hashlib
 import unittest
 
 from fs.memoryfs import MemoryFS
 from lxml import etree
 from mock import Mock, patch
+from path import path
 
 from django.utils.timezone import UTC
 
 from xmodule.xml_module import is_pointer_tag
 from xmodule.modulestore import Location
 from xmodule.modulestore.xml import ImportSystem, XMLModuleStore
+from xmodule.modulestore.xml_importer import import_static_content
 from xmodule.modulestore.inheritance import compute_inherited_metadata
 from xmodule.fields import Date
 from xmodule.tests import DATA_DIR
@@ -496,3 +499,53 @@ class ImportTestCase(BaseCourseTestCase):
         # and finally...
         course.cohort_config = {'cohorted': True}
         self.assertTrue(course.is_cohorted)
+
+
+class StaticContentImportTestCase(unittest.TestCase):
+    """
+    Tests of importing a course's static files into a content store.
+    """
+    def setUp(self):
+        self.course_data_path = path(DATA_DIR) / 'toy'
+        self.namespace = Location('i4x', 'edX', 'toy', 'course', '2012_Fall')
+        self.saved = {}
+        self.content_store = Mock()
+        self.content_store.get_all_content_for_course.return_value = []
+        self.content_store.generate_thumbnail.return_value = (None, None)
+        self.content_store.save.side_effect = self._save
+
+    def _save(self, content):
+        """ Record the content saved to the mock store, consuming its data stream. """
+        self.saved[content.import_path] = ''.join(content.data)
+        return content
+
+    def _import(self):
+        """ Import the static files of the toy course into the mock store. """
+        return import_static_content(
+            [], self.namespace, self.course_data_path, self.content_store, self.namespace, workers=2
+        )
+
+    def test_import_streams_all_files(self):
+        remap = self._import()
+        self.assertEqual(
+            remap,
+            {'sample_static.txt': 'sample_static.txt', 'handouts/sample_handout.txt': 'handouts_sample_handout.txt'}
+        )
+        for import_path in remap:
+            with open(self.course_data_path / 'static' / import_path, 'rb') as f:
+                self.assertEqual(self.saved[import_path], f.read())
+
+    def test_reimport_skips_unchanged_files(self):
+        static_dir = self.course_data_path / 'static'
+        with open(static_dir / 'sample_static.txt', 'rb') as f:
+            unchanged_md5 = hashlib.md5(f.read()).hexdigest()
+        self.content_store.get_all_content_for_course.return_value = [
+            {'_id': {'name': 'sample_static.txt'}, 'import_path': 'sample_static.txt', 'md5': unchanged_md5},
+            {'_id': {'name': 'handouts_sample_handout.txt'}, 'import_path': 'handouts/sample_handout.txt', 'md5': 'stale'},
+        ]
+
+        remap = self._import()
+
+        # both files are remapped, but only the modified one is uploaded
+        self.assertEqual(len(remap), 2)
+        self.assertEqual(self.saved.keys(), ['handouts/sample_handout.txt'])
@@ -1,6 +1,7 @@
 import unittest
+from mock import Mock
 from xmodule.modulestore import Location
-from .import get_test_system
+from .import get_test_system, DictCache
 from test_util_open_ended import MockQueryDict, DummyModulestore
 
 import logging
@@ -18,6 +19,8 @@ class PeerGradingModuleTest(unittest.TestCase, DummyModulestore):
     """
     problem_location = Location(["i4x", "edX", "open_ended", "peergrading",
                                  "PeerGradingSample"])
+    linked_location = Location(["i4x", "edX", "open_ended", "combinedopenended", "SampleQuestion"]).url()
+    missing_location = Location(["i4x", "edX", "open_ended", "combinedopenended", "NoSuchQuestion"]).url()
     calibrated_dict = {'location': "blah"}
     save_dict = MockQueryDict()
     save_dict.update({
@@ -136,6 +139,43 @@ class PeerGradingModuleTest(unittest.TestCase, DummyModulestore):
         """
         self.peer_grading.get_instance_state()
 
+    def test_problem_list(self):
+        """
+        Problems of the problem list get their due dates, and the problems which aren't in the course are dropped
+        """
+        self.peer_grading.peer_gs.get_problem_list = Mock(return_value={
+            'success': True,
+            'problem_list': [{'location': self.linked_location}, {'location': self.missing_location}],
+        })
+        self.test_system.render_template = Mock(return_value='')
+        self.peer_grading.get_html()
+
+        context = self.test_system.render_template.call_args[0][1]
+        self.assertEqual([problem['location'] for problem in context['problem_list']], [self.linked_location])
+        self.assertEqual(context['problem_list'][0]['closed'], False)
+
+    def test_problem_metadata_is_cached(self):
+        """
+        The problems of a course are read with one modulestore call, once per version of the course
+        """
+        descriptor = self.modulestore.get_instance(self.get_course(COURSE).id, self.linked_location)
+        store = Mock()
+        store.get_items.return_value = [descriptor]
+        store.get_course_version.return_value = 'version1'
+        self.peer_grading.descriptor.runtime.modulestore = store
+        self.test_system.cache = DictCache()
+
+        locations = [self.linked_location, self.missing_location]
+        metadata = self.peer_grading.get_problem_metadata(locations)
+        self.assertEqual(metadata[self.linked_location], {'due': descriptor.due, 'graceperiod': descriptor.graceperiod})
+        self.assertEqual(metadata[self.missing_location], None)
+        self.assertEqual(self.peer_grading.get_problem_metadata(locations), metadata)
+        self.assertEqual(store.get_items.call_count, 1)
+
+        store.get_course_version.return_value = 'version2'
+        self.peer_grading.get_problem_metadata(locations)
+        self.assertEqual(store.get_items.call_count, 2)
+
 class PeerGradingModuleScoredTest(unittest.TestCase, DummyModulestore):
     """
     Test peer grading xmodule at the unit level.  More detailed tests are difficult, as the module relies on an
@@ -0,0 +1,76 @@
+"""
+Tests of the rendering of SequenceModule.
+"""
+import json
+import unittest
+
+from xmodule.exceptions import NotFoundError
+from xmodule.modulestore import Location
+from xmodule.modulestore.xml import XMLModuleStore
+from xmodule.tests import DATA_DIR, get_test_system
+
+COURSE_ID = 'edX/toy/2012_Fall'
+SEQUENCE_LOCATION = Location('i4x://edX/toy/videosequence/Toy_Videos')
+
+
+class SequenceModuleRenderTestCase(unittest.TestCase):
+    """
+    Make sure that a sequence renders all its units, or only its current one
+    when rendering lazily.
+    """
+    def setUp(self):
+        self.modulestore = XMLModuleStore(DATA_DIR, course_dirs=['toy'])
+        self.rendered = []
+
+        self.system = get_test_system(course_id=COURSE_ID)
+        # return the context of the sequence template, so that the test can look at the items
+        self.system.render_template = lambda template, context: context if template == 'seq_module.html' else repr(context)
+        self.system.get_module = self.get_module
+
+    def get_module(self, descriptor):
+        """ Instantiate the module of descriptor, recording the calls to its get_html. """
+        module = descriptor.xmodule(self.system)
+        original_get_html = module.get_html
+
+        def get_html():
+            self.rendered.append(module.location.name)
+            return original_get_html()
+        module.get_html = get_html
+        return module
+
+    def get_sequence(self, lazy, position=2):
+        """ Returns the module of the test sequence at `position`. """
+        self.system.lazy_sequence_rendering = lazy
+        descriptor = self.modulestore.get_instance(COURSE_ID, SEQUENCE_LOCATION, depth=None)
+        sequence = descriptor.xmodule(self.system)
+        sequence.position = position
+        return sequence
+
+    def test_render_all_units(self):
+        sequence = self.get_sequence(lazy=False)
+        items = sequence.get_html()['items']
+        self.assertEqual(len(items), 9)
+        self.assertEqual(len(self.rendered), 9)
+        self.assertTrue(all(item['rendered'] for item in items))
+
+    def test_render_current_unit_only(self):
+        sequence = self.get_sequence(lazy=True)
+        items = sequence.get_html()['items']
+
+        self.assertEqual(self.rendered, ['toyjumpto'])
+        self.assertEqual([item['rendered'] for item in items], [False, True] + [False] * 7)
+        self.assertEqual(items[0]['content'], '')
+        # the units are still described for the navigation tabs
+        self.assertEqual(items[8]['type'], 'video')
+        self.assertEqual(items[8]['title'], 'Video Resources')
+
+    def test_render_position_dispatch(self):
+        sequence = self.get_sequence(lazy=True)
+        sequence.get_html()
+
+        response = json.loads(sequence.handle_ajax('render_position', {'position': '3'}))
+        self.assertTrue(response['success'])
+        self.assertEqual(self.rendered, ['toyjumpto', 'toyhtml'])
+
+        with self.assertRaises(NotFoundError):
+            sequence.handle_ajax('render_position', {'position': '10'})
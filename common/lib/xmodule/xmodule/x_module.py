@@ -837,7 +837,7 @@ class ModuleSystem(Runtime):
             anonymous_student_id='', course_id=None,
             open_ended_grading_interface=None, s3_interface=None,
             cache=None, can_execute_unsafe_code=None, replace_course_urls=None,
-            replace_jump_to_id_urls=None, **kwargs):
+            replace_jump_to_id_urls=None, check_rate_limit=None, **kwargs):
         '''
         Create a closure around the system environment.
 
@@ -887,6 +887,11 @@ class ModuleSystem(Runtime):
         can_execute_unsafe_code - A function returning a boolean, whether or
             not to allow the execution of unsafe, unsandboxed code.
 
+        check_rate_limit - Dict limiting how often a student can check a problem,
+            or None for no limit:
+                check_rate_limit = {'burst': Number of checks in a row,
+                                    'interval': Seconds between checks after that}
+
         '''
         super(ModuleSystem, self).__init__(**kwargs)
 
@@ -917,6 +922,7 @@ class ModuleSystem(Runtime):
         self.can_execute_unsafe_code = can_execute_unsafe_code or (lambda: False)
         self.replace_course_urls = replace_course_urls
         self.replace_jump_to_id_urls = replace_jump_to_id_urls
+        self.check_rate_limit = check_rate_limit
 
     def get(self, attr):
         '''	provide uniform access to attributes (like etree).'''
@@ -50,7 +50,7 @@ describe("Formula Equation Preview", function () {
         this.oldProblem = window.Problem;
 
         window.Problem = {};
-        Problem.inputAjax = jasmine.createSpy('Problem.inputAjax')
+        Problem.inputPreview = jasmine.createSpy('Problem.inputPreview')
             .andCallFake(function () {
                 ajaxTimes.push(Date.now());
             });
@@ -86,19 +86,20 @@ describe("Formula Equation Preview", function () {
 
             // This part may be asynchronous, so wait.
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             }, "AJAX never called initially", 1000);
         });
 
         it('has an initial request with the correct parameters', function () {
-            expect(Problem.inputAjax.callCount).toEqual(1);
+            expect(Problem.inputPreview.callCount).toEqual(1);
 
             // Use `.toEqual` rather than `.toHaveBeenCalledWith`
             // since it supports `jasmine.any`.
-            expect(Problem.inputAjax.mostRecentCall.args).toEqual([
-                "THE_URL",
+            expect(Problem.inputPreview.mostRecentCall.args).toEqual([
+                $('#input_THE_ID')[0],
                 "THE_ID",
                 "preview_formcalc",
+                "formcalc",
                 {formula: "PREFILLED_VALUE",
                  request_start: jasmine.any(Number)},
                 jasmine.any(Function)
@@ -106,36 +107,36 @@ describe("Formula Equation Preview", function () {
         });
 
         it('makes a request on user input', function () {
-            Problem.inputAjax.reset();
+            Problem.inputPreview.reset();
             $('#input_THE_ID').val('user_input').trigger('input');
 
             // This part is probably asynchronous
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             }, "AJAX never called on user input", 1000);
 
             runs(function () {
-                expect(Problem.inputAjax.mostRecentCall.args[3].formula
+                expect(Problem.inputPreview.mostRecentCall.args[4].formula
                       ).toEqual('user_input');
             });
         });
 
         it("isn't requested for empty input", function () {
-            Problem.inputAjax.reset();
+            Problem.inputPreview.reset();
 
             // When we make an input of '',
             $('#input_THE_ID').val('').trigger('input');
 
             // Either it makes a request or jumps straight into displaying ''.
             waitsFor(function () {
-                // (Short circuit if `inputAjax` is indeed called)
-                return Problem.inputAjax.wasCalled || 
+                // (Short circuit if `inputPreview` is indeed called)
+                return Problem.inputPreview.wasCalled || 
                     MathJax.Hub.Queue.wasCalled;
             }, "AJAX never called on user input", 1000);
 
             runs(function () {
                 // Expect the request not to have been called.
-                expect(Problem.inputAjax).not.toHaveBeenCalled();
+                expect(Problem.inputPreview).not.toHaveBeenCalled();
             });
         });
 
@@ -156,13 +157,13 @@ describe("Formula Equation Preview", function () {
             });
 
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled &&
-                    Problem.inputAjax.mostRecentCall.args[3].formula == value;
+                return Problem.inputPreview.wasCalled &&
+                    Problem.inputPreview.mostRecentCall.args[4].formula == value;
             }, "AJAX never called with final value from input", 1000);
 
             runs(function () {
                 // There should be 2 or 3 calls (depending on leading edge).
-                expect(Problem.inputAjax.callCount).not.toBeGreaterThan(3);
+                expect(Problem.inputPreview.callCount).not.toBeGreaterThan(3);
 
                 // The calls should happen approximately `minDelay` apart.
                 for (var i =1; i < this.ajaxTimes.length; i ++) {
@@ -182,7 +183,7 @@ describe("Formula Equation Preview", function () {
 
             // This part could be asynchronous
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             }, "AJAX never called initially", 1000);
 
             runs(function () {
@@ -197,23 +198,23 @@ describe("Formula Equation Preview", function () {
 
             // Don't let it fail later.
             waitsFor(function () {
-                var args = Problem.inputAjax.mostRecentCall.args;
-                return args[3].formula == "different";
+                var args = Problem.inputPreview.mostRecentCall.args;
+                return args[4].formula == "different";
             });
         });
 
         it('updates MathJax and loading icon on callback', function () {
             formulaEquationPreview.enable();
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             }, "AJAX never called initially", 1000);
 
             runs(function () {
-                var args = Problem.inputAjax.mostRecentCall.args;
-                var callback = args[4];
+                var args = Problem.inputPreview.mostRecentCall.args;
+                var callback = args[5];
                 callback({
                     preview: 'THE_FORMULA',
-                    request_start: args[3].request_start
+                    request_start: args[4].request_start
                 });
 
                 // The only request returned--it should hide the loading icon.
@@ -236,12 +237,12 @@ describe("Formula Equation Preview", function () {
             $('#input_THE_ID').val('user_input').trigger('input');
 
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             }, "AJAX never called initially", 1000);
 
             runs(function () {
-                var args = Problem.inputAjax.mostRecentCall.args;
-                var callback = args[4];
+                var args = Problem.inputPreview.mostRecentCall.args;
+                var callback = args[5];
 
                 // Cannot find MathJax.
                 MathJax.Hub.getAllJax.andReturn([]);
@@ -249,7 +250,7 @@ describe("Formula Equation Preview", function () {
 
                 callback({
                     preview: 'THE_FORMULA',
-                    request_start: args[3].request_start
+                    request_start: args[4].request_start
                 });
 
                 // Tests.
@@ -270,15 +271,15 @@ describe("Formula Equation Preview", function () {
             var $img = $("img.loading");
             formulaEquationPreview.enable();
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             }, "AJAX never called initially", 1000);
 
             runs(function () {
-                var args = Problem.inputAjax.mostRecentCall.args;
-                var callback = args[4];
+                var args = Problem.inputPreview.mostRecentCall.args;
+                var callback = args[5];
                 callback({
                     error: 'OOPSIE',
-                    request_start: args[3].request_start
+                    request_start: args[4].request_start
                 });
                 expect(MathJax.Hub.Queue).not.toHaveBeenCalled();
                 expect($img.css('visibility')).toEqual('visible');
@@ -305,7 +306,7 @@ describe("Formula Equation Preview", function () {
             formulaEquationPreview.enable();
 
             waitsFor(function () {
-                return Problem.inputAjax.wasCalled;
+                return Problem.inputPreview.wasCalled;
             });
 
             runs(function () {
@@ -313,21 +314,21 @@ describe("Formula Equation Preview", function () {
             });
 
             waitsFor(function () {
-                return Problem.inputAjax.callCount > 1;
+                return Problem.inputPreview.callCount > 1;
             });
 
             runs(function () {
-                var args = Problem.inputAjax.argsForCall;
+                var args = Problem.inputPreview.argsForCall;
                 var response0 = {
                     preview: 'THE_FORMULA_0',
-                    request_start: args[0][3].request_start
+                    request_start: args[0][4].request_start
                 };
                 var response1 = {
                     preview: 'THE_FORMULA_1',
-                    request_start: args[1][3].request_start
+                    request_start: args[1][4].request_start
                 };
 
-                this.callbacks = [args[0][4], args[1][4]];
+                this.callbacks = [args[0][5], args[1][5]];
                 this.responses = [response0, response1];
             });
         });
@@ -25,8 +25,8 @@ formulaEquationPreview.enable = function () {
 
             // The following don't change
 
-            // Find the URL from the closest parent problems-wrapper.
-            url: $this.closest('.problems-wrapper').data('url'),
+            // The input, which locates its problem.
+            element: this,
             // Grab the input id from the input.
             inputId: $this.data('input-id'),
 
@@ -76,10 +76,11 @@ formulaEquationPreview.enable = function () {
 
         if (formula) {
             // Send the request.
-            Problem.inputAjax(
-                inputData.url,
+            Problem.inputPreview(
+                inputData.element,
                 inputData.inputId,
                 'preview_formcalc',
+                'formcalc',
                 {"formula" : formula, "request_start" : now},
                 inputData.requestCallback
             );
@@ -13,6 +13,9 @@ PROFILE_FEATURES = ('name', 'language', 'location', 'year_of_birth', 'gender',
                     'level_of_education', 'mailing_address', 'goals')
 AVAILABLE_FEATURES = STUDENT_FEATURES + PROFILE_FEATURES
 
+# number of students fetched per query by the iterating exporters
+EXPORT_CHUNK_SIZE = 2000
+
 
 def enrolled_students_features(course_id, features):
     """
@@ -47,6 +50,40 @@ def enrolled_students_features(course_id, features):
     return [extract_student(student, features) for student in students]
 
 
+def iter_enrolled_students_features(course_id, features, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Generate student features as dictionaries, like `enrolled_students_features`.
+
+    Unlike `enrolled_students_features` the whole enrollment is never held
+    in memory. Students are fetched in chunks of `chunk_size` ordered by id,
+    each chunk with a single `values()` query (no model instances), and
+    yielded one at a time.
+
+    Every requested profile feature is present in the dictionaries,
+    set to None for students which have no profile.
+    """
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+    # map the values() column names back to feature names
+    columns = [(x, x) for x in student_features]
+    columns += [('profile__' + x, x) for x in profile_features]
+
+    students = User.objects.filter(
+        courseenrollment__course_id=course_id,
+        courseenrollment__is_active=1,
+    ).order_by('id')
+
+    last_id = None
+    while True:
+        chunk = students if last_id is None else students.filter(id__gt=last_id)
+        rows = list(chunk.values('id', *[column for column, _ in columns])[:chunk_size])
+        for row in rows:
+            yield dict((feature, row[column]) for column, feature in columns)
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]['id']
+
+
 def dump_grading_context(course):
     """
     Render information about course grading context
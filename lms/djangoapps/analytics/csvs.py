@@ -5,8 +5,12 @@ Format and create csv responses
 """
 
 import csv
+from cStringIO import StringIO
 from django.http import HttpResponse
 
+# number of csv rows encoded between two writes of a streaming response
+STREAMING_ROWS_PER_WRITE = 500
+
 
 def create_csv_response(filename, header, datarows):
     """
@@ -31,6 +35,61 @@ def create_csv_response(filename, header, datarows):
     return response
 
 
+def iter_csv_rows(header, datarows, rows_per_write=STREAMING_ROWS_PER_WRITE):
+    """
+    Lazily encode `header` and `datarows` (any iterable) as csv, using
+    the same dialect as `create_csv_response`.
+
+    Yields strings of up to `rows_per_write` encoded rows.
+    """
+    buf = StringIO()
+    csvwriter = csv.writer(
+        buf,
+        dialect='excel',
+        quotechar='"',
+        quoting=csv.QUOTE_ALL)
+
+    csvwriter.writerow(header)
+    for index, datarow in enumerate(datarows, 1):
+        csvwriter.writerow([unicode(s).encode('utf-8') for s in datarow])
+        if index % rows_per_write == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def create_streaming_csv_response(filename, header, datarows):
+    """
+    Create an HttpResponse with an attached .csv file whose content
+    is encoded while it is sent, so memory use does not depend on the
+    number of rows.
+
+    `datarows` can be any iterable, e.g. a generator from `iter_dictlist`.
+    """
+    response = HttpResponse(iter_csv_rows(header, datarows), mimetype='text/csv')
+    response['Content-Disposition'] = 'attachment; filename={0}'\
+        .format(filename)
+    return response
+
+
+def iter_dictlist(dictlist, features):
+    """
+    Lazy version of `format_dictlist`.
+
+    `dictlist` is any iterable of dictionaries, all dictionaries should have
+        keys from features
+    `features` is a list of features
+
+    Returns header and a generator of datarows, formatted for input in
+        create_streaming_csv_response
+    """
+    header = features
+    datarows = ([dct.get(feature) for feature in features] for dct in dictlist)
+    return header, datarows
+
+
 def format_dictlist(dictlist, features):
     """
     Convert a list of dictionaries to be compatible with create_csv_response
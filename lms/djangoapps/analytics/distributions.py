@@ -21,8 +21,11 @@ The distribution in a course for gender might look like:
 }
 """
 
+from collections import defaultdict
+
 from django.db.models import Count
 from student.models import CourseEnrollment, UserProfile
+from analytics.models import CourseProfileSummary, SUMMARIZED_FEATURES
 
 # choices with a restricted domain, e.g. level_of_education
 _EASY_CHOICE_FEATURES = ('gender', 'level_of_education')
@@ -81,23 +84,50 @@ class ProfileDistribution(object):
             validation_assert(isinstance(self.choices_display_names, dict))
 
 
-def profile_distribution(course_id, feature):
+def _query_feature_counts(course_id, features):
     """
-    Retrieve distribution of students over a given feature.
-    feature is one of AVAILABLE_PROFILE_FEATURES.
+    Count the enrollments of a course per value of each of `features`
+    with a single grouped aggregate query.
 
-    Returns a ProfileDistribution instance.
+    Enrollments of students without a profile are counted under None.
 
-    NOTE: no_data will appear as a key instead of None/null to adhere to the json spec.
-    data types are EASY_CHOICE or OPEN_CHOICE
+    Returns a dict of feature -> {profile value: enrollment count}
+    """
+    columns = ['user__profile__' + feature for feature in features]
+    # counting enrollment ids (rather than the feature column)
+    # makes NULL values get counted correctly.
+    rows = CourseEnrollment.objects.filter(
+        course_id=course_id
+    ).values(*columns).annotate(enrollment_count=Count('id')).order_by()
+    # rows are of the form [{'user__profile__gender': 'm', 'enrollment_count': 4}, ...]
+
+    counts = dict((feature, defaultdict(int)) for feature in features)
+    for row in rows:
+        for feature, column in zip(features, columns):
+            counts[feature][row[column]] += row['enrollment_count']
+    return dict((feature, dict(value_counts)) for feature, value_counts in counts.iteritems())
+
+
+def _feature_counts(course_id, features):
+    """
+    Get the enrollment counts of `features` from the pre-aggregated course
+    summary, computing and storing the summary first if it doesn't exist.
+
+    Returns a dict of feature -> {profile value: enrollment count}
     """
+    counts = CourseProfileSummary.load(course_id, features)
+    if counts is None:
+        counts = _query_feature_counts(course_id, SUMMARIZED_FEATURES)
+        CourseProfileSummary.store(course_id, counts)
+    return dict((feature, counts[feature]) for feature in features)
+
 
-    if not feature in AVAILABLE_PROFILE_FEATURES:
-        raise ValueError(
-            "unsupported feature requested for distribution '{}'".format(
-                feature)
-        )
+def _build_distribution(feature, value_counts):
+    """
+    Build the ProfileDistribution of `feature`.
 
+    `value_counts` is a dict of {profile value: enrollment count}
+    """
     prd = ProfileDistribution(feature)
 
     if feature in _EASY_CHOICE_FEATURES:
@@ -112,59 +142,64 @@ def profile_distribution(course_id, feature):
         choices = [(short, full)
                    for (short, full) in raw_choices] + [('no_data', 'No Data')]
 
-        def get_filter(feature, value):
-            """ Get the orm filter parameters for a feature. """
-            return {
-                'gender': {'user__profile__gender': value},
-                'level_of_education': {'user__profile__level_of_education': value},
-            }[feature]
-
-        def get_count(feature, value):
-            """ Get the count of enrolled students matching the feature value. """
-            return CourseEnrollment.objects.filter(
-                course_id=course_id,
-                **get_filter(feature, value)
-            ).count()
-
         distribution = {}
         for (short, full) in choices:
             # handle no data case
             if short == 'no_data':
-                distribution['no_data'] = 0
-                distribution['no_data'] += get_count(feature, None)
-                distribution['no_data'] += get_count(feature, '')
+                distribution['no_data'] = value_counts.get(None, 0) + value_counts.get('', 0)
             else:
-                distribution[short] = get_count(feature, short)
+                distribution[short] = value_counts.get(short, 0)
 
         prd.data = distribution
         prd.choices_display_names = dict(choices)
     elif feature in _OPEN_CHOICE_FEATURES:
         prd.type = 'OPEN_CHOICE'
-        profiles = UserProfile.objects.filter(
-            user__courseenrollment__course_id=course_id
-        )
-        query_distribution = profiles.values(
-            feature).annotate(Count(feature)).order_by()
-        # query_distribution is of the form [{'featureval': 'value1', 'featureval__count': 4},
-        #    {'featureval': 'value2', 'featureval__count': 2}, ...]
-
-        distribution = dict((vald[feature], vald[feature + '__count'])
-                            for vald in query_distribution)
         # distribution is of the form {'value1': 4, 'value2': 2, ...}
+        distribution = dict((value, count)
+                            for value, count in value_counts.iteritems()
+                            if count > 0)
 
         # change none to no_data for valid json key
         if None in distribution:
-            # django does not properly count NULL values when using annotate Count
-            # so
-            #     distribution['no_data'] = distribution.pop(None)
-            # would always be 0.
-
-            # Correctly count null values
-            distribution['no_data'] = profiles.filter(
-                **{feature: None}
-            ).count()
+            distribution['no_data'] = distribution.pop(None)
 
         prd.data = distribution
 
     prd.validate()
     return prd
+
+
+def profile_distributions(course_id, features):
+    """
+    Retrieve distributions of students over several features at once.
+    features are from AVAILABLE_PROFILE_FEATURES.
+
+    The counts come from the pre-aggregated course summary, see
+    analytics.models. Computing a missing summary takes a single
+    grouped query for all features.
+
+    Returns a dict of feature -> ProfileDistribution instance.
+    """
+    for feature in features:
+        if not feature in AVAILABLE_PROFILE_FEATURES:
+            raise ValueError(
+                "unsupported feature requested for distribution '{}'".format(
+                    feature)
+            )
+
+    counts = _feature_counts(course_id, features)
+    return dict((feature, _build_distribution(feature, counts[feature]))
+                for feature in features)
+
+
+def profile_distribution(course_id, feature):
+    """
+    Retrieve distribution of students over a given feature.
+    feature is one of AVAILABLE_PROFILE_FEATURES.
+
+    Returns a ProfileDistribution instance.
+
+    NOTE: no_data will appear as a key instead of None/null to adhere to the json spec.
+    data types are EASY_CHOICE or OPEN_CHOICE
+    """
+    return profile_distributions(course_id, [feature])[feature]
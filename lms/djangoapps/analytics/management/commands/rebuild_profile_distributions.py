@@ -0,0 +1,20 @@
+"""
+Recompute the pre-aggregated profile distribution summaries of courses.
+"""
+from django.core.management.base import BaseCommand
+
+from analytics.distributions import profile_distributions, AVAILABLE_PROFILE_FEATURES
+from analytics.models import CourseProfileSummary
+
+
+class Command(BaseCommand):
+    args = "<course_id course_id ...>"
+    help = "Recompute the profile distribution summaries of the given courses,\n"
+    help += "or of every summarized course if no course is given."
+
+    def handle(self, *args, **options):
+        course_ids = args or CourseProfileSummary.objects.values_list('course_id', flat=True)
+        for course_id in list(course_ids):
+            CourseProfileSummary.invalidate(course_id)
+            profile_distributions(course_id, AVAILABLE_PROFILE_FEATURES)
+            print "Rebuilt profile distributions of {}".format(course_id)
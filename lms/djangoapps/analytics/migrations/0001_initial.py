@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'CourseProfileSummary'
+        db.create_table('analytics_courseprofilesummary', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('django.db.models.fields.CharField')(unique=True, max_length=255)),
+            ('created', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
+        ))
+        db.send_create_signal('analytics', ['CourseProfileSummary'])
+
+        # Adding model 'ProfileDistributionCount'
+        db.create_table('analytics_profiledistributioncount', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('django.db.models.fields.CharField')(max_length=255, db_index=True)),
+            ('feature', self.gf('django.db.models.fields.CharField')(max_length=255)),
+            ('value', self.gf('django.db.models.fields.CharField')(max_length=255, blank=True)),
+            ('count', self.gf('django.db.models.fields.IntegerField')(default=0)),
+        ))
+        db.send_create_signal('analytics', ['ProfileDistributionCount'])
+
+        # Adding unique constraint on 'ProfileDistributionCount', fields ['course_id', 'feature', 'value']
+        db.create_unique('analytics_profiledistributioncount', ['course_id', 'feature', 'value'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'ProfileDistributionCount', fields ['course_id', 'feature', 'value']
+        db.delete_unique('analytics_profiledistributioncount', ['course_id', 'feature', 'value'])
+
+        # Deleting model 'CourseProfileSummary'
+        db.delete_table('analytics_courseprofilesummary')
+
+        # Deleting model 'ProfileDistributionCount'
+        db.delete_table('analytics_profiledistributioncount')
+
+
+    models = {
+        'analytics.courseprofilesummary': {
+            'Meta': {'object_name': 'CourseProfileSummary'},
+            'course_id': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'})
+        },
+        'analytics.profiledistributioncount': {
+            'Meta': {'unique_together': "(('course_id', 'feature', 'value'),)", 'object_name': 'ProfileDistributionCount'},
+            'count': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'course_id': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'feature': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'value': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['analytics']
@@ -0,0 +1,226 @@
+"""
+Pre-aggregated analytics data.
+
+The profile distribution summary keeps, for every course, the number of
+enrollments per value of the summarized profile features, so that the
+instructor dashboard can show profile distributions without counting over
+the enrollment table.
+
+A course is summarized once a CourseProfileSummary row exists for it. The
+counts of summarized courses are kept up to date by the signal handlers
+below as enrollments and profiles change. Operations which bypass signals
+(bulk inserts, queryset updates) must call `CourseProfileSummary.invalidate`
+so the summary is recomputed on next use.
+
+Summaries are also recomputed once they are older than SUMMARY_LIFETIME,
+which corrects any drift from changes that bypassed the signal handlers
+without invalidating the summary.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from student.models import CourseEnrollment, UserProfile
+
+# profile features which are counted in the summary
+SUMMARIZED_FEATURES = ('gender', 'level_of_education', 'year_of_birth')
+
+
+def _encode_value(value):
+    """ Convert a profile value to its summary representation. None and '' are both stored as ''. """
+    return u'' if value is None else unicode(value)
+
+
+def _decode_value(feature, value):
+    """ Convert a summary value back to the profile value. '' is returned as None. """
+    if value == u'':
+        return None
+    return UserProfile._meta.get_field(feature).to_python(value)  # pylint: disable=W0212
+
+
+class CourseProfileSummary(models.Model):
+    """
+    Marks a course whose profile distribution counts are available in
+    ProfileDistributionCount.
+    """
+    course_id = models.CharField(max_length=255, unique=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    # age after which a summary is recomputed
+    SUMMARY_LIFETIME = timedelta(days=1)
+
+    @classmethod
+    def current(cls):
+        """ Return the summaries which are still used, the ones younger than SUMMARY_LIFETIME. """
+        return cls.objects.filter(created__gt=timezone.now() - cls.SUMMARY_LIFETIME)
+
+    @classmethod
+    def is_summarized(cls, course_id):
+        """ Return True if the counts of `course_id` are maintained in the summary. """
+        return cls.current().filter(course_id=course_id).exists()
+
+    @classmethod
+    def store(cls, course_id, counts):
+        """
+        Replace the summary of a course.
+
+        `counts` is a dict of feature -> {profile value: enrollment count},
+            with a key for every feature of SUMMARIZED_FEATURES.
+        """
+        cls.invalidate(course_id)
+        sid = transaction.savepoint()
+        try:
+            ProfileDistributionCount.objects.bulk_create([
+                ProfileDistributionCount(course_id=course_id, feature=feature, value=value, count=count)
+                for feature in SUMMARIZED_FEATURES
+                for value, count in _merge_encoded(counts[feature]).iteritems()
+            ])
+            cls.objects.create(course_id=course_id)
+        except IntegrityError:
+            # the summary of the course was stored by a concurrent build
+            # meanwhile, which is just as current as this one
+            transaction.savepoint_rollback(sid)
+        else:
+            transaction.savepoint_commit(sid)
+
+    @classmethod
+    def load(cls, course_id, features):
+        """
+        Read the summarized counts of a course.
+
+        Returns a dict of feature -> {profile value: enrollment count},
+            or None if the course is not summarized.
+        """
+        if not cls.is_summarized(course_id):
+            return None
+        counts = dict((feature, {}) for feature in features)
+        rows = ProfileDistributionCount.objects.filter(
+            course_id=course_id,
+            feature__in=features,
+        ).values_list('feature', 'value', 'count')
+        for feature, value, count in rows:
+            counts[feature][_decode_value(feature, value)] = count
+        return counts
+
+    @classmethod
+    def invalidate(cls, course_id):
+        """ Drop the summary of a course, it will be recomputed on next use. """
+        cls.objects.filter(course_id=course_id).delete()
+        ProfileDistributionCount.objects.filter(course_id=course_id).delete()
+
+
+class ProfileDistributionCount(models.Model):
+    """
+    Number of enrollments in a course whose profile `feature` has `value`.
+    """
+    course_id = models.CharField(max_length=255, db_index=True)
+    feature = models.CharField(max_length=255)
+    value = models.CharField(max_length=255, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (('course_id', 'feature', 'value'),)
+
+
+def _merge_encoded(value_counts):
+    """ Merge the counts of values which share a summary representation (None and ''). """
+    merged = defaultdict(int)
+    for value, count in value_counts.iteritems():
+        merged[_encode_value(value)] += count
+    return merged
+
+
+def _adjust_counts(course_ids, profile_values, delta):
+    """
+    Add `delta` to the counts of the summarized courses among `course_ids`.
+
+    `profile_values` is a dict of feature -> profile value.
+    """
+    summarized = CourseProfileSummary.current().filter(
+        course_id__in=course_ids
+    ).values_list('course_id', flat=True)
+    for course_id in summarized:
+        for feature, value in profile_values.iteritems():
+            _adjust_count(course_id, feature, _encode_value(value), delta)
+
+
+def _adjust_count(course_id, feature, value, delta):
+    """
+    Add `delta` to the count of an encoded profile value in a course, creating
+    the count if it doesn't exist yet.
+    """
+    counts = ProfileDistributionCount.objects.filter(course_id=course_id, feature=feature, value=value)
+    if counts.update(count=F('count') + delta):
+        return
+    sid = transaction.savepoint()
+    try:
+        ProfileDistributionCount.objects.create(course_id=course_id, feature=feature, value=value, count=delta)
+    except IntegrityError:
+        # a concurrent adjustment created the count first
+        transaction.savepoint_rollback(sid)
+        counts.update(count=F('count') + delta)
+    else:
+        transaction.savepoint_commit(sid)
+
+
+def _profile_values(user_id):
+    """ Return the summarized feature values of a user's profile, all None if they have no profile. """
+    values = UserProfile.objects.filter(user=user_id).values(*SUMMARIZED_FEATURES)
+    if values:
+        return values[0]
+    return dict.fromkeys(SUMMARIZED_FEATURES)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def count_new_enrollment(sender, instance, created, **kwargs):  # pylint: disable=W0613
+    """ Count a new enrollment in the summary of its course. """
+    if created and CourseProfileSummary.is_summarized(instance.course_id):
+        _adjust_counts([instance.course_id], _profile_values(instance.user_id), 1)
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def uncount_deleted_enrollment(sender, instance, **kwargs):  # pylint: disable=W0613
+    """ Remove a deleted enrollment from the summary of its course. """
+    if CourseProfileSummary.is_summarized(instance.course_id):
+        _adjust_counts([instance.course_id], _profile_values(instance.user_id), -1)
+
+
+@receiver(pre_save, sender=UserProfile)
+def remember_profile_values(sender, instance, **kwargs):  # pylint: disable=W0613
+    """ Remember the stored feature values of a profile so that post_save can compute the change. """
+    if instance.pk is not None:
+        instance._summarized_values = _profile_values(instance.user_id)  # pylint: disable=W0212
+
+
+def _recount_profile(instance, old_values, new_values):
+    """ Move the enrollments of a profile's user from their old values to their new ones. """
+    old_values = dict((f, v) for f, v in old_values.iteritems() if _encode_value(v) != _encode_value(new_values[f]))
+    if not old_values:
+        return
+    new_values = dict((f, new_values[f]) for f in old_values)
+    course_ids = list(CourseEnrollment.objects.filter(user=instance.user_id).values_list('course_id', flat=True))
+    if course_ids:
+        _adjust_counts(course_ids, old_values, -1)
+        _adjust_counts(course_ids, new_values, 1)
+
+
+@receiver(post_save, sender=UserProfile)
+def recount_saved_profile(sender, instance, **kwargs):  # pylint: disable=W0613
+    """ Update the summaries of the user's courses after a profile change. """
+    old_values = getattr(instance, '_summarized_values', None) or dict.fromkeys(SUMMARIZED_FEATURES)
+    new_values = dict((feature, getattr(instance, feature)) for feature in SUMMARIZED_FEATURES)
+    _recount_profile(instance, old_values, new_values)
+    instance._summarized_values = new_values  # pylint: disable=W0212
+
+
+@receiver(post_delete, sender=UserProfile)
+def recount_deleted_profile(sender, instance, **kwargs):  # pylint: disable=W0613
+    """ Count the user's enrollments as having no data after their profile is deleted. """
+    old_values = dict((feature, getattr(instance, feature)) for feature in SUMMARIZED_FEATURES)
+    _recount_profile(instance, old_values, dict.fromkeys(SUMMARIZED_FEATURES))
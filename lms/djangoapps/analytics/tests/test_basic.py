@@ -6,7 +6,8 @@ from django.test import TestCase
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
 
-from analytics.basic import enrolled_students_features, AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES
+from analytics.basic import (enrolled_students_features, iter_enrolled_students_features,
+                             AVAILABLE_FEATURES, STUDENT_FEATURES, PROFILE_FEATURES)
 
 
 class TestAnalyticsBasic(TestCase):
@@ -38,6 +39,22 @@ class TestAnalyticsBasic(TestCase):
             self.assertIn(userreport['email'], [user.email for user in self.users])
             self.assertIn(userreport['name'], [user.profile.name for user in self.users])
 
+    def test_iter_enrolled_students_features(self):
+        query_features = ('username', 'name', 'email')
+        # a chunk size which doesn't divide the enrollment exercises the last partial chunk
+        userreports = list(iter_enrolled_students_features(self.course_id, query_features, chunk_size=7))
+        self.assertEqual(len(userreports), len(self.users))
+        self.assertEqual(
+            sorted(userreports),
+            sorted(enrolled_students_features(self.course_id, query_features))
+        )
+
+    def test_iter_enrolled_students_features_inactive(self):
+        CourseEnrollment.unenroll(self.users[0], self.course_id)
+        usernames = [report['username'] for report in iter_enrolled_students_features(self.course_id, ['username'])]
+        self.assertEqual(len(usernames), len(self.users) - 1)
+        self.assertNotIn(self.users[0].username, usernames)
+
     def test_available_features(self):
         self.assertEqual(len(AVAILABLE_FEATURES), len(STUDENT_FEATURES + PROFILE_FEATURES))
         self.assertEqual(set(AVAILABLE_FEATURES), set(STUDENT_FEATURES + PROFILE_FEATURES))
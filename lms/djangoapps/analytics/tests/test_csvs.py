@@ -3,7 +3,8 @@
 from django.test import TestCase
 from nose.tools import raises
 
-from analytics.csvs import create_csv_response, format_dictlist, format_instances
+from analytics.csvs import (create_csv_response, create_streaming_csv_response, iter_csv_rows,
+                            format_dictlist, iter_dictlist, format_instances)
 
 
 class TestAnalyticsCSVS(TestCase):
@@ -37,6 +38,34 @@ class TestAnalyticsCSVS(TestCase):
         self.assertEqual(res.content.strip(), '')
 
 
+class TestAnalyticsStreamingCSVS(TestCase):
+    """ Test analytics rendering of streamed csv files."""
+
+    def test_create_streaming_csv_response(self):
+        header = ['Name', 'Email']
+        datarows = (row for row in [['Jim', 'jim@edy.org'], ['Jake', 'jake@edy.org'], ['Jeeves', 'jeeves@edy.org']])
+
+        res = create_streaming_csv_response('robot.csv', header, datarows)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertEqual(res['Content-Disposition'], 'attachment; filename={0}'.format('robot.csv'))
+        self.assertEqual(res.content.strip(), '"Name","Email"\r\n"Jim","jim@edy.org"\r\n"Jake","jake@edy.org"\r\n"Jeeves","jeeves@edy.org"')
+
+    def test_iter_csv_rows_chunks(self):
+        datarows = [[str(i)] for i in xrange(5)]
+        chunks = list(iter_csv_rows(['n'], datarows, rows_per_write=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(''.join(chunks), create_csv_response('robot.csv', ['n'], datarows).content)
+
+    def test_iter_dictlist(self):
+        dictlist = [
+            {'label1': 'value-1,1', 'label2': 'value-1,2'},
+            {'label1': 'value-2,1', 'label2': 'value-2,2'},
+        ]
+        header, datarows = iter_dictlist(iter(dictlist), ['label2', 'label1'])
+        self.assertEqual(header, ['label2', 'label1'])
+        self.assertEqual(list(datarows), [['value-1,2', 'value-1,1'], ['value-2,2', 'value-2,1']])
+
+
 class TestAnalyticsFormatDictlist(TestCase):
     """ Test format_dictlist method """
 
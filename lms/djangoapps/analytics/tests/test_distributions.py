@@ -1,11 +1,15 @@
 """ Tests for analytics.distributions """
 
+from django.db import IntegrityError
 from django.test import TestCase
+from django.utils import timezone
+from mock import patch
 from nose.tools import raises
-from student.models import CourseEnrollment
+from student.models import CourseEnrollment, UserProfile
 from student.tests.factories import UserFactory
 
-from analytics.distributions import profile_distribution, AVAILABLE_PROFILE_FEATURES
+from analytics.distributions import profile_distribution, profile_distributions, AVAILABLE_PROFILE_FEATURES
+from analytics.models import CourseProfileSummary, ProfileDistributionCount
 
 
 class TestAnalyticsDistributions(TestCase):
@@ -48,6 +52,86 @@ class TestAnalyticsDistributions(TestCase):
         self.assertNotIn('no_data', distribution.data)
         self.assertEqual(distribution.data[1930], 1)
 
+    def test_profile_distributions(self):
+        distributions = profile_distributions(self.course_id, AVAILABLE_PROFILE_FEATURES)
+        self.assertEqual(set(distributions.keys()), set(AVAILABLE_PROFILE_FEATURES))
+        for feature in AVAILABLE_PROFILE_FEATURES:
+            self.assertEqual(distributions[feature].data, profile_distribution(self.course_id, feature).data)
+
+    def test_profile_distribution_summary(self):
+        self.assertFalse(CourseProfileSummary.is_summarized(self.course_id))
+        profile_distribution(self.course_id, 'gender')
+        self.assertTrue(CourseProfileSummary.is_summarized(self.course_id))
+        # summarized distributions are read without counting enrollments
+        with self.assertNumQueries(2):
+            distribution = profile_distribution(self.course_id, 'gender')
+        self.assertEqual(distribution.data['m'], len(self.users) / 3)
+
+    def test_profile_distribution_summary_enrollment(self):
+        profile_distribution(self.course_id, 'gender')
+        CourseEnrollment.enroll(UserFactory(profile__gender='f', profile__year_of_birth=1930), self.course_id)
+        self.assertEqual(profile_distribution(self.course_id, 'gender').data['f'], len(self.users) / 3 + 1)
+        self.assertEqual(profile_distribution(self.course_id, 'year_of_birth').data[1930], 2)
+
+    def test_profile_distribution_summary_profile_change(self):
+        profile_distribution(self.course_id, 'gender')
+        profile = self.users[0].profile
+        self.assertEqual(profile.gender, 'm')
+        profile.gender = 'f'
+        profile.save()
+        distribution = profile_distribution(self.course_id, 'gender')
+        self.assertEqual(distribution.data['m'], len(self.users) / 3 - 1)
+        self.assertEqual(distribution.data['f'], len(self.users) / 3 + 1)
+        profile.gender = None
+        profile.save()
+        distribution = profile_distribution(self.course_id, 'gender')
+        self.assertEqual(distribution.data['f'], len(self.users) / 3)
+        self.assertEqual(distribution.data['no_data'], 1)
+
+    def test_profile_distribution_summary_concurrent_build(self):
+        counts = profile_distributions(self.course_id, ['gender'])['gender'].data
+        # a concurrent build stores the summary between the invalidation and the store
+        with patch.object(CourseProfileSummary, 'invalidate'):
+            CourseProfileSummary.store(self.course_id, {'gender': {}, 'level_of_education': {}, 'year_of_birth': {}})
+        self.assertTrue(CourseProfileSummary.is_summarized(self.course_id))
+        self.assertEqual(profile_distribution(self.course_id, 'gender').data, counts)
+
+    def test_profile_distribution_summary_concurrent_count(self):
+        profile_distribution(self.course_id, 'year_of_birth')
+        create = ProfileDistributionCount.objects.create
+
+        def concurrent_create(**kwargs):
+            """ a concurrent enrollment creates the count first """
+            create(**kwargs)
+            raise IntegrityError()
+
+        with patch.object(ProfileDistributionCount.objects, 'create', side_effect=concurrent_create):
+            CourseEnrollment.enroll(UserFactory(profile__year_of_birth=1900), self.course_id)
+        self.assertEqual(profile_distribution(self.course_id, 'year_of_birth').data[1900], 2)
+
+    def test_profile_distribution_summary_failed_count(self):
+        profile_distribution(self.course_id, 'year_of_birth')
+        with patch.object(ProfileDistributionCount.objects, 'create', side_effect=IntegrityError()), \
+                patch('analytics.models.transaction.savepoint_rollback') as mock_rollback:
+            CourseEnrollment.enroll(UserFactory(profile__year_of_birth=1900), self.course_id)
+        self.assertTrue(mock_rollback.called)
+        # the count which failed to be created is missing, not counted twice
+        self.assertNotIn(1900, profile_distribution(self.course_id, 'year_of_birth').data)
+
+    def test_profile_distribution_summary_expires(self):
+        profile_distribution(self.course_id, 'gender')
+        # a change which bypasses the signal handlers leaves the summary behind
+        UserProfile.objects.filter(user=self.users[0]).update(gender='f')
+        self.assertEqual(profile_distribution(self.course_id, 'gender').data['m'], len(self.users) / 3)
+
+        # until the summary expires, and is recomputed
+        CourseProfileSummary.objects.filter(course_id=self.course_id).update(
+            created=timezone.now() - CourseProfileSummary.SUMMARY_LIFETIME
+        )
+        distribution = profile_distribution(self.course_id, 'gender')
+        self.assertEqual(distribution.data['m'], len(self.users) / 3 - 1)
+        self.assertEqual(distribution.data['f'], len(self.users) / 3 + 1)
+
 
 class TestAnalyticsDistributionsNoData(TestCase):
     '''Test analytics distribution gathering.'''
@@ -7,6 +7,8 @@ import re
 from path import path
 from django.http import Http404
 from django.conf import settings
+from django.core.cache import cache
+from request_cache.middleware import RequestCache
 from .module_render import get_module
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore import Location, XML_MODULESTORE_TYPE
@@ -107,6 +109,126 @@ def find_file(fs, dirs, filename):
     raise ResourceNotFoundError("Could not find {0}".format(filename))
 
 
+# about sections which are rendered from an about module of the course
+ABOUT_MODULE_SECTIONS = ['short_description', 'description', 'key_dates', 'video',
+                         'course_staff_short', 'course_staff_extended',
+                         'requirements', 'syllabus', 'textbook', 'faq', 'more_info',
+                         'number', 'instructors', 'overview',
+                         'effort', 'end_date', 'prerequisites', 'ocw_links']
+
+# rendered sections are also dropped when the version of their course changes
+SECTION_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def _section_cache_key(course_id, version, kind, section_key):
+    """
+    Returns the cache key of a rendered section of a version of a course.
+    """
+    return u'course_section.{0}.{1}.{2}.{3}'.format(course_id, version, kind, section_key)
+
+
+def get_cached_sections(courses, kind, section_key, render):
+    """
+    Returns a dict of course id -> html of the `kind` section `section_key` of
+    every course of `courses`.
+
+    Sections are cached per version of their course (see the modulestore's
+    get_course_version), so a section is rendered again after any change to its
+    course, in Studio or by an import. Courses of modulestores which don't keep
+    versions are rendered on every call.
+
+    `render(course)` renders the section of a course, and returns (html, cacheable),
+        where cacheable is False if the html can't be shown to other users.
+    """
+    request_cache = RequestCache.get_request_cache().data.setdefault('course_sections', {})
+
+    keys = {}
+    versions = modulestore().get_course_versions([course.id for course in courses])
+    for course_id, version in versions.iteritems():
+        if version is not None:
+            keys[course_id] = _section_cache_key(course_id, version, kind, section_key)
+
+    missing = [key for key in keys.itervalues() if key not in request_cache]
+    if missing:
+        request_cache.update(cache.get_many(missing))
+
+    sections = {}
+    rendered = {}
+    for course in courses:
+        key = keys.get(course.id)
+        if key in request_cache:
+            sections[course.id] = request_cache[key]
+            continue
+
+        html, cacheable = render(course)
+        sections[course.id] = html
+        if key is not None and cacheable:
+            rendered[key] = html
+
+    if rendered:
+        cache.set_many(rendered, SECTION_CACHE_TIMEOUT)
+        request_cache.update(rendered)
+
+    return sections
+
+
+def _render_section_module(request, course, location):
+    """
+    Renders the module at `location`, an about or course info module of
+    `course`, for request.user.
+
+    Returns (html, cacheable): the html is only cacheable if it is the same for
+    all users, which isn't the case of modules which show the user id, or of
+    modules rendered with staff histograms.
+    """
+    if not modulestore().has_item(course.id, location):
+        log.warning("Missing section {url} of course {course_id}".format(
+            url=location.url(), course_id=course.id))
+        return '', True
+
+    # Use an empty cache
+    field_data_cache = FieldDataCache([], course.id, request.user)
+    module = get_module(
+        request.user,
+        request,
+        location,
+        field_data_cache,
+        course.id,
+        not_found_ok=True,
+        wrap_xmodule_display=False,
+        static_asset_path=course.static_asset_path
+    )
+
+    if module is None:
+        # the user has no access to the module, others may
+        return '', False
+
+    html = module.runtime.render(module, None, 'student_view').content
+    cacheable = (
+        '%%USER_ID%%' not in getattr(module, 'data', '') and
+        not (settings.MITX_FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF') and
+             has_access(request.user, module, 'staff', course.id))
+    )
+    return html, cacheable
+
+
+def get_course_about_sections(request, courses, section_key):
+    """
+    Returns a dict of course id -> the snippet of html of the about section
+    `section_key` of every course of `courses`, which is one of
+    ABOUT_MODULE_SECTIONS.
+
+    Listing pages should call this once for all their courses, rather than
+    get_course_about_section for each course.
+    """
+    return get_cached_sections(
+        courses, 'about', section_key,
+        lambda course: _render_section_module(
+            request, course, course.location._replace(category='about', name=section_key)
+        )
+    )
+
+
 def get_course_about_section(course, section_key):
     """
     This returns the snippet of html to be rendered on the course about page,
@@ -136,37 +258,13 @@ def get_course_about_section(course, section_key):
     # good format for defining so many snippets of text/html.
 
 # TODO: Remove number, instructors from this list
-    if section_key in ['short_description', 'description', 'key_dates', 'video',
-                       'course_staff_short', 'course_staff_extended',
-                       'requirements', 'syllabus', 'textbook', 'faq', 'more_info',
-                       'number', 'instructors', 'overview',
-                       'effort', 'end_date', 'prerequisites', 'ocw_links']:
+    if section_key in ABOUT_MODULE_SECTIONS:
 
         try:
 
             request = get_request_for_thread()
 
-            loc = course.location._replace(category='about', name=section_key)
-
-            # Use an empty cache
-            field_data_cache = FieldDataCache([], course.id, request.user)
-            about_module = get_module(
-                request.user,
-                request,
-                loc,
-                field_data_cache,
-                course.id,
-                not_found_ok=True,
-                wrap_xmodule_display=False,
-                static_asset_path=course.static_asset_path
-            )
-
-            html = ''
-
-            if about_module is not None:
-                html = about_module.runtime.render(about_module, None, 'student_view').content
-
-            return html
+            return get_course_about_sections(request, [course], section_key)[course.id]
 
         except ItemNotFoundError:
             log.warning("Missing about section {key} in course {url}".format(
@@ -198,24 +296,10 @@ def get_course_info_section(request, course, section_key):
 
     loc = Location(course.location.tag, course.location.org, course.location.course, 'course_info', section_key)
 
-    # Use an empty cache
-    field_data_cache = FieldDataCache([], course.id, request.user)
-    info_module = get_module(
-        request.user,
-        request,
-        loc,
-        field_data_cache,
-        course.id,
-        wrap_xmodule_display=False,
-        static_asset_path=course.static_asset_path
-    )
-
-    html = ''
-
-    if info_module is not None:
-        html = info_module.runtime.render(info_module, None, 'student_view').content
-
-    return html
+    return get_cached_sections(
+        [course], 'course_info', section_key,
+        lambda course: _render_section_module(request, course, loc)
+    )[course.id]
 
 
 # TODO: Fix this such that these are pulled in as extra course-specific tabs.
@@ -236,26 +320,36 @@ def get_course_syllabus_section(course, section_key):
     # good format for defining so many snippets of text/html.
 
     if section_key in ['syllabus', 'guest_syllabus']:
-        try:
-            fs = course.system.resources_fs
-            # first look for a run-specific version
-            dirs = [path("syllabus") / course.url_name, path("syllabus")]
-            filepath = find_file(fs, dirs, section_key + ".html")
-            with fs.open(filepath) as htmlFile:
-                return replace_static_urls(
-                    htmlFile.read().decode('utf-8'),
-                    getattr(course, 'data_dir', None),
-                    course_id=course.location.course_id,
-                    static_asset_path=course.static_asset_path,
-                )
-        except ResourceNotFoundError:
-            log.exception("Missing syllabus section {key} in course {url}".format(
-                key=section_key, url=course.location.url()))
-            return "! Syllabus missing !"
+        return get_cached_sections(
+            [course], 'syllabus', section_key,
+            lambda course: (_read_syllabus_section(course, section_key), True)
+        )[course.id]
 
     raise KeyError("Invalid about key " + str(section_key))
 
 
+def _read_syllabus_section(course, section_key):
+    """
+    Reads the html of a syllabus section from the course's resources.
+    """
+    try:
+        fs = course.system.resources_fs
+        # first look for a run-specific version
+        dirs = [path("syllabus") / course.url_name, path("syllabus")]
+        filepath = find_file(fs, dirs, section_key + ".html")
+        with fs.open(filepath) as htmlFile:
+            return replace_static_urls(
+                htmlFile.read().decode('utf-8'),
+                getattr(course, 'data_dir', None),
+                course_id=course.location.course_id,
+                static_asset_path=course.static_asset_path,
+            )
+    except ResourceNotFoundError:
+        log.exception("Missing syllabus section {key} in course {url}".format(
+            key=section_key, url=course.location.url()))
+        return "! Syllabus missing !"
+
+
 def get_courses_by_university(user, domain=None):
     '''
     Returns dict of lists of courses available, keyed by course.org (ie university).
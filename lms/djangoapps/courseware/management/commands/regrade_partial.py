@@ -99,8 +99,8 @@ class Command(BaseCommand):
                      "in course {course_id}".format(module.grade, correct,
                                                     type=module.module_type, id=module.module_state_key,
                                                     student=module.student.username, course_id=module.course_id))
-            module.grade = correct
-            module.save()
+            # only write the grade, so that the state the student may have submitted meanwhile is kept
+            module.save_grade(correct, module.max_grade)
             self.num_changed += 1
         else:
             # don't make the change, but log that the change would be made
@@ -98,10 +98,14 @@ class Command(BaseCommand):
         if 'input_state' not in state_dict:
             pass
         elif save_changes:
-            # make the change and persist
-            del state_dict['input_state']
-            module.state = json.dumps(state_dict)
-            module.save()
+            def remove_input_state(student_module):
+                """ Remove the input_state from the state of student_module """
+                current_state_dict = json.loads(student_module.state)
+                current_state_dict.pop('input_state', None)
+                student_module.state = json.dumps(current_state_dict)
+
+            # make the change and persist, reading the state again if the student submitted meanwhile
+            module.update_with_retry(remove_input_state)
             self.num_changed += 1
         else:
             # don't make the change, but increment the count indicating the change would be made
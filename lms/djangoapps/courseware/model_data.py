@@ -21,6 +21,9 @@ from xblock.fields import Scope
 
 log = logging.getLogger(__name__)
 
+# Marks fields missing from a state
+_MISSING = object()
+
 
 class InvalidWriteError(Exception):
     """
@@ -274,6 +277,10 @@ class DjangoKeyValueStore(KeyValueStore):
     scope involved and have the field name as a key
 
     If the key isn't found in the expected table during a read or a delete, then a KeyError will be raised
+
+    The state of a StudentModule is only written if the row wasn't written by
+    another request since it was read. Otherwise, the fields changed here are
+    merged into the state the row now has, and the write is retried.
     """
 
     _allowed_scopes = (
@@ -283,6 +290,9 @@ class DjangoKeyValueStore(KeyValueStore):
         Scope.user_info,
     )
 
+    # Times the state of a StudentModule is written before giving up, when
+    # other requests keep writing it concurrently
+    STATE_SAVE_ATTEMPTS = 5
 
     def __init__(self, field_data_cache):
         self._field_data_cache = field_data_cache
@@ -329,26 +339,31 @@ class DjangoKeyValueStore(KeyValueStore):
             # Update the list of associated fields
             field_objects[field_object].append(field)
 
-            # Special case when scope is for the user state, because this scope saves fields in a single row
-            if field.scope == Scope.user_state:
-                state = json.loads(field_object.state)
-                state[field.field_name] = kv_dict[field]
-                field_object.state = json.dumps(state)
-            else:
-            # The remaining scopes save fields on different rows, so
-            # we don't have to worry about conflicts
+            # The user state fields are saved together in the state of a single
+            # row, which is written once all of them are known
+            if field.scope != Scope.user_state:
                 field_object.value = json.dumps(kv_dict[field])
 
         for field_object in field_objects:
             try:
                 # Save the field object that we made above
-                field_object.save()
-                # If save is successful on this scope, add the saved fields to
-                # the list of successful saves
-                saved_fields.extend([field.field_name for field in field_objects[field_object]])
+                if isinstance(field_object, StudentModule):
+                    saved = self._save_user_state(
+                        field_object,
+                        updates=dict((field.field_name, kv_dict[field]) for field in field_objects[field_object])
+                    )
+                else:
+                    field_object.save()
+                    saved = True
             except DatabaseError:
+                saved = False
+
+            if not saved:
                 log.error('Error saving fields %r', field_objects[field_object])
                 raise KeyValueMultiSaveError(saved_fields)
+            # If save is successful on this scope, add the saved fields to
+            # the list of successful saves
+            saved_fields.extend([field.field_name for field in field_objects[field_object]])
 
     def delete(self, key):
         if key.scope not in self._allowed_scopes:
@@ -359,13 +374,59 @@ class DjangoKeyValueStore(KeyValueStore):
             raise KeyError(key.field_name)
 
         if key.scope == Scope.user_state:
-            state = json.loads(field_object.state)
-            del state[key.field_name]
-            field_object.state = json.dumps(state)
-            field_object.save()
+            if key.field_name not in json.loads(field_object.state):
+                raise KeyError(key.field_name)
+            if not self._save_user_state(field_object, deletions=[key.field_name]):
+                raise DatabaseError('Could not delete {0} from {1!r}'.format(key.field_name, field_object))
         else:
             field_object.delete()
 
+    def _save_user_state(self, student_module, updates=None, deletions=()):
+        """
+        Set the fields in `updates`, and remove the fields in `deletions`, in
+        the state of `student_module`, and save it.
+
+        The row is only written if no other request wrote it since it was
+        read. If one did, `student_module` is reloaded, and the changes are
+        applied again to the state it now has, so that the fields written by
+        the other request are kept. Fields changed by both requests get the
+        values of this one.
+
+        Returns False if the row was deleted, or kept being written by other
+        requests.
+        """
+        updates = updates or {}
+        read_state = json.loads(student_module.state)
+
+        for _ in xrange(self.STATE_SAVE_ATTEMPTS):
+            state = json.loads(student_module.state)
+            state.update(updates)
+            for field_name in deletions:
+                state.pop(field_name, None)
+            student_module.state = json.dumps(state)
+
+            if student_module.save_state_if_current():
+                return True
+
+            try:
+                current = StudentModule.objects.get(pk=student_module.pk)
+            except StudentModule.DoesNotExist:
+                log.warning('%r was deleted while saving its state', student_module)
+                return False
+            for attr in ('state', 'grade', 'max_grade', 'done', 'modified', 'version'):
+                setattr(student_module, attr, getattr(current, attr))
+
+            current_state = json.loads(current.state)
+            conflicts = [
+                field_name for field_name in chain(updates, deletions)
+                if current_state.get(field_name, _MISSING) != read_state.get(field_name, _MISSING)
+            ]
+            if conflicts:
+                log.info('Overwriting fields %r written concurrently to %r', conflicts, student_module)
+
+        log.error('Gave up saving the state of %r after %d attempts', student_module, self.STATE_SAVE_ATTEMPTS)
+        return False
+
     def has(self, key):
         if key.scope not in self._allowed_scopes:
             raise InvalidScopeError(key.scope)
@@ -13,11 +13,20 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, DatabaseError
+from django.db.models import F
 from django.db.models.signals import post_save
+from django.utils import timezone
 from django.dispatch import receiver
 
 
+class StudentModuleWriteConflict(DatabaseError):
+    """
+    Raised when saving a StudentModule whose row was written by another
+    request since it was read.
+    """
+
+
 class StudentModule(models.Model):
     """
     Keeps student state for a particular module in a particular course.
@@ -58,6 +67,121 @@ class StudentModule(models.Model):
     created = models.DateTimeField(auto_now_add=True, db_index=True)
     modified = models.DateTimeField(auto_now=True, db_index=True)
 
+    # Incremented by every write of the row, so that writers of the state
+    # can tell whether the row changed since they read it
+    version = models.IntegerField(default=0)
+
+    # times update_with_retry applies a change before giving up
+    UPDATE_ATTEMPTS = 5
+
+    def save(self, *args, **kwargs):
+        """
+        Save the whole row, bumping its version.
+
+        An existing row is only written if it still has the version it was
+        read at: StudentModuleWriteConflict is raised, without saving
+        anything, if another request wrote it since.
+        """
+        if self.pk is None or kwargs.get('force_insert'):
+            self.version += 1
+            try:
+                super(StudentModule, self).save(*args, **kwargs)
+            except Exception:
+                self.version -= 1
+                raise
+            return
+
+        if not self._update_if_current(**self._row_values()):
+            raise StudentModuleWriteConflict('{0!r} was written since it was read'.format(self))
+
+    def update_with_retry(self, change):
+        """
+        Apply `change`, a function which modifies the StudentModule it is
+        given, to this StudentModule and save it, if the change modified it.
+        Returns what `change` returned.
+
+        If another request wrote the row since it was read, the row is read
+        again and `change` is applied to it again, up to UPDATE_ATTEMPTS
+        times, after which StudentModuleWriteConflict is raised. Raises
+        StudentModule.DoesNotExist if the row was deleted meanwhile.
+        """
+        for attempt in xrange(self.UPDATE_ATTEMPTS):
+            read_values = self._row_values()
+            result = change(self)
+            if self._row_values() == read_values:
+                return result
+            try:
+                self.save()
+                return result
+            except StudentModuleWriteConflict:
+                if attempt == self.UPDATE_ATTEMPTS - 1:
+                    raise
+            current = StudentModule.objects.get(pk=self.pk)
+            for field in self._meta.local_fields:
+                setattr(self, field.attname, getattr(current, field.attname))
+
+    def save_state_if_current(self):
+        """
+        Save the state of this StudentModule if the row still has the version
+        it was read at, and bump its version.
+
+        Returns False, without saving anything, if the row was written since
+        it was read.
+        """
+        return self._update_if_current(state=self.state)
+
+    def save_grade(self, grade, max_grade):
+        """
+        Save the grade of this StudentModule, and bump its version, without
+        writing the rest of the row: the grade doesn't depend on the state
+        other requests may have written since the row was read.
+        """
+        modified = timezone.now()
+        StudentModule.objects.filter(pk=self.pk).update(
+            grade=grade,
+            max_grade=max_grade,
+            modified=modified,
+            version=F('version') + 1,
+        )
+        # the version of the row is now at least the one it was read at plus
+        # one, and only equal to it if nobody else wrote the row meanwhile
+        self.grade = grade
+        self.max_grade = max_grade
+        self.modified = modified
+        self.version += 1
+        post_save.send(sender=StudentModule, instance=self, created=False, raw=False, using=self._state.db)
+
+    def _row_values(self):
+        """
+        Returns a dict of the values of the columns written by save().
+        """
+        return dict(
+            (field.attname, getattr(self, field.attname))
+            for field in self._meta.local_fields
+            if not field.primary_key and field.attname not in ('modified', 'version')
+        )
+
+    def _update_if_current(self, **values):
+        """
+        Write `values` to the row of this StudentModule if it still has the
+        version it was read at, and bump its version.
+
+        Returns False if the row was written since it was read.
+        """
+        modified = timezone.now()
+        updated = StudentModule.objects.filter(pk=self.pk, version=self.version).update(
+            modified=modified,
+            version=F('version') + 1,
+            **values
+        )
+        if not updated:
+            return False
+
+        self.version += 1
+        self.modified = modified
+        post_save.send(sender=StudentModule, instance=self, created=False, raw=False, using=self._state.db)
+        return True
+
     def __repr__(self):
         return 'StudentModule<%r>' % ({
             'course_id': self.course_id,
@@ -15,6 +15,7 @@ from django.views.decorators.csrf import csrf_exempt
 from requests.auth import HTTPBasicAuth
 from statsd import statsd
 
+from capa.input_preview import PREVIEWERS, preview_input
 from capa.xqueue_interface import XQueueInterface
 from mitxmako.shortcuts import render_to_string
 from xblock.runtime import DbModel
@@ -312,11 +313,9 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         )
 
         student_module = field_data_cache.find_or_create(key)
-        # Update the grades
-        student_module.grade = event.get('value')
-        student_module.max_grade = event.get('max_value')
-        # Save all changes to the underlying KeyValueStore
-        student_module.save()
+        # Update the grades, leaving the state to the KeyValueStore, which
+        # merges it with the writes of concurrent requests
+        student_module.save_grade(event.get('value'), event.get('max_value'))
 
         # Bin score into range and increment stats
         score_bucket = get_score_bucket(student_module.grade, student_module.max_grade)
@@ -374,6 +373,7 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         s3_interface=s3_interface,
         cache=cache,
         can_execute_unsafe_code=(lambda: can_execute_unsafe_code(course_id)),
+        check_rate_limit=settings.PROBLEM_CHECK_RATE_LIMIT,
         # TODO: When we merge the descriptor and module systems, we can stop reaching into the mixologist (cpennington)
         mixins=descriptor.system.mixologist._mixins,
     )
@@ -381,6 +381,8 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
     # pass position specified in URL to module through ModuleSystem
     system.set('position', position)
     system.set('DEBUG', settings.DEBUG)
+    system.set('lazy_sequence_rendering', settings.MITX_FEATURES.get('ENABLE_LAZY_SEQUENCE_RENDERING', False))
+    system.set('input_preview_url', reverse('input_preview', kwargs={'course_id': course_id}))
     if settings.MITX_FEATURES.get('ENABLE_PSYCHOMETRICS'):
         system.set(
             'psychometrics_handler',  # set callback for updating PsychometricsData
@@ -590,6 +592,39 @@ def modx_dispatch(request, dispatch, location, course_id):
     return HttpResponse(ajax_return)
 
 
+def input_preview(request, course_id):
+    """
+    Renders the preview of a value typed in a problem input, without loading
+    the problem or the student's state: previews only depend on the value and
+    on the type of the input (see capa.input_preview).
+
+    POST parameters:
+      - type -- the type of preview: 'chemcalc', 'formcalc' or 'numerical'
+      - formula -- the value typed
+      - request_start -- optional, returned as is so the client can drop stale previews
+
+    Returns the json of {'preview', 'error'[, 'request_start']}.
+    """
+    if not request.user.is_authenticated():
+        raise PermissionDenied
+
+    preview_type = request.POST.get('type')
+    if preview_type not in PREVIEWERS:
+        return JsonResponse({'error': "Unknown preview type"}, status=400)
+
+    formula = request.POST.get('formula')
+    if formula is None:
+        return JsonResponse({'preview': '', 'error': "No formula specified."})
+
+    result = preview_input(preview_type, formula)
+    if 'request_start' in request.POST:
+        try:
+            result['request_start'] = int(request.POST['request_start'])
+        except ValueError:
+            return JsonResponse({'error': "Invalid request_start"}, status=400)
+    return JsonResponse(result)
+
+
 def get_score_bucket(grade, max_grade):
     """
     Function to split arbitrary score ranges into 3 buckets.
@@ -2,7 +2,19 @@
 from django.test import TestCase
 from django.http import Http404
 from django.test.utils import override_settings
-from courseware.courses import get_course_by_id, get_cms_course_link_by_id
+from django.test.client import RequestFactory
+from django.contrib.auth.models import AnonymousUser
+from mock import patch
+
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from request_cache.middleware import RequestCache
+
+from courseware.courses import (
+    get_course_by_id, get_cms_course_link_by_id, get_course_about_sections, get_course_info_section
+)
+from courseware.tests.modulestore_config import TEST_DATA_MONGO_MODULESTORE
 
 CMS_BASE_TEST = 'testcms'
 
@@ -26,3 +38,50 @@ class CoursesTest(TestCase):
         self.assertEqual("//{}/".format(CMS_BASE_TEST), get_cms_course_link_by_id("blah_bad_course_id"))
         self.assertEqual("//{}/".format(CMS_BASE_TEST), get_cms_course_link_by_id("too/too/many/slashes"))
         self.assertEqual("//{}/org/num/course/name".format(CMS_BASE_TEST), get_cms_course_link_by_id('org/num/name'))
+
+
+@override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
+class CourseSectionCacheTest(ModuleStoreTestCase):
+    """
+    Tests that the rendered about sections of courses are cached until their course changes.
+    """
+    def setUp(self):
+        self.courses = [CourseFactory.create(org='edX', course=number) for number in ('101', '102')]
+        for course in self.courses:
+            ItemFactory.create(
+                parent_location=course.location,
+                category='about',
+                display_name='short_description',
+                data='Course {0}'.format(course.number),
+            )
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+
+    def get_descriptions(self):
+        """ Returns the short descriptions of the test courses, indexed by course id. """
+        return get_course_about_sections(self.request, self.courses, 'short_description')
+
+    def test_descriptions_are_cached(self):
+        first, second = self.courses
+        self.assertEqual(self.get_descriptions(), {first.id: 'Course 101', second.id: 'Course 102'})
+
+        RequestCache().clear_request_cache()
+        with patch('courseware.courses.get_module') as mock_get_module:
+            self.assertEqual(self.get_descriptions()[first.id], 'Course 101')
+            self.assertFalse(mock_get_module.called)
+
+    def test_update_invalidates_course_sections(self):
+        first, second = self.courses
+        self.get_descriptions()
+
+        location = first.location._replace(category='about', name='short_description')
+        modulestore().update_item(location, 'New description')
+        RequestCache().clear_request_cache()
+
+        descriptions = self.get_descriptions()
+        self.assertEqual(descriptions[first.id], 'New description')
+        self.assertEqual(descriptions[second.id], 'Course 102')
+
+    def test_missing_info_section(self):
+        # as before the sections were cached, a missing course info section renders empty
+        self.assertEqual(get_course_info_section(self.request, self.courses[0], 'handouts'), '')
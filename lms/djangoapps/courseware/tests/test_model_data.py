@@ -7,7 +7,7 @@ from functools import partial
 
 from courseware.model_data import DjangoKeyValueStore
 from courseware.model_data import InvalidScopeError, FieldDataCache
-from courseware.models import StudentModule, XModuleUserStateSummaryField
+from courseware.models import StudentModule, StudentModuleWriteConflict, XModuleUserStateSummaryField
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
 from student.tests.factories import UserFactory
@@ -143,11 +143,105 @@ class TestStudentModuleStorage(TestCase):
         for key in kv_dict:
             self.kvs.set(key, 'test_value')
 
-        with patch('django.db.models.Model.save', side_effect=DatabaseError):
+        with patch('courseware.models.StudentModule.save_state_if_current', side_effect=DatabaseError):
             with self.assertRaises(KeyValueMultiSaveError) as exception_context:
                 self.kvs.set_many(kv_dict)
         self.assertEquals(len(exception_context.exception.saved_field_names), 0)
 
+    def write_concurrently(self, **fields):
+        """Write the state of the StudentModule as another request would, after it was cached"""
+        student_module = StudentModule.objects.get()
+        state = json.loads(student_module.state)
+        state.update(fields)
+        student_module.state = json.dumps(state)
+        student_module.save()
+
+    def test_save_bumps_version(self):
+        "Test that every write of a StudentModule changes its version"
+        student_module = StudentModule.objects.get()
+        version = student_module.version
+        student_module.save()
+        self.assertEquals(version + 1, StudentModule.objects.get().version)
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.assertEquals(version + 2, StudentModule.objects.get().version)
+
+    def test_set_merges_concurrent_write(self):
+        "Test that setting a field keeps the fields written by another request since the state was read"
+        self.write_concurrently(b_field='other_value', c_field='other_value')
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.assertEquals(
+            {'a_field': 'new_value', 'b_field': 'other_value', 'c_field': 'other_value'},
+            json.loads(StudentModule.objects.get().state)
+        )
+        self.assertEquals('other_value', self.kvs.get(user_state_key('c_field')))
+
+    def test_set_overwrites_concurrent_write_of_field(self):
+        "Test that setting a field written by another request since the state was read keeps the new value"
+        self.write_concurrently(a_field='other_value')
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.assertEquals({'a_field': 'new_value', 'b_field': 'b_value'}, json.loads(StudentModule.objects.get().state))
+
+    def test_delete_merges_concurrent_write(self):
+        "Test that deleting a field keeps the fields written by another request since the state was read"
+        self.write_concurrently(b_field='other_value')
+        self.kvs.delete(user_state_key('a_field'))
+        self.assertEquals({'b_field': 'other_value'}, json.loads(StudentModule.objects.get().state))
+
+    def test_save_rejects_stale_row(self):
+        "Test that saving a StudentModule written by another request since it was read fails"
+        student_module = StudentModule.objects.get()
+        self.write_concurrently(b_field='other_value')
+        student_module.state = json.dumps({'a_field': 'stale_value'})
+        with self.assertRaises(StudentModuleWriteConflict):
+            student_module.save()
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'other_value'}, json.loads(StudentModule.objects.get().state))
+
+    def test_update_with_retry(self):
+        "Test that a change of a StudentModule written by another request since it was read is applied again"
+        student_module = StudentModule.objects.get()
+        self.write_concurrently(b_field='other_value')
+
+        def change(module):
+            state = json.loads(module.state)
+            state['a_field'] = 'new_value'
+            module.state = json.dumps(state)
+            return 'result'
+
+        self.assertEquals('result', student_module.update_with_retry(change))
+        self.assertEquals({'a_field': 'new_value', 'b_field': 'other_value'}, json.loads(StudentModule.objects.get().state))
+
+    def test_update_with_retry_gives_up(self):
+        "Test that changing a StudentModule other requests keep writing fails"
+        student_module = StudentModule.objects.get()
+
+        def change(module):
+            self.write_concurrently(b_field=module.version)
+            module.state = json.dumps({'a_field': 'new_value'})
+
+        with self.assertRaises(StudentModuleWriteConflict):
+            student_module.update_with_retry(change)
+        self.assertNotIn('new_value', StudentModule.objects.get().state)
+
+    def test_grade_keeps_concurrent_write(self):
+        "Test that publishing a grade races neither a concurrent write of the state, nor the next state write"
+        student_module = self.field_data_cache.find_or_create(user_state_key('a_field'))
+        self.write_concurrently(b_field='other_value')
+        student_module.save_grade(1, 2)
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+
+        student_module = StudentModule.objects.get()
+        self.assertEquals({'a_field': 'new_value', 'b_field': 'other_value'}, json.loads(student_module.state))
+        self.assertEquals((1, 2), (student_module.grade, student_module.max_grade))
+
+    def test_set_many_gives_up(self):
+        "Test that setting fields of a StudentModule other requests keep writing fails"
+        kv_dict = self.construct_kv_dict()
+        with patch('courseware.models.StudentModule.save_state_if_current', return_value=False) as mock_save:
+            with self.assertRaises(KeyValueMultiSaveError) as exception_context:
+                self.kvs.set_many(kv_dict)
+        self.assertEquals(DjangoKeyValueStore.STATE_SAVE_ATTEMPTS, mock_save.call_count)
+        self.assertEquals(len(exception_context.exception.saved_field_names), 0)
+
 
 class TestMissingStudentModule(TestCase):
     def setUp(self):
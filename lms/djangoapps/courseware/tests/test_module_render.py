@@ -14,6 +14,9 @@ from django.test.utils import override_settings
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.factories import ItemFactory, CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.tests import get_test_system
+from xmodule.tests.test_conditional import ConditionalFactory
+from mitxmako.shortcuts import render_to_string
 import courseware.module_render as render
 from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
@@ -414,3 +417,21 @@ class TestHtmlModifiers(ModuleStoreTestCase):
             'Staff Debug',
             result_fragment.content
         )
+
+
+class TestConditionalMessage(TestCase):
+    """
+    Tests of the message rendered by a conditional module whose condition isn't met.
+    """
+    def test_message_links_required_modules(self):
+        course_id = 'edX/conditional_test/test_run'
+        system = get_test_system(course_id=course_id)
+        system.render_template = render_to_string
+        modules = ConditionalFactory.create(system)
+        modules['source_module'].is_attempted = 'false'
+        source_descriptor = modules['cond_module'].descriptor.get_required_module_descriptors()[0]
+        source_descriptor.display_name_with_default = 'Sample Problem'
+
+        html = json.loads(modules['cond_module'].handle_ajax('', ''))['html'][0]
+        url = reverse('jump_to', kwargs={'course_id': course_id, 'location': source_descriptor.location.url()})
+        self.assertIn('<a href={url}>Sample Problem</a> must be attempted'.format(url=url), html)
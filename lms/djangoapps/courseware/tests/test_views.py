@@ -1,5 +1,6 @@
-from mock import MagicMock
+from mock import MagicMock, patch
 import datetime
+import json
 
 from django.test import TestCase
 from django.http import Http404
@@ -11,7 +12,7 @@ from django.conf import settings
 from django.core.urlresolvers import reverse
 
 from student.models import CourseEnrollment
-from student.tests.factories import AdminFactory
+from student.tests.factories import AdminFactory, UserFactory
 from mitxmako.middleware import MakoMiddleware
 
 from xmodule.modulestore.django import modulestore
@@ -19,8 +20,11 @@ from xmodule.modulestore.django import modulestore
 import courseware.views as views
 from xmodule.modulestore import Location
 from pytz import UTC
-from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE, TEST_DATA_MONGO_MODULESTORE
 from course_modes.models import CourseMode
+from course_search.index import index_course
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
@@ -222,3 +226,45 @@ class ViewsTestCase(TestCase):
         })
         response = self.client.get(url)
         self.assertFalse('<script>' in response.content)
+
+
+@override_settings(MODULESTORE=TEST_DATA_MONGO_MODULESTORE)
+class TestCourseSearch(ModuleStoreTestCase):
+    """
+    Tests of searching the content of a course
+    """
+    def setUp(self):
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent_location=self.course.location, category='chapter')
+        self.first = ItemFactory.create(parent_location=chapter.location, category='html',
+                                        display_name='First', data='<p>Comets have tails</p>')
+        self.second = ItemFactory.create(parent_location=chapter.location, category='html',
+                                         display_name='Second', data='<p>Comets and comets</p>')
+        index_course(self.course.id)
+        self.user = UserFactory.create()
+
+    def search(self, query):
+        """ The results of searching the course for `query` """
+        request = RequestFactory().get('/', {'q': query})
+        request.user = self.user
+        response = views.course_search(request, self.course.id)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)['results']
+
+    def test_search(self):
+        results = self.search('comets')
+        self.assertEqual([result['display_name'] for result in results], ['Second', 'First'])
+        self.assertEqual(results[1]['location'], self.first.location.url())
+        self.assertEqual(results[1]['excerpt'], 'First Comets have tails')
+        self.assertEqual(results[1]['url'], reverse('jump_to', args=[self.course.id, self.first.location.url()]))
+        self.assertEqual(self.search('tails comets')[0]['display_name'], 'First')
+        self.assertEqual(self.search('asteroids'), [])
+        self.assertEqual(self.search(''), [])
+
+    def test_search_checks_access(self):
+        def has_access(user, descriptor, action, course_context=None):  # pylint: disable=W0613
+            return descriptor.location != self.second.location
+
+        with patch('courseware.views.has_access', has_access):
+            results = self.search('comets')
+        self.assertEqual([result['display_name'] for result in results], ['First'])
@@ -18,19 +18,22 @@ from markupsafe import escape
 
 from courseware import grades
 from courseware.access import has_access
-from courseware.courses import (get_courses, get_course_with_access,
+from courseware.courses import (get_courses, get_course_with_access, get_course_about_sections,
                                 get_courses_by_university, sort_by_announcement)
 import courseware.tabs as tabs
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache
 from .module_render import toc_for_course, get_module_for_descriptor, get_module
-from courseware.models import StudentModule, StudentModuleHistory
+from courseware.models import StudentModule, StudentModuleHistory, StudentModuleWriteConflict
 from course_modes.models import CourseMode
+from course_search.index import tokenize
+from course_search.models import CourseSearchDocument
 
 from django_comment_client.utils import get_discussion_title
 
 from student.models import UserTestGroup, CourseEnrollment
 from util.cache import cache, cache_if_anonymous
+from util.json_request import JsonResponse
 from xmodule.modulestore import Location
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import InvalidLocationError, ItemNotFoundError, NoPathToItem
@@ -43,6 +46,10 @@ log = logging.getLogger("mitx.courseware")
 
 template_imports = {'urllib': urllib}
 
+# the default and maximum numbers of results of a course search
+COURSE_SEARCH_RESULTS = 20
+MAX_COURSE_SEARCH_RESULTS = 50
+
 def user_groups(user):
     """
     TODO (vshnayder): This is not used. When we have a new plan for groups, adjust appropriately.
@@ -74,6 +81,8 @@ def courses(request):
     """
     courses = get_courses(request.user, request.META.get('HTTP_HOST'))
     courses = sort_by_announcement(courses)
+    # fetch the descriptions of all the courses at once, course.html then finds them in the request cache
+    get_course_about_sections(request, courses, 'short_description')
 
     return render_to_response("courseware/courses.html", {'courses': courses})
 
@@ -747,7 +756,11 @@ def submission_history(request, course_id, student_username, location):
 
     # If no history records exist, let's force a save to get history started.
     if not history_entries:
-        student_module.save()
+        try:
+            student_module.save()
+        except StudentModuleWriteConflict:
+            # the row was written since it was read, which started its history
+            pass
         history_entries = StudentModuleHistory.objects.filter(
             student_module=student_module
         ).order_by('-id')
@@ -760,3 +773,46 @@ def submission_history(request, course_id, student_username, location):
     }
 
     return render_to_response('courseware/submission_history.html', context)
+
+
+@login_required
+def course_search(request, course_id):
+    """
+    Search the indexed content of the course for the words of the `q`
+    parameter, returning as json up to `limit` of the items which contain all
+    of them and which the user can load, the best matches first.
+    """
+    course = get_course_with_access(request.user, course_id, 'load')
+    query = request.GET.get('q', u'')
+    terms = tokenize(query)
+    try:
+        limit = min(int(request.GET.get('limit', COURSE_SEARCH_RESULTS)), MAX_COURSE_SEARCH_RESULTS)
+    except ValueError:
+        limit = COURSE_SEARCH_RESULTS
+
+    results = []
+    for document in CourseSearchDocument.search(course.id, terms, limit):
+        location = Location(document.location)
+        try:
+            descriptor = modulestore().get_instance(course.id, location)
+        except ItemNotFoundError:
+            # the item was deleted without the index being updated
+            log.warning("Removing missing %s from the search index of %s", document.location, course.id)
+            document.delete()
+            continue
+        if not has_access(request.user, descriptor, 'load', course.id):
+            continue
+
+        if location.category == 'about':
+            url = reverse('about_course', args=[course.id])
+        else:
+            url = reverse('jump_to', args=[course.id, document.location])
+        results.append({
+            'location': document.location,
+            'category': document.category,
+            'display_name': document.display_name,
+            'excerpt': document.excerpt(terms),
+            'url': url,
+        })
+
+    return JsonResponse({'query': query, 'results': results})
@@ -5,9 +5,27 @@ Does not include any access control, be sure to check access before calling.
 """
 
 import json
+import logging
+from collections import namedtuple
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.mail import send_mail
+from django.db import transaction
+from mitxmako.shortcuts import render_to_string
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from courseware.models import StudentModule
+from analytics.models import CourseProfileSummary
+
+log = logging.getLogger(__name__)
+
+# Maximum number of parameters put into a single `__in` lookup or insert
+# when operating on large batches of emails.
+BULK_ENROLLMENT_CHUNK_SIZE = 500
+
+# Result of a bulk enrollment operation on a single email.
+# `message` is the type of the notification email queued for it, or None.
+# Queued emails are sent asynchronously, so this doesn't mean it was delivered.
+EnrollmentResult = namedtuple('EnrollmentResult', 'email before after message')
 
 
 class EmailEnrollmentState(object):
@@ -23,10 +41,24 @@ class EmailEnrollmentState(object):
         exists_allowed = len(ceas) > 0
         state_auto_enroll = exists_allowed and ceas[0].auto_enroll
 
-        self.user = exists_user
-        self.enrollment = exists_ce
-        self.allowed = exists_allowed
-        self.auto_enroll = bool(state_auto_enroll)
+        self._set_state(exists_user, exists_ce, exists_allowed, state_auto_enroll)
+
+    @classmethod
+    def from_values(cls, user, enrollment, allowed, auto_enroll):
+        """
+        Build a state from already known values without querying the database.
+        Used by the bulk operations which compute states in memory.
+        """
+        state = cls.__new__(cls)
+        state._set_state(user, enrollment, allowed, auto_enroll)  # pylint: disable=W0212
+        return state
+
+    def _set_state(self, user, enrollment, allowed, auto_enroll):
+        """ Store the state values, coercing them to booleans. """
+        self.user = bool(user)
+        self.enrollment = bool(enrollment)
+        self.allowed = bool(allowed)
+        self.auto_enroll = bool(allowed and auto_enroll)
 
     def __repr__(self):
         return "{}(user={}, enrollment={}, allowed={}, auto_enroll={})".format(
@@ -104,6 +136,268 @@ def unenroll_email(course_id, student_email):
     return previous_state, after_state
 
 
+def _chunks(items, size=BULK_ENROLLMENT_CHUNK_SIZE):
+    """ Yield successive `size`-long slices of the list `items`. """
+    for start in xrange(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _unique_emails(emails):
+    """ Return `emails` with duplicates removed, preserving the input order. """
+    seen = set()
+    unique = []
+    for email in emails:
+        if email.lower() not in seen:
+            seen.add(email.lower())
+            unique.append(email)
+    return unique
+
+
+def _bulk_lookup(course_id, emails):
+    """
+    Load everything needed to compute the enrollment state of many emails
+    with one query per table (per chunk of emails).
+
+    Returns a tuple of dicts (
+        users: lowercased email -> User,
+        enrollments: user id -> CourseEnrollment,
+        allowed: lowercased email -> CourseEnrollmentAllowed,
+    )
+    """
+    users = {}
+    allowed = {}
+    for chunk in _chunks(emails):
+        for user in User.objects.filter(email__in=chunk).only('id', 'email', 'first_name', 'last_name'):
+            users[user.email.lower()] = user
+        for cea in CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=chunk):
+            allowed[cea.email.lower()] = cea
+
+    enrollments = {}
+    for chunk in _chunks([user.id for user in users.itervalues()]):
+        for enrollment in CourseEnrollment.objects.filter(course_id=course_id, user__in=chunk):
+            enrollments[enrollment.user_id] = enrollment
+
+    return users, enrollments, allowed
+
+
+def _before_state(email, users, enrollments, allowed):
+    """ Compute the EmailEnrollmentState of `email` from `_bulk_lookup` results. """
+    user = users.get(email.lower())
+    enrollment = enrollments.get(user.id) if user is not None else None
+    cea = allowed.get(email.lower())
+    return EmailEnrollmentState.from_values(
+        user=user is not None,
+        enrollment=enrollment is not None and enrollment.is_active,
+        allowed=cea is not None,
+        auto_enroll=cea is not None and cea.auto_enroll,
+    )
+
+
+def _email_message_params(email, user, message, email_params):
+    """
+    Build the `send_mail_to_student` parameters for one recipient
+    out of the parameters shared by the whole batch.
+    """
+    params = dict(email_params)
+    params['email_address'] = email
+    params['message'] = message
+    if user is not None:
+        params['first_name'] = user.first_name
+        params['last_name'] = user.last_name
+    return params
+
+
+def bulk_enroll_emails(course_id, emails, auto_enroll=False, email_params=None):
+    """
+    Enroll many students by email at once.
+
+    Behaves like calling `enroll_email` for every email, but resolves
+    users, enrollments and enrollment allowances with a handful of queries,
+    computes the before and after states in memory and writes all changes
+    in a single transaction.
+
+    `emails` is a list of email strings, duplicates are ignored.
+    `auto_enroll` is applied to the CourseEnrollmentAllowed rows of emails
+        which do not have an account yet.
+    `email_params` if set, is a dict of the parameters shared by every
+        notification email (see `send_mail_to_student`). Notification emails
+        are then queued for newly enrolled students and newly allowed emails.
+
+    Returns a list of EnrollmentResult's, in the order of `emails`.
+    """
+    emails = _unique_emails(emails)
+    users, enrollments, allowed = _bulk_lookup(course_id, emails)
+
+    results = []
+    messages = []
+    to_create = []
+    to_activate = []
+    new_allowed = []
+    update_allowed = []
+    for email in emails:
+        before = _before_state(email, users, enrollments, allowed)
+        user = users.get(email.lower())
+        message = None
+        if before.user:
+            enrollment = enrollments.get(user.id)
+            if enrollment is None:
+                to_create.append(CourseEnrollment(user=user, course_id=course_id, mode="honor", is_active=True))
+            elif not enrollment.is_active or enrollment.mode != "honor":
+                to_activate.append(user.id)
+            if not before.enrollment:
+                message = 'enrolled_enroll'
+            after = EmailEnrollmentState.from_values(True, True, before.allowed, before.auto_enroll)
+        else:
+            cea = allowed.get(email.lower())
+            if cea is None:
+                new_allowed.append(CourseEnrollmentAllowed(course_id=course_id, email=email, auto_enroll=auto_enroll))
+                message = 'allowed_enroll'
+            elif bool(cea.auto_enroll) != bool(auto_enroll):
+                update_allowed.append(cea.email)
+            after = EmailEnrollmentState.from_values(False, False, True, auto_enroll)
+
+        if email_params is None:
+            message = None
+        elif message is not None:
+            messages.append((email, _email_message_params(email, user, message, email_params)))
+        results.append(EnrollmentResult(email, before, after, message))
+
+    with transaction.commit_on_success():
+        for chunk in _chunks(to_create):
+            CourseEnrollment.objects.bulk_create(chunk)
+        if to_create:
+            # bulk inserts don't send the signals which maintain the summary
+            CourseProfileSummary.invalidate(course_id)
+        for chunk in _chunks(to_activate):
+            CourseEnrollment.objects.filter(course_id=course_id, user__in=chunk).update(is_active=True, mode="honor")
+        for chunk in _chunks(new_allowed):
+            CourseEnrollmentAllowed.objects.bulk_create(chunk)
+        for chunk in _chunks(update_allowed):
+            CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=chunk).update(auto_enroll=auto_enroll)
+
+    return _queue_result_emails(results, messages)
+
+
+def bulk_unenroll_emails(course_id, emails, email_params=None):
+    """
+    Unenroll many students by email at once.
+
+    Behaves like calling `unenroll_email` for every email, with the
+    queries batched the same way as `bulk_enroll_emails`.
+
+    `emails` is a list of email strings, duplicates are ignored.
+    `email_params` if set, is a dict of the parameters shared by every
+        notification email (see `send_mail_to_student`). Notification emails
+        are then queued for unenrolled students and disallowed emails.
+
+    Returns a list of EnrollmentResult's, in the order of `emails`.
+    """
+    emails = _unique_emails(emails)
+    users, enrollments, allowed = _bulk_lookup(course_id, emails)
+
+    results = []
+    messages = []
+    to_deactivate = []
+    to_disallow = []
+    for email in emails:
+        before = _before_state(email, users, enrollments, allowed)
+        user = users.get(email.lower())
+        message = None
+        if before.enrollment:
+            to_deactivate.append(user.id)
+            message = 'enrolled_unenroll'
+        if before.allowed:
+            to_disallow.append(allowed[email.lower()].email)
+            if not before.user:
+                message = 'allowed_unenroll'
+        after = EmailEnrollmentState.from_values(before.user, False, False, False)
+
+        if email_params is None:
+            message = None
+        elif message is not None:
+            messages.append((email, _email_message_params(email, user, message, email_params)))
+        results.append(EnrollmentResult(email, before, after, message))
+
+    with transaction.commit_on_success():
+        for chunk in _chunks(to_deactivate):
+            CourseEnrollment.objects.filter(course_id=course_id, user__in=chunk).update(is_active=False)
+        for chunk in _chunks(to_disallow):
+            CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=chunk).delete()
+
+    return _queue_result_emails(results, messages)
+
+
+def _queue_result_emails(results, messages):
+    """
+    Queue the notification emails `messages` of the bulk operation which
+    gave `results`, and return the results with no message for the emails
+    which couldn't be queued.
+    """
+    failed = queue_enrollment_emails(messages)
+    return [result._replace(message=None) if result.email in failed else result for result in results]
+
+
+def queue_enrollment_emails(messages):
+    """
+    Send enrollment notification emails asynchronously, in batches of
+    settings.EMAILS_PER_TASK.
+
+    `messages` is a list of (email, param_dict) tuples,
+        see `send_mail_to_student` for the contents of param_dict.
+
+    Returns the set of the emails whose notification couldn't be queued.
+    """
+    # imported here because instructor.tasks depends on this module
+    from instructor.tasks import send_enrollment_emails
+
+    failed = set()
+    for chunk in _chunks(messages, settings.EMAILS_PER_TASK):
+        try:
+            send_enrollment_emails.delay(chunk)
+        # the enrollments are done, only the notification of this batch is lost
+        except Exception:  # pylint: disable=W0703
+            log.exception(u"Failed to queue %d enrollment emails", len(chunk))
+            failed.update(email for email, _ in chunk)
+    return failed
+
+
+def send_mail_to_student(student, param_dict):
+    """
+    Construct the email using templates and then send it.
+    `student` is the student's email address (a `str`),
+
+    `param_dict` is a `dict` with keys [
+    `site_name`: name given to edX instance (a `str`)
+    `registration_url`: url for registration (a `str`)
+    `course_id`: id of course (a `str`)
+    `auto_enroll`: user input option (a `str`)
+    `course_url`: url of course (a `str`)
+    `email_address`: email of student (a `str`)
+    `first_name`: student first name (a `str`)
+    `last_name`: student last name (a `str`)
+    `message`: type of email to send and template to use (a `str`)
+                                        ]
+    Returns a boolean indicating whether the email was sent successfully.
+    """
+
+    EMAIL_TEMPLATE_DICT = {'allowed_enroll': ('emails/enroll_email_allowedsubject.txt', 'emails/enroll_email_allowedmessage.txt'),
+                           'enrolled_enroll': ('emails/enroll_email_enrolledsubject.txt', 'emails/enroll_email_enrolledmessage.txt'),
+                           'allowed_unenroll': ('emails/unenroll_email_subject.txt', 'emails/unenroll_email_allowedmessage.txt'),
+                           'enrolled_unenroll': ('emails/unenroll_email_subject.txt', 'emails/unenroll_email_enrolledmessage.txt')}
+
+    subject_template, message_template = EMAIL_TEMPLATE_DICT.get(param_dict['message'], (None, None))
+    if subject_template is not None and message_template is not None:
+        subject = render_to_string(subject_template, param_dict)
+        message = render_to_string(message_template, param_dict)
+
+        # Email subject *must not* contain newlines
+        subject = ''.join(subject.splitlines())
+        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [student], fail_silently=False)
+        return True
+    else:
+        return False
+
+
 def reset_student_attempts(course_id, student, module_state_key, delete_module=False):
     """
     Reset student attempts for a problem. Optionally deletes all student state for the specified problem.
@@ -133,11 +427,13 @@ def _reset_module_attempts(studentmodule):
 
     Throws ValueError if `problem_state` is invalid JSON.
     """
-    # load the state json
-    problem_state = json.loads(studentmodule.state)
-    # old_number_of_attempts = problem_state["attempts"]
-    problem_state["attempts"] = 0
-
-    # save
-    studentmodule.state = json.dumps(problem_state)
-    studentmodule.save()
+    def reset_attempts(module):
+        """ Reset the attempts in the state of module """
+        # load the state json
+        problem_state = json.loads(module.state)
+        # old_number_of_attempts = problem_state["attempts"]
+        problem_state["attempts"] = 0
+        module.state = json.dumps(problem_state)
+
+    # save, reading the state again if the student submitted meanwhile
+    studentmodule.update_with_retry(reset_attempts)
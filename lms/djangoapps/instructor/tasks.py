@@ -0,0 +1,30 @@
+"""
+Celery tasks used by the instructor dashboard.
+"""
+from celery import task
+from celery.utils.log import get_task_logger
+
+from instructor.enrollment import send_mail_to_student
+
+log = get_task_logger(__name__)
+
+
+@task  # pylint: disable=E1102
+def send_enrollment_emails(messages):
+    """
+    Send the notification emails of a bulk enrollment operation.
+
+    `messages` is a list of (email, param_dict) tuples,
+        see `instructor.enrollment.send_mail_to_student` for param_dict.
+
+    Returns the number of emails sent.
+    """
+    sent = 0
+    for email, param_dict in messages:
+        try:
+            if send_mail_to_student(email, param_dict):
+                sent += 1
+        # one bad address shouldn't prevent the rest of the batch from being sent.
+        except Exception:  # pylint: disable=W0703
+            log.exception(u"Failed to send enrollment email '%s' to %s", param_dict.get('message'), email)
+    return sent
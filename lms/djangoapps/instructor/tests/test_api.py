@@ -20,7 +20,7 @@ from courseware.tests.helpers import LoginEnrollmentTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 from student.tests.factories import UserFactory, AdminFactory
 
-from student.models import CourseEnrollment
+from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from courseware.models import StudentModule
 
 # modules which are mocked in test cases.
@@ -228,6 +228,29 @@ class TestInstructorAPIEnrollment(ModuleStoreTestCase, LoginEnrollmentTestCase):
         res_json = json.loads(response.content)
         self.assertEqual(res_json, expected)
 
+    def test_enroll_many(self):
+        url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id})
+        emails = [self.enrolled_student.email, self.notenrolled_student.email, self.notregistered_email]
+        response = self.client.get(url, {'emails': ','.join(emails), 'action': 'enroll', 'auto_enroll': True})
+        self.assertEqual(response.status_code, 200)
+
+        res_json = json.loads(response.content)
+        self.assertEqual([result['email'] for result in res_json['results']], emails)
+        self.assertEqual(
+            [result['after']['enrollment'] for result in res_json['results']],
+            [True, True, False]
+        )
+        self.assertTrue(res_json['results'][0]['before']['enrollment'])
+        self.assertFalse(res_json['results'][1]['before']['enrollment'])
+        self.assertEqual(
+            res_json['results'][2]['after'],
+            {"enrollment": False, "auto_enroll": True, "user": False, "allowed": True}
+        )
+        self.assertTrue(CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id))
+        self.assertTrue(
+            CourseEnrollmentAllowed.objects.get(course_id=self.course.id, email=self.notregistered_email).auto_enroll
+        )
+
     def test_unenroll(self):
         url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id})
         response = self.client.get(url, {'emails': self.enrolled_student.email, 'action': 'unenroll'})
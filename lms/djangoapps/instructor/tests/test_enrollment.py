@@ -5,13 +5,16 @@ Unit tests for instructor.enrollment methods.
 import json
 from abc import ABCMeta
 from django.contrib.auth.models import User
+from django.core import mail
 from courseware.models import StudentModule
 from django.test import TestCase
+from mock import patch
 from student.tests.factories import UserFactory
 
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from instructor.enrollment import (EmailEnrollmentState,
                                    enroll_email, unenroll_email,
+                                   bulk_enroll_emails, bulk_unenroll_emails,
                                    reset_student_attempts)
 
 
@@ -272,6 +275,90 @@ class TestInstructorUnenrollDB(TestEnrollmentChangeBase):
         return self._run_state_change_test(before_ideal, after_ideal, action)
 
 
+class TestInstructorBulkEnrollmentDB(TestCase):
+    """ Test instructor.enrollment.bulk_enroll_emails and bulk_unenroll_emails """
+    def setUp(self):
+        self.course_id = 'robot:/a/fake/c::rse/id'
+        self.ideals = [
+            SettableEnrollmentState(user=True, enrollment=True),
+            SettableEnrollmentState(user=True, enrollment=False),
+            SettableEnrollmentState(user=False, allowed=True, auto_enroll=True),
+        ]
+        self.emails = [ideal.create_user(self.course_id).email for ideal in self.ideals]
+        self.emails.append('robot_brand_new_email@edx.org')
+        mail.outbox = []
+
+    def _check_results(self, results, emails=None):
+        """ Check that results are in order and that `after` matches the database. """
+        self.assertEqual([result.email for result in results], emails or self.emails)
+        for result in results:
+            self.assertEqual(result.after.to_dict(), EmailEnrollmentState(self.course_id, result.email).to_dict())
+
+    def test_bulk_enroll(self):
+        results = bulk_enroll_emails(self.course_id, self.emails + self.emails[:1])
+        self._check_results(results)
+        for ideal, result in zip(self.ideals, results):
+            self.assertEqual(ideal.to_dict(), result.before.to_dict())
+        self.assertTrue(results[1].after.enrollment)
+        self.assertEqual(results[2].after.to_dict(), SettableEnrollmentState(allowed=True).to_dict())
+        self.assertEqual(results[3].after.to_dict(), SettableEnrollmentState(allowed=True).to_dict())
+        self.assertEqual([result.message for result in results], [None] * 4)
+
+    def test_bulk_enroll_reactivates(self):
+        CourseEnrollment.unenroll(User.objects.get(email=self.emails[0]), self.course_id)
+        results = bulk_enroll_emails(self.course_id, self.emails[:1])
+        self.assertFalse(results[0].before.enrollment)
+        self._check_results(results, self.emails[:1])
+
+    def test_bulk_enroll_queues_emails(self):
+        results = bulk_enroll_emails(self.course_id, self.emails, email_params={
+            'site_name': 'edx.org',
+            'registration_url': 'https://edx.org/register',
+            'course_id': self.course_id,
+            'auto_enroll': False,
+            'course_url': 'https://edx.org/courses/' + self.course_id,
+        })
+        self._check_results(results)
+        self.assertEqual(
+            [result.message for result in results],
+            [None, 'enrolled_enroll', None, 'allowed_enroll']
+        )
+        self.assertEqual([msg.to for msg in mail.outbox], [[self.emails[1]], [self.emails[3]]])
+
+    def test_bulk_enroll_email_queue_failure(self):
+        with patch('instructor.tasks.send_enrollment_emails.delay', side_effect=Exception('broker down')):
+            results = bulk_enroll_emails(self.course_id, self.emails, email_params={
+                'site_name': 'edx.org',
+                'registration_url': 'https://edx.org/register',
+                'course_id': self.course_id,
+                'auto_enroll': False,
+                'course_url': 'https://edx.org/courses/' + self.course_id,
+            })
+        # the enrollments are done, but no email is reported as queued
+        self._check_results(results)
+        self.assertEqual([result.message for result in results], [None] * 4)
+
+    def test_bulk_unenroll(self):
+        results = bulk_unenroll_emails(self.course_id, self.emails)
+        self._check_results(results)
+        for ideal, result in zip(self.ideals, results):
+            self.assertEqual(ideal.to_dict(), result.before.to_dict())
+        for result in results:
+            self.assertFalse(result.after.enrollment)
+            self.assertFalse(result.after.allowed)
+
+    def test_bulk_unenroll_queues_emails(self):
+        results = bulk_unenroll_emails(self.course_id, self.emails, email_params={
+            'site_name': 'edx.org',
+            'course_id': self.course_id,
+        })
+        self.assertEqual(
+            [result.message for result in results],
+            ['enrolled_unenroll', None, 'allowed_unenroll', None]
+        )
+        self.assertEqual(len(mail.outbox), 2)
+
+
 class TestInstructorEnrollmentStudentModule(TestCase):
     """ Test student module manipulations. """
     def setUp(self):
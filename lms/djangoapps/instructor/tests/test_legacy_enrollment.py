@@ -204,8 +204,8 @@ class TestInstructorEnrollsStudent(ModuleStoreTestCase, LoginEnrollmentTestCase)
         self.assertContains(response, '<td>student3_0@test.com</td>')
         self.assertContains(response, '<td>student3_1@test.com</td>')
         self.assertContains(response, '<td>student3_2@test.com</td>')
-        self.assertContains(response, '<td>added, email sent</td>')
-        self.assertContains(response, '<td>user does not exist, enrollment allowed, pending with auto enrollment on, email sent</td>')
+        self.assertContains(response, '<td>added, email queued</td>')
+        self.assertContains(response, '<td>user does not exist, enrollment allowed, pending with auto enrollment on, email queued</td>')
 
         # Check the outbox
         self.assertEqual(len(mail.outbox), 3)
@@ -238,7 +238,7 @@ class TestInstructorEnrollsStudent(ModuleStoreTestCase, LoginEnrollmentTestCase)
         # Check the page output
         self.assertContains(response, '<td>student2@test.com</td>')
         self.assertContains(response, '<td>student3@test.com</td>')
-        self.assertContains(response, '<td>un-enrolled, email sent</td>')
+        self.assertContains(response, '<td>un-enrolled, email queued</td>')
 
         # Check the outbox
         self.assertEqual(len(mail.outbox), 3)
@@ -32,7 +32,7 @@ from courseware.models import StudentModule
 import instructor_task.api
 from instructor_task.api_helper import AlreadyRunningError
 import instructor.enrollment as enrollment
-from instructor.enrollment import enroll_email, unenroll_email
+from instructor.enrollment import bulk_enroll_emails, bulk_unenroll_emails
 import instructor.access as access
 import analytics.basic
 import analytics.distributions
@@ -176,30 +176,28 @@ def students_update_enrollment(request, course_id):
     emails = _split_input_list(emails_raw)
     auto_enroll = request.GET.get('auto_enroll') in ['true', 'True', True]
 
-    results = []
-    for email in emails:
-        try:
-            if action == 'enroll':
-                before, after = enroll_email(course_id, email, auto_enroll)
-            elif action == 'unenroll':
-                before, after = unenroll_email(course_id, email)
-            else:
-                return HttpResponseBadRequest("Unrecognized action '{}'".format(action))
-
-            results.append({
-                'email': email,
-                'before': before.to_dict(),
-                'after': after.to_dict(),
-            })
-        # catch and log any exceptions
-        # so that one error doesn't cause a 500.
-        except Exception as exc:  # pylint: disable=W0703
-            log.exception("Error while #{}ing student")
-            log.exception(exc)
-            results.append({
-                'email': email,
-                'error': True,
-            })
+    if action == 'enroll':
+        bulk_action = lambda: bulk_enroll_emails(course_id, emails, auto_enroll)
+    elif action == 'unenroll':
+        bulk_action = lambda: bulk_unenroll_emails(course_id, emails)
+    else:
+        return HttpResponseBadRequest("Unrecognized action '{}'".format(action))
+
+    try:
+        results = [{
+            'email': result.email,
+            'before': result.before.to_dict(),
+            'after': result.after.to_dict(),
+        } for result in bulk_action()]
+    # catch and log any exceptions
+    # so that one error doesn't cause a 500.
+    except Exception as exc:  # pylint: disable=W0703
+        log.exception("Error while #{}ing students".format(action))
+        log.exception(exc)
+        results = [{
+            'email': email,
+            'error': True,
+        } for email in emails]
 
     response_payload = {
         'action': action,
@@ -352,9 +350,8 @@ def get_students_features(request, course_id, csv=False):  # pylint: disable=W06
     query_features = ['username', 'name', 'email', 'language', 'location', 'year_of_birth', 'gender',
                       'level_of_education', 'mailing_address', 'goals']
 
-    student_data = analytics.basic.enrolled_students_features(course_id, query_features)
-
     if not csv:
+        student_data = analytics.basic.enrolled_students_features(course_id, query_features)
         response_payload = {
             'course_id': course_id,
             'students': student_data,
@@ -364,8 +361,10 @@ def get_students_features(request, course_id, csv=False):  # pylint: disable=W06
         }
         return JsonResponse(response_payload)
     else:
-        header, datarows = analytics.csvs.format_dictlist(student_data, query_features)
-        return analytics.csvs.create_csv_response("enrolled_profiles.csv", header, datarows)
+        # stream the export so that memory use doesn't grow with the enrollment
+        student_data = analytics.basic.iter_enrolled_students_features(course_id, query_features)
+        header, datarows = analytics.csvs.iter_dictlist(student_data, query_features)
+        return analytics.csvs.create_streaming_csv_response("enrolled_profiles.csv", header, datarows)
 
 
 @ensure_csrf_cookie
@@ -20,7 +20,6 @@ from django.http import HttpResponse
 from django_future.csrf import ensure_csrf_cookie
 from django.views.decorators.cache import cache_control
 from django.core.urlresolvers import reverse
-from django.core.mail import send_mail
 from django.utils import timezone
 
 from xmodule_modifiers import wrap_xmodule
@@ -40,6 +39,7 @@ from django_comment_common.models import (Role,
                                           FORUM_ROLE_MODERATOR,
                                           FORUM_ROLE_COMMUNITY_TA)
 from django_comment_client.utils import has_forum_access
+from instructor.enrollment import bulk_enroll_emails, bulk_unenroll_emails, send_mail_to_student  # pylint: disable=W0611
 from instructor.offline_gradecalc import student_grades, offline_grades_available
 from instructor_task.api import (get_running_instructor_tasks,
                                  get_instructor_task_history,
@@ -51,7 +51,6 @@ from mitxmako.shortcuts import render_to_response
 from psychometrics import psychoanalyze
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 import track.views
-from mitxmako.shortcuts import render_to_string
 from xblock.field_data import DictFieldData
 from xblock.fields import ScopeIds
 
@@ -368,14 +367,18 @@ def instructor_dashboard(request, course_id):
                     log.exception(error_msg)
             elif "Reset student's attempts" in action:
                 # modify the problem's state
-                try:
+                def reset_attempts(module):
+                    """ Reset the attempts in the state of module, returning the old number """
                     # load the state json
-                    problem_state = json.loads(student_module.state)
+                    problem_state = json.loads(module.state)
                     old_number_of_attempts = problem_state["attempts"]
                     problem_state["attempts"] = 0
-                    # save
-                    student_module.state = json.dumps(problem_state)
-                    student_module.save()
+                    module.state = json.dumps(problem_state)
+                    return old_number_of_attempts
+
+                try:
+                    # save, reading the state again if the student submitted meanwhile
+                    old_number_of_attempts = student_module.update_with_retry(reset_attempts)
                     event = {
                         "old_attempts": old_number_of_attempts,
                         "student": unicode(student),
@@ -1190,71 +1193,41 @@ def _do_enroll_students(course, course_id, students, overload=False, auto_enroll
             status[cea.email] = 'removed from pending enrollment list'
         ceaset.delete()
 
+    email_params = None
     if email_students:
         stripped_site_name = _remove_preview(settings.SITE_NAME)
         registration_url = 'https://' + stripped_site_name + reverse('student.views.register_user')
         #Composition of email
-        d = {'site_name': stripped_site_name,
-             'registration_url': registration_url,
-             'course_id': course_id,
-             'auto_enroll': auto_enroll,
-             'course_url': 'https://' + stripped_site_name + '/courses/' + course_id,
-             }
-
-    for student in new_students:
-        try:
-            user = User.objects.get(email=student)
-        except User.DoesNotExist:
-
-            #Student not signed up yet, put in pending enrollment allowed table
-            cea = CourseEnrollmentAllowed.objects.filter(email=student, course_id=course_id)
-
-            #If enrollmentallowed already exists, update auto_enroll flag to however it was set in UI
-            #Will be 0 or 1 records as there is a unique key on email + course_id
-            if cea:
-                cea[0].auto_enroll = auto_enroll
-                cea[0].save()
-                status[student] = 'user does not exist, enrollment already allowed, pending with auto enrollment ' \
-                    + ('on' if auto_enroll else 'off')
-                continue
-
-            #EnrollmentAllowed doesn't exist so create it
-            cea = CourseEnrollmentAllowed(email=student, course_id=course_id, auto_enroll=auto_enroll)
-            cea.save()
-
-            status[student] = 'user does not exist, enrollment allowed, pending with auto enrollment ' \
-                + ('on' if auto_enroll else 'off')
-
-            if email_students:
-                #User is allowed to enroll but has not signed up yet
-                d['email_address'] = student
-                d['message'] = 'allowed_enroll'
-                send_mail_ret = send_mail_to_student(student, d)
-                status[student] += (', email sent' if send_mail_ret else '')
-            continue
-
-        #Student has already registered
-        if CourseEnrollment.is_enrolled(user, course_id):
-            status[student] = 'already enrolled'
-            continue
+        email_params = {'site_name': stripped_site_name,
+                        'registration_url': registration_url,
+                        'course_id': course_id,
+                        'auto_enroll': auto_enroll,
+                        'course_url': 'https://' + stripped_site_name + '/courses/' + course_id,
+                        }
 
-        try:
-            #Not enrolled yet
-            ce = CourseEnrollment.enroll(user, course_id)
-            status[student] = 'added'
-
-            if email_students:
-                #User enrolled for first time, populate dict with user specific info
-                d['email_address'] = student
-                d['first_name'] = user.first_name
-                d['last_name'] = user.last_name
-                d['message'] = 'enrolled_enroll'
-                send_mail_ret = send_mail_to_student(student, d)
-                status[student] += (', email sent' if send_mail_ret else '')
-
-        except:
+    try:
+        results = bulk_enroll_emails(course_id, new_students, auto_enroll=auto_enroll, email_params=email_params)
+    except Exception:  # pylint: disable=W0703
+        log.exception(u"Bulk enrollment failed for course %s", course_id)
+        results = []
+        for student in new_students:
             status[student] = 'rejected'
 
+    auto_enroll_status = 'pending with auto enrollment ' + ('on' if auto_enroll else 'off')
+    for result in results:
+        if not result.before.user:
+            if result.before.allowed:
+                #If enrollmentallowed already exists, auto_enroll flag was updated to however it was set in UI
+                status[result.email] = 'user does not exist, enrollment already allowed, ' + auto_enroll_status
+            else:
+                status[result.email] = 'user does not exist, enrollment allowed, ' + auto_enroll_status
+        elif result.before.enrollment:
+            status[result.email] = 'already enrolled'
+        else:
+            status[result.email] = 'added'
+        if result.message is not None:
+            status[result.email] += ', email queued'
+
     datatable = {'header': ['StudentEmail', 'action']}
     datatable['data'] = [[x, status[x]] for x in sorted(status)]
     datatable['title'] = 'Enrollment of students'
@@ -1281,52 +1254,25 @@ def _do_unenroll_students(course_id, students, email_students=False):
     old_students, _ = get_and_clean_student_list(students)
     status = dict([x, 'unprocessed'] for x in old_students)
 
-    stripped_site_name = _remove_preview(settings.SITE_NAME)
+    email_params = None
     if email_students:
         #Composition of email
-        d = {'site_name': stripped_site_name,
-             'course_id': course_id}
-
-    for student in old_students:
-
-        isok = False
-        cea = CourseEnrollmentAllowed.objects.filter(course_id=course_id, email=student)
-        #Will be 0 or 1 records as there is a unique key on email + course_id
-        if cea:
-            cea[0].delete()
-            status[student] = "un-enrolled"
-            isok = True
-
-        try:
-            user = User.objects.get(email=student)
-        except User.DoesNotExist:
-
-            if isok and email_students:
-                #User was allowed to join but had not signed up yet
-                d['email_address'] = student
-                d['message'] = 'allowed_unenroll'
-                send_mail_ret = send_mail_to_student(student, d)
-                status[student] += (', email sent' if send_mail_ret else '')
-
-            continue
+        email_params = {'site_name': _remove_preview(settings.SITE_NAME),
+                        'course_id': course_id}
 
-        #Will be 0 or 1 records as there is a unique key on user + course_id
-        if CourseEnrollment.is_enrolled(user, course_id):
-            try:
-                CourseEnrollment.unenroll(user, course_id)
-                status[student] = "un-enrolled"
-                if email_students:
-                    #User was enrolled
-                    d['email_address'] = student
-                    d['first_name'] = user.first_name
-                    d['last_name'] = user.last_name
-                    d['message'] = 'enrolled_unenroll'
-                    send_mail_ret = send_mail_to_student(student, d)
-                    status[student] += (', email sent' if send_mail_ret else '')
-
-            except Exception:
-                if not isok:
-                    status[student] = "Error!  Failed to un-enroll"
+    try:
+        results = bulk_unenroll_emails(course_id, old_students, email_params=email_params)
+    except Exception:  # pylint: disable=W0703
+        log.exception(u"Bulk un-enrollment failed for course %s", course_id)
+        results = []
+        for student in old_students:
+            status[student] = "Error!  Failed to un-enroll"
+
+    for result in results:
+        if result.before.enrollment or result.before.allowed:
+            status[result.email] = "un-enrolled"
+            if result.message is not None:
+                status[result.email] += ', email queued'
 
     datatable = {'header': ['StudentEmail', 'action']}
     datatable['data'] = [[x, status[x]] for x in sorted(status)]
@@ -1336,43 +1282,6 @@ def _do_unenroll_students(course_id, students, email_students=False):
     return data
 
 
-def send_mail_to_student(student, param_dict):
-    """
-    Construct the email using templates and then send it.
-    `student` is the student's email address (a `str`),
-
-    `param_dict` is a `dict` with keys [
-    `site_name`: name given to edX instance (a `str`)
-    `registration_url`: url for registration (a `str`)
-    `course_id`: id of course (a `str`)
-    `auto_enroll`: user input option (a `str`)
-    `course_url`: url of course (a `str`)
-    `email_address`: email of student (a `str`)
-    `first_name`: student first name (a `str`)
-    `last_name`: student last name (a `str`)
-    `message`: type of email to send and template to use (a `str`)
-                                        ]
-    Returns a boolean indicating whether the email was sent successfully.
-    """
-
-    EMAIL_TEMPLATE_DICT = {'allowed_enroll': ('emails/enroll_email_allowedsubject.txt', 'emails/enroll_email_allowedmessage.txt'),
-                           'enrolled_enroll': ('emails/enroll_email_enrolledsubject.txt', 'emails/enroll_email_enrolledmessage.txt'),
-                           'allowed_unenroll': ('emails/unenroll_email_subject.txt', 'emails/unenroll_email_allowedmessage.txt'),
-                           'enrolled_unenroll': ('emails/unenroll_email_subject.txt', 'emails/unenroll_email_enrolledmessage.txt')}
-
-    subject_template, message_template = EMAIL_TEMPLATE_DICT.get(param_dict['message'], (None, None))
-    if subject_template is not None and message_template is not None:
-        subject = render_to_string(subject_template, param_dict)
-        message = render_to_string(message_template, param_dict)
-
-        # Email subject *must not* contain newlines
-        subject = ''.join(subject.splitlines())
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [student], fail_silently=False)
-        return True
-    else:
-        return False
-
-
 def _remove_preview(site_name):
     if site_name[:8] == "preview.":
         return site_name[8:]
@@ -332,20 +332,25 @@ def reset_attempts_module_state(_module_descriptor, student_module, xmodule_inst
 
     Always returns true, indicating success, if it doesn't raise an exception due to database error.
     """
-    problem_state = json.loads(student_module.state) if student_module.state else {}
-    if 'attempts' in problem_state:
-        old_number_of_attempts = problem_state["attempts"]
+    def reset_attempts(module):
+        """ Reset the attempts in the state of module, returning the old number """
+        problem_state = json.loads(module.state) if module.state else {}
+        old_number_of_attempts = problem_state.get("attempts")
         if old_number_of_attempts > 0:
             problem_state["attempts"] = 0
-            # convert back to json and save
-            student_module.state = json.dumps(problem_state)
-            student_module.save()
-            # get request-related tracking information from args passthrough,
-            # and supplement with task-specific information:
-            request_info = xmodule_instance_args.get('request_info', {}) if xmodule_instance_args is not None else {}
-            task_info = {"student": student_module.student.username, "task_id": _get_task_id_from_xmodule_args(xmodule_instance_args)}
-            event_info = {"old_attempts": old_number_of_attempts, "new_attempts": 0}
-            task_track(request_info, task_info, 'problem_reset_attempts', event_info, page='x_module_task')
+            # convert back to json
+            module.state = json.dumps(problem_state)
+        return old_number_of_attempts
+
+    # save, reading the state again if the student submitted meanwhile
+    old_number_of_attempts = student_module.update_with_retry(reset_attempts)
+    if old_number_of_attempts > 0:
+        # get request-related tracking information from args passthrough,
+        # and supplement with task-specific information:
+        request_info = xmodule_instance_args.get('request_info', {}) if xmodule_instance_args is not None else {}
+        task_info = {"student": student_module.student.username, "task_id": _get_task_id_from_xmodule_args(xmodule_instance_args)}
+        event_info = {"old_attempts": old_number_of_attempts, "new_attempts": 0}
+        task_track(request_info, task_info, 'problem_reset_attempts', event_info, page='x_module_task')
 
     # consider the reset to be successful, even if no update was performed.  (It's just "optimized".)
     return True
@@ -205,20 +205,24 @@ def delete(request, course_id, note_id):
 
 def search(request, course_id):
     '''
-    Returns a subset of  annotation objects based on a search query.
+    Returns a page of annotation objects matching a search query.
+
+    The notes can be filtered by exact `uri`, by the words of `text` (which
+    must all be in their text or quote) and by `tag`, which may be given
+    several times. Notes are returned in id order: `next` is the `after`
+    parameter of the request of the next page, or None on the last page.
     '''
     MAX_LIMIT = API_SETTINGS.get('MAX_NOTE_LIMIT')
 
     # search parameters
-    offset = request.GET.get('offset', '')
+    after = request.GET.get('after', '')
     limit = request.GET.get('limit', '')
-    uri = request.GET.get('uri', '')
 
     # validate search parameters
-    if offset.isdigit():
-        offset = int(offset)
+    if after.isdigit():
+        after = int(after)
     else:
-        offset = 0
+        after = None
 
     if limit.isdigit():
         limit = int(limit)
@@ -227,17 +231,23 @@ def search(request, course_id):
     else:
         limit = MAX_LIMIT
 
-    # set filters
-    filters = {'course_id': course_id, 'user': request.user}
-    if uri != '':
-        filters['uri'] = uri
+    notes = Note.search(
+        course_id, request.user,
+        uri=request.GET.get('uri', ''),
+        text=request.GET.get('text', ''),
+        tags=request.GET.getlist('tag'),
+        after=after,
+    )
+
+    # one more note than the page tells whether there is a next page, without a count
+    rows = list(notes[:limit + 1])
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_after = rows[-1].id
 
-    # retrieve notes
-    notes = Note.objects.order_by('id').filter(**filters)
-    total = notes.count()
-    rows = notes[offset:offset + limit]
     result = {
-        'total': total,
+        'next': next_after,
         'rows': [note.as_dict() for note in rows]
     }
 
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'NoteTerm'
+        db.create_table('notes_noteterm', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('note', self.gf('django.db.models.fields.related.ForeignKey')(related_name='terms', to=orm['notes.Note'])),
+            ('term', self.gf('django.db.models.fields.CharField')(max_length=64, db_index=True)),
+        ))
+        db.send_create_signal('notes', ['NoteTerm'])
+
+        # Adding unique constraint on 'NoteTerm', fields ['note', 'term']
+        db.create_unique('notes_noteterm', ['note_id', 'term'])
+
+        # Adding model 'NoteTag'
+        db.create_table('notes_notetag', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('note', self.gf('django.db.models.fields.related.ForeignKey')(related_name='note_tags', to=orm['notes.Note'])),
+            ('name', self.gf('django.db.models.fields.CharField')(max_length=255, db_index=True)),
+        ))
+        db.send_create_signal('notes', ['NoteTag'])
+
+        # Adding unique constraint on 'NoteTag', fields ['note', 'name']
+        db.create_unique('notes_notetag', ['note_id', 'name'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'NoteTag', fields ['note', 'name']
+        db.delete_unique('notes_notetag', ['note_id', 'name'])
+
+        # Removing unique constraint on 'NoteTerm', fields ['note', 'term']
+        db.delete_unique('notes_noteterm', ['note_id', 'term'])
+
+        # Deleting model 'NoteTag'
+        db.delete_table('notes_notetag')
+
+        # Deleting model 'NoteTerm'
+        db.delete_table('notes_noteterm')
+
+
+    models = {
+        'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        'auth.permission': {
+            'Meta': {'ordering': "('content_type__app_label', 'content_type__model', 'codename')", 'unique_together': "(('content_type', 'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['auth.Group']", 'symmetrical': 'False', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'notes.note': {
+            'Meta': {'object_name': 'Note'},
+            'course_id': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'null': 'True', 'db_index': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'quote': ('django.db.models.fields.TextField', [], {'default': "''"}),
+            'range_end': ('django.db.models.fields.CharField', [], {'max_length': '2048'}),
+            'range_end_offset': ('django.db.models.fields.IntegerField', [], {}),
+            'range_start': ('django.db.models.fields.CharField', [], {'max_length': '2048'}),
+            'range_start_offset': ('django.db.models.fields.IntegerField', [], {}),
+            'tags': ('django.db.models.fields.TextField', [], {'default': "''"}),
+            'text': ('django.db.models.fields.TextField', [], {'default': "''"}),
+            'updated': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'db_index': 'True', 'blank': 'True'}),
+            'uri': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'user': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['auth.User']"})
+        },
+        'notes.notetag': {
+            'Meta': {'unique_together': "(('note', 'name'),)", 'object_name': 'NoteTag'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'note': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'note_tags'", 'to': "orm['notes.Note']"})
+        },
+        'notes.noteterm': {
+            'Meta': {'unique_together': "(('note', 'term'),)", 'object_name': 'NoteTerm'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'note': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'terms'", 'to': "orm['notes.Note']"}),
+            'term': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'})
+        }
+    }
+
+    complete_apps = ['notes']
@@ -4,6 +4,26 @@ from django.core.urlresolvers import reverse
 from django.core.exceptions import ValidationError
 from django.utils.html import strip_tags
 import json
+import re
+
+# the words of the text and quote of notes which are indexed for search
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERM_LENGTH = 64
+MAX_TAG_LENGTH = 255
+
+
+def note_terms(*texts):
+    """
+    Returns the set of search terms of texts: their lower cased words.
+    """
+    return set(word.lower()[:MAX_TERM_LENGTH] for text in texts for word in WORD_RE.findall(text))
+
+
+def normalize_tag(tag):
+    """
+    Returns the form of a tag it's looked up by, or '' for a blank tag.
+    """
+    return u' '.join(tag.split()).lower()[:MAX_TAG_LENGTH]
 
 
 class Note(models.Model):
@@ -52,6 +72,49 @@ class Note(models.Model):
         if len(tags) > 0:
             self.tags = ",".join(tags)
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the note, and updates its search terms and tags.
+        """
+        super(Note, self).save(*args, **kwargs)
+        self.update_search_index()
+
+    def update_search_index(self):
+        """
+        Replaces the NoteTerms and NoteTags of the note with those of its
+        text, quote and tags.
+        """
+        self.terms.all().delete()
+        NoteTerm.objects.bulk_create([
+            NoteTerm(note=self, term=term) for term in note_terms(self.text, self.quote)
+        ])
+        self.note_tags.all().delete()
+        names = set(normalize_tag(tag) for tag in self.tags.split(","))
+        NoteTag.objects.bulk_create([NoteTag(note=self, name=name) for name in names if name])
+
+    @classmethod
+    def search(cls, course_id, user, uri=None, text=None, tags=(), after=None):
+        """
+        Returns the queryset of the notes of `user` in the course, in id
+        order, filtered by:
+            uri: the exact uri of the notes
+            text: words which must all be in the text or quote of the notes
+            tags: tags the notes must all have
+            after: the id of the last note of the previous page of notes
+        """
+        notes = cls.objects.filter(course_id=course_id, user=user).order_by('id')
+        if uri:
+            notes = notes.filter(uri=uri)
+        # each term and tag is matched through a join of its own
+        for term in note_terms(text or ''):
+            notes = notes.filter(terms__term=term)
+        for name in set(normalize_tag(tag) for tag in tags):
+            if name:
+                notes = notes.filter(note_tags__name=name)
+        if after is not None:
+            notes = notes.filter(id__gt=after)
+        return notes
+
     def get_absolute_url(self):
         """
         Returns the absolute url for the note object.
@@ -65,7 +128,7 @@ class Note(models.Model):
         """
         return {
             'id': self.pk,
-            'user_id': self.user.pk,
+            'user_id': self.user_id,
             'uri': self.uri,
             'text': self.text,
             'quote': self.quote,
@@ -79,3 +142,25 @@ class Note(models.Model):
             'created': str(self.created),
             'updated': str(self.updated)
         }
+
+
+class NoteTerm(models.Model):
+    """
+    A search term of the text or quote of a note.
+    """
+    note = models.ForeignKey(Note, related_name='terms')
+    term = models.CharField(max_length=MAX_TERM_LENGTH, db_index=True)
+
+    class Meta:
+        unique_together = ('note', 'term')
+
+
+class NoteTag(models.Model):
+    """
+    A tag of a note, normalized by normalize_tag.
+    """
+    note = models.ForeignKey(Note, related_name='note_tags')
+    name = models.CharField(max_length=MAX_TAG_LENGTH, db_index=True)
+
+    class Meta:
+        unique_together = ('note', 'name')
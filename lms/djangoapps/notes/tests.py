@@ -293,50 +293,81 @@ class ApiTest(TestCase):
         for field in ['text', 'tags']:
             self.assertEqual(actual_dict[field], updated_dict[field])
 
+    def search(self, params):
+        resp = self.client.get(self.url('notes_api_search'),
+                               params,
+                               content_type='application/json',
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.content, '')
+
+        content = json.loads(resp.content)
+
+        for expected_key in ('next', 'rows'):
+            self.assertTrue(expected_key in content)
+
+        return content
+
     def test_search_note_params(self):
         self.login()
 
         total = 3
         notes = self.create_notes(total)
+        ids = [note.id for note in notes]
         invalid_uri = ''.join([note.uri for note in notes])
 
-        tests = [{'limit': 0, 'offset': 0, 'expected_rows': total},
-                 {'limit': 0, 'offset': 2, 'expected_rows': total - 2},
-                 {'limit': 0, 'offset': total, 'expected_rows': 0},
-                 {'limit': 1, 'offset': 0, 'expected_rows': 1},
-                 {'limit': 2, 'offset': 0, 'expected_rows': 2},
-                 {'limit': total, 'offset': 2, 'expected_rows': 1},
-                 {'limit': total, 'offset': total, 'expected_rows': 0},
-                 {'limit': total + 1, 'offset': total + 1, 'expected_rows': 0},
-                 {'limit': total + 1, 'offset': 0, 'expected_rows': total},
-                 {'limit': 0, 'offset': 0, 'uri': invalid_uri, 'expected_rows': 0, 'expected_total': 0}]
+        tests = [{'limit': 0, 'expected_rows': ids, 'expected_next': None},
+                 {'limit': 0, 'after': ids[1], 'expected_rows': ids[2:], 'expected_next': None},
+                 {'limit': 0, 'after': ids[2], 'expected_rows': [], 'expected_next': None},
+                 {'limit': 1, 'expected_rows': ids[:1], 'expected_next': ids[0]},
+                 {'limit': 2, 'expected_rows': ids[:2], 'expected_next': ids[1]},
+                 {'limit': 2, 'after': ids[1], 'expected_rows': ids[2:], 'expected_next': None},
+                 {'limit': total, 'expected_rows': ids, 'expected_next': None},
+                 {'limit': total + 1, 'after': ids[0], 'expected_rows': ids[1:], 'expected_next': None},
+                 {'limit': 0, 'uri': invalid_uri, 'expected_rows': [], 'expected_next': None}]
 
         for test in tests:
             params = dict([(k, str(test[k]))
-                          for k in ('limit', 'offset', 'uri')
+                          for k in ('limit', 'after', 'uri')
                           if k in test])
-            resp = self.client.get(self.url('notes_api_search'),
-                                   params,
-                                   content_type='application/json',
-                                   HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+            content = self.search(params)
 
-            self.assertEqual(resp.status_code, 200)
-            self.assertNotEqual(resp.content, '')
-
-            content = json.loads(resp.content)
+            self.assertEqual(content['next'], test['expected_next'])
+            self.assertEqual([row['id'] for row in content['rows']], test['expected_rows'])
 
-            for expected_key in ('total', 'rows'):
-                self.assertTrue(expected_key in content)
-
-            if 'expected_total' in test:
-                self.assertEqual(content['total'], test['expected_total'])
-            else:
-                self.assertEqual(content['total'], total)
-
-            self.assertEqual(len(content['rows']), test['expected_rows'])
+    def test_search_note_text_and_tags(self):
+        self.login()
 
-            for row in content['rows']:
-                self.assertTrue('id' in row)
+        first, second, third = self.create_notes(3, create=False)
+        first.text, first.quote, first.tags = 'Achilles sulks', 'the wrath', 'Iliad, Heroes'
+        second.text, second.quote, second.tags = 'Odysseus sails home', 'much-travelled', 'odyssey,heroes'
+        third.text, third.quote, third.tags = 'Achilles and the tortoise', '', 'paradox'
+        for note in (first, second, third):
+            note.save()
+
+        tests = [({'text': 'achilles'}, [first, third]),
+                 ({'text': 'Wrath achilles'}, [first]),
+                 ({'text': 'sulks sails'}, []),
+                 ({'tag': 'heroes'}, [first, second]),
+                 ({'tag': ['HEROES', ' iliad ']}, [first]),
+                 ({'tag': 'heroes', 'text': 'achilles'}, [first]),
+                 ({'tag': 'achilles'}, [])]
+
+        for params, expected in tests:
+            content = self.search(params)
+            self.assertEqual([row['id'] for row in content['rows']], [note.id for note in expected])
+
+        # the index follows updates of notes
+        third.tags = 'heroes'
+        third.save()
+        content = self.search({'tag': 'heroes', 'text': 'achilles'})
+        self.assertEqual([row['id'] for row in content['rows']], [first.id, third.id])
+
+    def test_search_other_students_notes(self):
+        self.login(as_student=self.student2)
+        self.create_notes(2)
+        self.assertEqual(self.search({})['rows'], [])
 
 
 class NoteTest(TestCase):
@@ -109,6 +109,7 @@ EMAILS_PER_TASK = ENV_TOKENS.get('EMAILS_PER_TASK', 100)
 EMAILS_PER_QUERY = ENV_TOKENS.get('EMAILS_PER_QUERY', 1000)
 SITE_NAME = ENV_TOKENS['SITE_NAME']
 SESSION_ENGINE = ENV_TOKENS.get('SESSION_ENGINE', SESSION_ENGINE)
+MAKO_MODULE_CACHE_ROOT = ENV_TOKENS.get('MAKO_MODULE_CACHE_ROOT', MAKO_MODULE_CACHE_ROOT)
 SESSION_COOKIE_DOMAIN = ENV_TOKENS.get('SESSION_COOKIE_DOMAIN')
 
 CMS_BASE = ENV_TOKENS.get('CMS_BASE', 'studio.edx.org')
@@ -136,6 +137,7 @@ TECH_SUPPORT_EMAIL = ENV_TOKENS.get('TECH_SUPPORT_EMAIL', TECH_SUPPORT_EMAIL)
 CONTACT_EMAIL = ENV_TOKENS.get('CONTACT_EMAIL', CONTACT_EMAIL)
 BUGS_EMAIL = ENV_TOKENS.get('BUGS_EMAIL', BUGS_EMAIL)
 PAYMENT_SUPPORT_EMAIL = ENV_TOKENS.get('PAYMENT_SUPPORT_EMAIL', PAYMENT_SUPPORT_EMAIL)
+PROBLEM_CHECK_RATE_LIMIT = ENV_TOKENS.get('PROBLEM_CHECK_RATE_LIMIT', PROBLEM_CHECK_RATE_LIMIT)
 
 #Theme overrides
 THEME_NAME = ENV_TOKENS.get('THEME_NAME', None)
@@ -214,6 +216,9 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 # Get the MODULESTORE from auth.json, but if it doesn't exist,
 # use the one from common.py
 MODULESTORE = AUTH_TOKENS.get('MODULESTORE', MODULESTORE)
+if MODULESTORE['default']['ENGINE'] == 'xmodule.modulestore.xml.XMLModuleStore':
+    # load_workers, snapshot_dir and lazy of the xml store
+    MODULESTORE['default']['OPTIONS'].update(ENV_TOKENS.get('XML_MODULESTORE_OPTIONS', {}))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 
 OPEN_ENDED_GRADING_INTERFACE = AUTH_TOKENS.get('OPEN_ENDED_GRADING_INTERFACE',
@@ -171,6 +171,13 @@ MITX_FEATURES = {
 
     # Toggle storing detailed billing information
     'STORE_BILLING_INFO': False,
+
+    # Only render the current unit of a sequence with the courseware page,
+    # fetching the other units when they are opened
+    'ENABLE_LAZY_SEQUENCE_RENDERING': False,
+
+    # Keep a full-text index of course content, and enable the course search endpoint
+    'ENABLE_COURSE_SEARCH': False,
 }
 
 # Used for A/B testing
@@ -182,6 +189,10 @@ GENERATE_PROFILE_SCORES = False
 # Used with XQueue
 XQUEUE_WAITTIME_BETWEEN_REQUESTS = 5  # seconds
 
+# Students can check a problem 'burst' times in a row, and then once every
+# 'interval' seconds. None doesn't limit checks.
+PROBLEM_CHECK_RATE_LIMIT = {'burst': 10, 'interval': 3}
+
 
 ############################# SET PATH INFORMATION #############################
 PROJECT_ROOT = path(__file__).abspath().dirname().dirname()  # /edx-platform/lms
@@ -220,6 +231,9 @@ OPENID_PROVIDER_TRUSTED_ROOTS = ['cs50.net', '*.cs50.net']
 # templates
 from tempdir import mkdtemp_clean
 MAKO_MODULE_DIR = mkdtemp_clean('mako')
+# If set, compiled templates are shared by all processes through a directory under
+# this one, named by a digest of the templates (see mitxmako.startup)
+MAKO_MODULE_CACHE_ROOT = None
 MAKO_TEMPLATES = {}
 MAKO_TEMPLATES['main'] = [PROJECT_ROOT / 'templates',
                           COMMON_ROOT / 'templates',
@@ -346,6 +360,12 @@ MODULESTORE = {
         'OPTIONS': {
             'data_dir': DATA_DIR,
             'default_class': 'xmodule.hidden_module.HiddenDescriptor',
+            # number of processes used to parse the course directories
+            'load_workers': None,
+            # directory where pickled snapshots of the parsed courses are kept
+            'snapshot_dir': None,
+            # load each course the first time it is accessed
+            'lazy': False,
         }
     }
 }
@@ -804,11 +824,13 @@ INSTALLED_APPS = (
     'certificates',
     'instructor',
     'instructor_task',
+    'analytics',
     'open_ended_grading',
     'psychometrics',
     'licenses',
     'course_groups',
     'bulk_email',
+    'course_search',
 
     # External auth (OpenID, shib)
     'external_auth',
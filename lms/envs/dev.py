@@ -50,6 +50,12 @@ DATABASES = {
     }
 }
 
+# restart quickly: courses are restored from snapshots and loaded on first use
+MODULESTORE['default']['OPTIONS'].update({
+    'snapshot_dir': ENV_ROOT / "xml_snapshots",
+    'lazy': True,
+})
+
 CACHES = {
     # This is the cache used for most things.
     # In staging/prod envs, the sessions also live here.
@@ -68,6 +68,9 @@ XQUEUE_INTERFACE = {
 }
 XQUEUE_WAITTIME_BETWEEN_REQUESTS = 5   # seconds
 
+# Don't rate limit the checks of tests, which share the cache
+PROBLEM_CHECK_RATE_LIMIT = None
+
 
 # Don't rely on a real staff grading backend
 MOCK_STAFF_GRADING = True
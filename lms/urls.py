@@ -55,7 +55,7 @@ urlpatterns = ('',  # nopep8
     url(r'^password_reset_done/$', django.contrib.auth.views.password_reset_done,
         name='auth_password_reset_done'),
 
-    url(r'^heartbeat$', include('heartbeat.urls')),
+    url(r'^heartbeat', include('heartbeat.urls')),
 
     url(r'^user_api/', include('user_api.urls')),
 
@@ -173,6 +173,9 @@ if settings.COURSEWARE_ENABLED:
         url(r'^courses/(?P<course_id>[^/]+/[^/]+/[^/]+)/modx/(?P<location>.*?)/(?P<dispatch>[^/]*)$',
             'courseware.module_render.modx_dispatch',
             name='modx_dispatch'),
+        url(r'^courses/(?P<course_id>[^/]+/[^/]+/[^/]+)/input_preview$',
+            'courseware.module_render.input_preview',
+            name='input_preview'),
 
 
         # Software Licenses
@@ -453,6 +456,12 @@ if settings.MITX_FEATURES.get('ENABLE_HINTER_INSTRUCTOR_VIEW'):
             'instructor.hint_manager.hint_manager', name="hint_manager"),
     )
 
+if settings.MITX_FEATURES.get('ENABLE_COURSE_SEARCH'):
+    urlpatterns += (
+        url(r'^courses/(?P<course_id>[^/]+/[^/]+/[^/]+)/search$',
+            'courseware.views.course_search', name="course_search"),
+    )
+
 # enable automatic login
 if settings.MITX_FEATURES.get('AUTOMATIC_AUTH_FOR_TESTING'):
     urlpatterns += (